@@ -0,0 +1,270 @@
+# ────────────────────────────────────────────────────────────────
+#  성능 벤치마크
+#  ▸ 합성 CSV(bench/synth.py)를 배율별로 만들고 다음을 측정
+#     - CSV 파싱(콜드), 사이드카 mmap 로드(웜)
+#     - 페이지 섹션별 한 번 재실행 비용: 순위, 최근 N일, 평년값,
+#       연도별 집계(Dataset.yearly)·월별 평균, 추세선 적합·예측(fit.forecast, 모형별),
+#       366일 추세 표, 극한 현상 사건 탐지, ETCCDI 지수(5일 창 백분위), 자료 품질 색인
+#     - 단계별 최대 할당 메모리(tracemalloc), 프로세스 최대 RSS
+#  ▸ 자료 첫날·마지막 날 근처 선택일에서 페이지 계산이 깨지지 않는지도 확인 (edge_checks)
+#       (tracemalloc은 파이썬 코드를 고르지 않게 느리게 하므로 시간과 따로 한 번 더 실행)
+#  ▸ 결과는 bench/results/<이름>.json에 저장, --compare로 이전 결과와 비교
+#
+#  python -m bench.run 1x 10x --save
+#  python -m bench.run 10x --compare bench/results/baseline.json
+# ────────────────────────────────────────────────────────────────
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import time
+import tracemalloc
+
+import numpy as np
+
+from bench.synth import PRESETS, write_csv
+from climate import events as _events, fit, loader
+from climate.dayindex import date_key, day_number
+from climate.sidecar import sidecar_dir
+from climate.yearly import month_means
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, "data")
+RESULTS_DIR = os.path.join(HERE, "results")
+
+
+def measure(fn, repeat: int = 1, setup=None) -> dict:
+    """fn을 repeat번 실행해 최소 시간(ms), 따로 한 번 더 실행해 최대 할당 메모리(MB) 기록
+
+    setup()은 매 실행 전에 (시간 밖에서) 불러 캐시를 비운다 – 한 번만 만드는 단계용.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(min(times) * 1000, 3), "peak_mb": round(peak / 2 ** 20, 2)}
+
+
+def rebuild(ds, attr: str | None = None, extras: tuple[str, ...] = (), caches=()):
+    """엔진(cached_property)·내부 캐시·사이드카 파생 배열을 지워 다음 호출이 처음부터 만들게 하는 setup"""
+    def setup():
+        if attr:
+            ds.__dict__.pop(attr, None)
+        for cache in caches:
+            cache.clear()
+        folder = os.path.join(ds.cache_dir, "extra") if ds.cache_dir else None
+        if folder and os.path.isdir(folder):
+            prefixes = tuple(ds._extra_name(e) for e in extras)
+            for f in os.listdir(folder):
+                if prefixes and f.startswith(prefixes):
+                    os.remove(os.path.join(folder, f))
+    return setup
+
+
+def ensure_csv(scale: str) -> str:
+    path = os.path.join(DATA_DIR, f"ta_synth_{scale}.csv")
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        print(f"  합성 데이터 생성 중: {path}")
+        write_csv(path, PRESETS[scale])
+    return path
+
+
+def section_benchmarks(ds, repeat: int) -> dict:
+    """페이지 재실행 한 번에 해당하는 섹션별 계산 (여러 지점이면 첫 지점)"""
+    out = {"build_station": measure(lambda: ds.for_station(), setup=ds._children.clear)}
+    ds = ds.for_station()
+    df = ds.frame
+    sel_row = len(ds) - 1
+    sel = df["날짜"].iat[sel_row].date()
+    key = date_key(sel)
+    years = (int(ds.days.year.min()), int(ds.days.year.max()))
+    cols = ["최고기온(℃)", "평균기온(℃)", "최저기온(℃)"]
+
+    # 색인·엔진 생성 (데이터셋당 한 번)
+    out["build_dayindex"] = measure(lambda: type(ds.days)(ds.day))
+    out["build_ranks"] = measure(lambda: [ds.ranks.column(c) for c in cols],
+                                 setup=rebuild(ds, "ranks", ("rank_order_",)))
+    out["build_windows"] = measure(lambda: ds.windows, setup=rebuild(ds, "windows", ("window_",)))
+    out["build_trends"] = measure(lambda: ds.trends, setup=rebuild(ds, "trends", ("trend_csum",)))
+    out["build_percentiles"] = measure(lambda: ds.percentiles(), setup=rebuild(
+        ds, extras=("pctl_",), caches=(ds._percentiles,)))
+    out["build_quality"] = measure(lambda: ds.quality, setup=rebuild(ds, "quality", ("quality_",)))
+
+    def ranking():
+        for c in cols:
+            ds.ranks.query(c, sel_row, years)
+            df.iloc[ds.ranks.top(c, key, years, 5)]
+
+    def recent_window():
+        end = day_number(sel)
+        ds.windows.trailing([end], 14)
+        ds.windows.same_period(key, 14)
+
+    def normals():
+        ds._normals.clear()
+        ds.normals()
+
+    def yearly_monthly():
+        # 추세선 페이지: 연도별은 사이드카 집계 표, 월별은 월 배열에 bincount
+        ds.yearly()
+        month_means(ds.days.month, ds.values[[ds.names.index(c) for c in cols]], cols)
+
+    # 추세선 페이지 예측 버튼: 전체 연도로 적합, 다음 3년 예측 (부트스트랩 2000회)
+    yearly = ds.yearly()[cols]
+    x_in = yearly.index.to_numpy()
+    Y = yearly.to_numpy().T
+    pred_years = np.arange(years[1] + 1, years[1] + 4)
+
+    def trend_fit(model):
+        def run():
+            fit.fit(x_in, Y, x_in, model)
+            fit.forecast(x_in, Y, pred_years, model)
+        return run
+
+    def trend_atlas():
+        ds.trends._tables.clear()
+        ds.trends._full = None
+        ds.trends.table(years)
+
+    def etccdi():
+        ds.percentiles()._thr.clear()
+        ds.percentiles().indices()
+
+    def events():
+        for rule in _events.PRESETS.values():
+            _events.detect(ds.day, ds.station, ds.values[ds.names.index(rule.column)],
+                           rule, ds.days.key)
+
+    for name, fn in [("ranking", ranking), ("recent_window", recent_window),
+                     ("normals", normals), ("yearly_monthly", yearly_monthly),
+                     ("trend_fit", trend_fit("linear")),
+                     ("trend_fit_piecewise", trend_fit("piecewise")),
+                     ("trend_fit_loess", trend_fit("loess")), ("trend_atlas", trend_atlas),
+                     ("events", events), ("etccdi", etccdi)]:
+        out[name] = measure(fn, repeat)
+    return out
+
+
+def edge_checks(ds) -> list[str]:
+    """자료 양 끝 근처 선택일에서 페이지가 만드는 배열 길이가 맞는지 (실패 항목 목록)
+
+    최근 N일 꺾은선은 날짜 N개와 daily() 값 N개를 한 표로 묶으므로 길이가 같아야 한다.
+    """
+    ds = ds.for_station()
+    first, last = int(ds.day.min()), int(ds.day.max())
+    failed = []
+    for sel_day in (first, first + 1, first + 10, last, last + 1):
+        for n in (3, 14, 30):
+            vals = ds.windows.daily(sel_day - n, sel_day)
+            if vals.shape != (len(ds.windows.names), n):
+                failed.append(f"windows.daily({sel_day - n}, {sel_day}) → {vals.shape}")
+            mean, _ = ds.windows.trailing([sel_day], n)
+            if mean.shape != (len(ds.windows.names), 1):
+                failed.append(f"windows.trailing([{sel_day}], {n}) → {mean.shape}")
+    return failed
+
+
+def run_scale(scale: str, repeat: int) -> dict:
+    path = ensure_csv(scale)
+    shutil.rmtree(sidecar_dir(path), ignore_errors=True)
+    loader.clear_cache()
+
+    res = {"rows": None, "csv_mb": round(os.path.getsize(path) / 2 ** 20, 1)}
+    holder = {}
+    res["load_csv"] = measure(lambda: holder.update(ds=loader.load(path)), setup=lambda: (
+        loader.clear_cache(), shutil.rmtree(sidecar_dir(path), ignore_errors=True)))
+    res["load_sidecar"] = measure(lambda: holder.update(ds=loader.load(path)),
+                                  setup=loader.clear_cache)
+    ds = holder["ds"]
+    res["rows"] = len(ds)
+    res["sections"] = section_benchmarks(ds, repeat)
+    res["edge_failures"] = edge_checks(ds)
+    res["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    loader.clear_cache()
+    return res
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """이전 결과 대비 threshold배 이상 느려진 항목"""
+    flagged = []
+    for scale, res in current["scales"].items():
+        old = baseline.get("scales", {}).get(scale)
+        if not old:
+            continue
+        pairs = [(k, res[k], old.get(k)) for k in ("load_csv", "load_sidecar")]
+        pairs += [(f"sections.{k}", v, old.get("sections", {}).get(k))
+                  for k, v in res["sections"].items()]
+        for name, new, prev in pairs:
+            if not prev or not prev["ms"]:
+                continue
+            ratio = new["ms"] / prev["ms"]
+            mark = "  ⚠️" if ratio >= threshold else ""
+            print(f"  {scale:>6} {name:<28} {prev['ms']:>10.2f} → {new['ms']:>10.2f} ms "
+                  f"(×{ratio:.2f}){mark}")
+            if mark:
+                flagged.append(f"{scale}:{name}")
+    return flagged
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="기온 앱 성능 벤치마크")
+    parser.add_argument("scales", nargs="*", default=["1x", "10x"], choices=sorted(PRESETS))
+    parser.add_argument("--repeat", type=int, default=5, help="섹션별 반복 횟수")
+    parser.add_argument("--save", nargs="?", const="", metavar="NAME",
+                        help="bench/results/<NAME>.json으로 저장 (기본: 시각)")
+    parser.add_argument("--compare", metavar="JSON", help="비교할 이전 결과 파일")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="이 배율 이상 느려지면 회귀로 표시 (기본 1.5)")
+    args = parser.parse_args(argv)
+
+    result = {"created": datetime.datetime.now().isoformat(timespec="seconds"),
+              "python": platform.python_version(), "machine": platform.machine(),
+              "numpy": np.__version__, "scales": {}}
+    for scale in args.scales:
+        print(f"[{scale}]")
+        res = run_scale(scale, args.repeat)
+        result["scales"][scale] = res
+        print(f"  {res['rows']:,}행 / CSV {res['csv_mb']} MB / 최대 RSS {res['max_rss_mb']} MB")
+        print(f"  load_csv      {res['load_csv']['ms']:>10.2f} ms  {res['load_csv']['peak_mb']:>8} MB")
+        print(f"  load_sidecar  {res['load_sidecar']['ms']:>10.2f} ms  "
+              f"{res['load_sidecar']['peak_mb']:>8} MB")
+        for name, m in res["sections"].items():
+            print(f"  {name:<20}{m['ms']:>10.2f} ms  {m['peak_mb']:>8} MB")
+        for msg in res["edge_failures"]:
+            print(f"  ❌ 경계 확인 실패: {msg}")
+
+    if args.save is not None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = args.save or datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        out = os.path.join(RESULTS_DIR, f"{name}.json")
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {out}")
+
+    status = 0
+    if any(res["edge_failures"] for res in result["scales"].values()):
+        status = 1
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            flagged = compare(result, json.load(f), args.threshold)
+        if flagged:
+            print(f"회귀 {len(flagged)}건: {', '.join(flagged)}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
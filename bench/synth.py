@@ -0,0 +1,105 @@
+# ────────────────────────────────────────────────────────────────
+#  합성 KMA 기온 CSV 생성기
+#  ▸ 실제 내려받기 파일과 같은 모양
+#     - 7행 설명 + 머리글, CP949
+#     - 날짜 앞 탭 문자("\t1907-10-01"), 지점 열
+#  ▸ 계절 주기 + 온난화 추세 + 잡음, 일부 결측·결측 구간 포함
+#  ▸ 규모 = 지점 수 × 연수 (서울 1지점 ~118년 ≈ 42,600행이 1×)
+# ────────────────────────────────────────────────────────────────
+import argparse
+import os
+
+import numpy as np
+
+HEADER = ("기온분석\n[검색조건]\n자료구분 : 일\n자료형태 : 기본\n"
+          "지역/지점 : {region}\n기간 : {start}~{end}\n\n"
+          "날짜,지점,평균기온(℃),최저기온(℃),최고기온(℃)\n")
+
+# 배율 → 지점 수 (기간은 모두 1907-10-01 ~ 2025-07-13)
+PRESETS = {"1x": 1, "10x": 10, "100x": 100, "1000x": 1000}
+
+
+def synth_station(station: int, start: str, end: str, rng: np.random.Generator,
+                  missing: float = 0.01) -> tuple[np.ndarray, np.ndarray]:
+    """지점 하나의 (날짜 배열, 기온 (행, 3)=평균·최저·최고)"""
+    days = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    n = len(days)
+    doy = (days - days.astype("datetime64[Y]")).astype(np.int64)
+    years = (days.astype("datetime64[Y]").astype(np.int64) + 1970).astype(np.float64)
+
+    offset = rng.normal(0, 3)            # 지점별 기후 차이
+    season = 12.5 + offset - 14.5 * np.cos(2 * np.pi * (doy - 15) / 365.25)
+    trend = 0.02 * (years - 1960)
+    avg = season + trend + rng.normal(0, 2.5, n)
+    spread = np.abs(rng.normal(8, 2, n))
+    low = avg - spread * 0.45
+    high = avg + spread * 0.55
+    temps = np.round(np.column_stack([avg, low, high]), 1)
+
+    temps[rng.random(n) < missing] = np.nan
+    # 몇 년 단위의 긴 결측 구간 (예: 전쟁기)
+    if n > 3650 and rng.random() < 0.5:
+        a = int(rng.integers(0, n - 1000))
+        b = a + int(rng.integers(300, 1000))
+        days = np.concatenate([days[:a], days[b:]])
+        temps = np.concatenate([temps[:a], temps[b:]])
+    return days, temps
+
+
+def write_csv(path: str, stations: int = 1, start: str = "1907-10-01",
+              end: str = "2025-07-13", seed: int = 0, interleave: bool = False) -> int:
+    """합성 CSV 작성 후 데이터 행 수 반환
+
+    interleave=False면 지점별로 이어 쓰고(지점→날짜 순), True면 날짜→지점 순.
+    """
+    rng = np.random.default_rng(seed)
+    ids = 90 + np.arange(stations) if stations > 1 else np.array([108])
+    blocks = []
+    for sid in ids:
+        days, temps = synth_station(int(sid), start, end, rng)
+        blocks.append((np.full(len(days), sid), days, temps))
+
+    sid = np.concatenate([b[0] for b in blocks])
+    days = np.concatenate([b[1] for b in blocks])
+    temps = np.concatenate([b[2] for b in blocks])
+    if interleave:
+        order = np.lexsort((sid, days))
+        sid, days, temps = sid[order], days[order], temps[order]
+
+    region = "서울" if stations == 1 else f"전국 {stations}개 지점"
+    with open(path, "w", encoding="cp949", newline="\n") as f:
+        f.write(HEADER.format(region=region, start=start.replace("-", ""),
+                              end=end.replace("-", "")))
+        step = 500_000
+        for i in range(0, len(days), step):
+            sl = slice(i, i + step)
+            cols = [np.char.add("\t", days[sl].astype(str)), sid[sl].astype(str)]
+            for j in range(3):
+                t = temps[sl, j]
+                cols.append(np.where(np.isnan(t), "", np.char.mod("%.1f", t)))
+            lines = cols[0]
+            for c in cols[1:]:
+                lines = np.char.add(np.char.add(lines, ","), c)
+            f.write("\n".join(lines.tolist()))
+            f.write("\n")
+    return len(days)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="합성 KMA 기온 CSV 생성")
+    parser.add_argument("scale", choices=sorted(PRESETS), help="배율 프리셋")
+    parser.add_argument("-o", "--out", help="출력 경로 (기본 bench/data/ta_synth_<배율>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--interleave", action="store_true", help="날짜→지점 순으로 기록")
+    args = parser.parse_args(argv)
+
+    stations = PRESETS[args.scale]
+    out = args.out or os.path.join(os.path.dirname(__file__), "data",
+                                   f"ta_synth_{args.scale}.csv")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    n = write_csv(out, stations, seed=args.seed, interleave=args.interleave)
+    print(f"{n:,}행 → {out}")
+
+
+if __name__ == "__main__":
+    main()
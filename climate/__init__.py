@@ -0,0 +1,7 @@
+# ────────────────────────────────────────────────────────────────
+#  climate – 기온 CSV 로드·분석 공통 모듈
+#  ▸ Streamlit 페이지(main.py, pages/*)가 함께 사용
+# ────────────────────────────────────────────────────────────────
+from climate.loader import Dataset, find_default_csv, load, parse_temperature_csv
+
+__all__ = ["Dataset", "find_default_csv", "load", "parse_temperature_csv"]
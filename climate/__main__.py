@@ -0,0 +1,86 @@
+# ────────────────────────────────────────────────────────────────
+#  명령줄 실행: python -m climate <명령> ...
+#  ▸ report : 날짜 범위 전체 리포트를 Parquet/Feather로 저장
+#  ▸ ingest : 가장 최근 내려받기 파일을 이전 사이드카에 증분 반영
+# ────────────────────────────────────────────────────────────────
+import argparse
+import datetime
+import os
+import sys
+import time
+
+from climate.loader import find_default_csv
+
+
+def _date(s: str) -> datetime.date:
+    return datetime.date.fromisoformat(s)
+
+
+def cmd_report(args) -> int:
+    from climate.report import parallel_report, write_columnar
+
+    src = args.src or find_default_csv()
+    if src is None:
+        print("CSV 경로를 지정하거나 ta*.csv 파일을 현재 폴더에 두세요.", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    table = parallel_report(src, args.start, args.end,
+                            tuple(args.years) if args.years else None,
+                            args.days, tuple(args.baseline), args.workers)
+    write_columnar(table, args.out)
+    print(f"{len(table)}일 → {args.out} ({time.perf_counter() - t0:.1f}s)")
+    return 0
+
+
+def cmd_ingest(args) -> int:
+    from climate import sidecar
+    from climate.ingest import ingest
+
+    src = args.src or "."
+    if os.path.isdir(src):
+        src = find_default_csv(src)
+    if src is None:
+        print("ta*.csv 파일이 없습니다.", file=sys.stderr)
+        return 1
+    if sidecar.load(src) is not None and not args.force:
+        print(f"{src}: 이미 반영됨")
+        return 0
+    t0 = time.perf_counter()
+    res = ingest(src)
+    base = os.path.basename(os.path.dirname(res.base)) if res.base else "없음"
+    print(f"{src}: {res.mode} (기준 {base}) 추가 {res.added} · 수정 {res.corrected} · "
+          f"삭제 {res.removed} → {res.rows}행 ({time.perf_counter() - t0:.2f}s)")
+    if res.pruned:
+        print(f"이전 사이드카 {len(res.pruned)}개 정리")
+    return 0 if res.saved else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m climate",
+                                     description="기온 데이터 일괄 분석")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("report", help="날짜별 순위·기록·평년편차·최근 N일 리포트")
+    p.add_argument("src", nargs="?", help="KMA 기온 CSV (기본: 현재 폴더의 ta*.csv)")
+    p.add_argument("--start", type=_date, help="시작 날짜 YYYY-MM-DD")
+    p.add_argument("--end", type=_date, help="끝 날짜 YYYY-MM-DD")
+    p.add_argument("--years", type=int, nargs=2, metavar=("FROM", "TO"),
+                   help="순위 비교 연도 범위 (기본: 전체)")
+    p.add_argument("--days", type=int, default=14, help="최근 N일 (기본 14)")
+    p.add_argument("--baseline", type=int, nargs=2, default=(1991, 2020),
+                   metavar=("FROM", "TO"), help="평년 기준 기간")
+    p.add_argument("--workers", type=int, help="프로세스 수 (기본: CPU 수)")
+    p.add_argument("-o", "--out", default="report.parquet", help="출력 파일")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("ingest", help="새 내려받기 파일의 바뀐 행만 사이드카에 반영")
+    p.add_argument("src", nargs="?", help="CSV 또는 폴더 (기본: 현재 폴더의 최신 ta_*.csv)")
+    p.add_argument("--force", action="store_true", help="사이드카가 최신이어도 다시 반영")
+    p.set_defaults(func=cmd_ingest)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
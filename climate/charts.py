@@ -0,0 +1,122 @@
+# ────────────────────────────────────────────────────────────────
+#  차트 데이터 계층 (Plotly)
+#  ▸ 긴 시계열은 모양을 살리는 다운샘플링으로 점 수를 POINT_BUDGET 이하로
+#     - lttb   : Largest-Triangle-Three-Buckets (꺾은선 모양 유지)
+#     - minmax : 구간마다 최솟값·최댓값 (극값 유지)
+#     - 결측(NaN) 구간은 끊김이 그대로 보이도록 NaN 하나를 남긴다
+#  ▸ 점이 WEBGL_THRESHOLD개를 넘으면 Scattergl(WebGL) 트레이스 사용
+#  ▸ cached_figure: 입력 키가 같으면 그림을 다시 만들지 않고 재사용
+#    (프로세스 공용, 최근 FIGURE_CACHE_SIZE개 – 보관본은 두고 매번 복사본을
+#     돌려주므로 받은 쪽에서 고쳐도 다른 세션에 번지지 않음)
+# ────────────────────────────────────────────────────────────────
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+POINT_BUDGET = 2000
+WEBGL_THRESHOLD = 1000
+FIGURE_CACHE_SIZE = 64
+
+
+# ────────────── 1. 다운샘플링 ──────────────
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB로 고른 n_out개 점의 위치 (x 오름차순, 결측 없음 가정)"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(hi, edges[i + 2] if i + 2 < len(edges) else n)
+        ax, ay = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - ax) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ay - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """n_out/2개 구간마다 최솟값·최댓값 위치 (결측 없음 가정)"""
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    picks = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            seg = y[lo:hi]
+            picks += [lo + int(np.argmin(seg)), lo + int(np.argmax(seg))]
+    return np.unique(picks)
+
+
+def _numeric_x(x: np.ndarray) -> np.ndarray:
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[s]").astype(np.float64)
+    if np.issubdtype(x.dtype, np.number):
+        return x.astype(np.float64)
+    return np.arange(len(x), dtype=np.float64)
+
+
+def downsample(x, y, budget: int = POINT_BUDGET, method: str = "lttb") -> np.ndarray:
+    """점 수를 budget 이하로 줄인 위치 배열 (결측 구간마다 NaN 위치 하나 유지)"""
+    x, y = np.asarray(x), np.asarray(y, np.float64)
+    if len(y) <= budget:
+        return np.arange(len(y))
+    nan = np.isnan(y)
+    ok = np.flatnonzero(~nan)
+    if method == "lttb":
+        keep = ok[lttb(_numeric_x(x)[ok], y[ok], budget)]
+    elif method == "minmax":
+        keep = ok[minmax(y[ok], budget)]
+    else:
+        raise ValueError(f"알 수 없는 다운샘플링 방법: {method}")
+    if nan.any() and len(keep) > 1:
+        before = np.r_[0, np.cumsum(nan)]
+        gap = before[keep[1:]] > before[keep[:-1] + 1]
+        first_nan = np.searchsorted(np.cumsum(nan), before[keep[:-1][gap] + 1] + 1)
+        keep = np.sort(np.r_[keep, first_nan])
+    return keep
+
+
+# ────────────── 2. 트레이스 ──────────────
+def line(x, y, name: str | None = None, budget: int = POINT_BUDGET,
+         method: str = "lttb", **kw) -> go.Scatter:
+    """다운샘플링한 꺾은선 트레이스 (점이 많으면 WebGL)"""
+    x, y = np.asarray(x), np.asarray(y, np.float64)
+    idx = downsample(x, y, budget, method)
+    trace = go.Scattergl if len(idx) > WEBGL_THRESHOLD else go.Scatter
+    kw.setdefault("mode", "lines")
+    return trace(x=x[idx], y=y[idx], name=name, **kw)
+
+
+def points(x, y, name: str | None = None, **kw) -> go.Scatter:
+    """산점도 트레이스 – 모양을 줄일 수 없으니 다운샘플링 없이 WebGL 전환만"""
+    trace = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    kw.setdefault("mode", "markers")
+    return trace(x=np.asarray(x), y=np.asarray(y), name=name, **kw)
+
+
+# ────────────── 3. 그림 캐시 ──────────────
+_figures: "OrderedDict[tuple, go.Figure]" = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def cached_figure(key: tuple, build) -> go.Figure:
+    """key(데이터셋 키·선택값 등)가 같으면 이전 그림의 복사본, 없으면 build()로 생성"""
+    with _figures_lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+    if fig is not None:
+        return go.Figure(fig)
+    fig = build()
+    with _figures_lock:
+        _figures[key] = go.Figure(fig)
+        while len(_figures) > FIGURE_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return fig
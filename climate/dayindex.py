@@ -0,0 +1,96 @@
+# ────────────────────────────────────────────────────────────────
+#  월·일(MM-DD) 정수 키와 같은 날짜 묶음 인덱스
+#  ▸ 키 = 윤년 달력 기준 0~365 (1월 1일 = 0, 2월 29일 = 59, 12월 31일 = 365)
+#     평년에는 59가 비어 있을 뿐, 3월 1일 이후도 항상 같은 키를 가진다
+#  ▸ 키별 행 위치를 (키, 날짜) 순으로 한 번 정렬해 두고
+#     "같은 MM-DD + 연도 범위" 조회를 이진 탐색 슬라이스로 처리
+# ────────────────────────────────────────────────────────────────
+import datetime
+from functools import cached_property
+
+import numpy as np
+
+N_KEYS = 366
+KEY_FEB29 = 59
+
+# 윤년 달력에서 각 월 1일의 키
+_MONTH_START = np.array([0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335],
+                        np.int16)
+# MM-DD 키 → 월(1~12)
+_KEY_MONTH = np.repeat(np.arange(1, 13, dtype=np.int8), np.diff(np.r_[_MONTH_START, N_KEYS]))
+
+
+def date_key(date) -> int:
+    """date/datetime/Timestamp → MM-DD 키"""
+    return int(_MONTH_START[date.month - 1]) + date.day - 1
+
+
+def day_number(date) -> int:
+    """date/Timestamp → 1970-01-01 기준 일수 (Dataset.day와 같은 단위)"""
+    return (datetime.date(date.year, date.month, date.day)
+            - datetime.date(1970, 1, 1)).days
+
+
+def key_label(key: int) -> str:
+    """MM-DD 키 → 'MM-DD' 문자열"""
+    d = datetime.date(2000, 1, 1) + datetime.timedelta(days=int(key))
+    return f"{d:%m-%d}"
+
+
+def split_days(day: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """1970-01-01 기준 일수 배열 → (연도 int16, MM-DD 키 int16)"""
+    d = np.asarray(day).astype("datetime64[D]")
+    y = d.astype("datetime64[Y]")
+    m = d.astype("datetime64[M]")
+    month = (m - y).astype(np.int16)
+    dom = (d - m).astype(np.int16)
+    year = (y.astype(np.int64) + 1970).astype(np.int16)
+    return year, (_MONTH_START[month] + dom).astype(np.int16)
+
+
+class DayIndex:
+    """MM-DD 키 → 해당 날짜 행 위치(연도 오름차순) 조회 인덱스
+
+    year·key·order를 넘기면 (사이드카 mmap 등) 그대로 쓰고 다시 계산하지 않는다.
+    """
+
+    def __init__(self, day: np.ndarray, year: np.ndarray | None = None,
+                 key: np.ndarray | None = None, order: np.ndarray | None = None):
+        if year is None or key is None:
+            year, key = split_days(day)
+        self.year, self.key = year, key
+        # 키별로 묶고, 같은 키 안에서는 날짜 순
+        self.order = np.lexsort((day, key)) if order is None else order
+        self.offsets = np.r_[0, np.cumsum(np.bincount(key, minlength=N_KEYS))]
+
+    def _bounds(self, key: int, years: tuple[int, int] | None) -> tuple[int, int]:
+        lo, hi = int(self.offsets[key]), int(self.offsets[key + 1])
+        if years is not None:
+            ys = self.year[self.order[lo:hi]]
+            lo, hi = (lo + int(np.searchsorted(ys, years[0], "left")),
+                      lo + int(np.searchsorted(ys, years[1], "right")))
+        return lo, hi
+
+    @cached_property
+    def month(self) -> np.ndarray:
+        """행별 월(1~12) – 키에서 표 조회로 (처음 사용할 때 한 번)"""
+        return _KEY_MONTH[self.key]
+
+    def rows(self, key: int, years: tuple[int, int] | None = None) -> np.ndarray:
+        """같은 MM-DD 행 위치 (연도 범위는 양 끝 포함)"""
+        lo, hi = self._bounds(key, years)
+        return self.order[lo:hi]
+
+    def rows_many(self, keys, years: tuple[int, int] | None = None) -> np.ndarray:
+        """여러 MM-DD 키의 행 위치를 합쳐 원래 행 순서로 반환"""
+        parts = [self.rows(int(k), years) for k in keys]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, np.intp)
+
+    def row(self, date) -> int | None:
+        """해당 날짜의 행 위치 (없으면 None)"""
+        r = self.rows(date_key(date), (date.year, date.year))
+        return int(r[0]) if len(r) else None
+
+    def count(self, key: int, years: tuple[int, int] | None = None) -> int:
+        lo, hi = self._bounds(key, years)
+        return hi - lo
@@ -0,0 +1,173 @@
+# ────────────────────────────────────────────────────────────────
+#  극한 현상(폭염·열대야·한파 등) 연속 구간 탐지
+#  ▸ 조건을 만족하는 날이 하루도 빠짐없이 이어진 구간 = 사건 하나
+#     - 날짜가 비거나(결측 행), 값이 NaN이거나, 지점이 바뀌면 끊김
+#  ▸ 행 순회 없이 런 길이 부호화(RLE) 한 번: 시작·끝 위치 → reduceat으로 최고·강도
+#  ▸ 기준값: 고정(℃) 또는 MM-DD별 백분위(전 연도, ±2일 창 – climate.percentile)
+#  ▸ 사건 표는 시작일 순으로 정렬해 기간 조회는 이진 탐색,
+#    PRESETS 규칙은 데이터셋마다 한 번 계산해 사이드카에 함께 저장 (Dataset.events)
+# ────────────────────────────────────────────────────────────────
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from climate import percentile as _percentile
+from climate.dayindex import split_days
+from climate.sidecar import day_dates
+
+
+class Rule(NamedTuple):
+    """사건 규칙 – above면 값 ≥ 기준, 아니면 값 ≤ 기준이 min_days일 이상 이어질 때"""
+    label: str
+    column: str
+    above: bool
+    threshold: float          # ℃, percentile이면 백분위(0~100)
+    min_days: int = 1
+    percentile: bool = False
+
+
+# 기상청 특보 기준(일 최고·최저기온 근사)과 백분위 기준 예시
+PRESETS = {
+    "폭염": Rule("폭염", "최고기온(℃)", True, 33.0, 2),
+    "열대야": Rule("열대야", "최저기온(℃)", True, 25.0, 1),
+    "한파": Rule("한파", "최저기온(℃)", False, -12.0, 2),
+    "고온(상위 10%)": Rule("고온(상위 10%)", "최고기온(℃)", True, 90.0, 3, True),
+    "저온(하위 10%)": Rule("저온(하위 10%)", "최저기온(℃)", False, 10.0, 3, True),
+}
+
+
+def is_preset(rule: Rule) -> bool:
+    """이름과 상관없이 PRESETS 중 하나와 조건이 같은지 (사이드카에 저장할 규칙)"""
+    return any(rule[1:] == p[1:] for p in PRESETS.values())
+
+
+# 저장 배열 (5, 사건 수)의 행
+_START, _END, _STATION, _PEAK, _INTENSITY = range(5)
+
+
+def cache_name(rule: Rule, col: int) -> str:
+    """사이드카에 저장할 배열 이름 (col = 규칙 열의 위치)"""
+    op = "ge" if rule.above else "le"
+    kind = f"w{_percentile.WINDOW}p" if rule.percentile else "c"
+    return f"events_{col}_{op}{rule.threshold:g}{kind}_{rule.min_days}"
+
+
+def threshold_of(rule: Rule, values: np.ndarray, key: np.ndarray,
+                 station: np.ndarray) -> np.ndarray | float:
+    """행별 기준값 (고정이면 스칼라, 백분위면 지점별로 행의 MM-DD 키에서 고른 배열)"""
+    if not rule.percentile:
+        return rule.threshold
+    out = np.empty(len(values))
+    cuts = np.r_[0, np.flatnonzero(np.diff(station)) + 1, len(values)]
+    for a, b in zip(cuts[:-1], cuts[1:]):
+        thr = _percentile.thresholds(values[a:b], key[a:b], rule.threshold)
+        out[a:b] = thr[key[a:b]]
+    return out
+
+
+def detect(day: np.ndarray, station: np.ndarray, values: np.ndarray, rule: Rule,
+           key: np.ndarray | None = None) -> np.ndarray:
+    """(지점, 날짜) 순 한 열 값 → 사건 배열 (5, 사건 수) float64
+
+    행: 시작일·끝일(1970-01-01 기준 일수), 지점, 최고(한랭 규칙은 최저),
+    강도(기준을 넘어선 정도의 합, ℃·일). 시작일 순으로 정렬.
+    """
+    day = np.asarray(day)
+    values = np.asarray(values, np.float64)
+    n = len(day)
+    if n == 0:
+        return np.empty((5, 0))
+    if key is None:
+        key = split_days(day)[1]
+
+    thr = threshold_of(rule, values, key, station)
+    with np.errstate(invalid="ignore"):
+        excess = values - thr if rule.above else thr - values
+        hit = excess >= 0                     # NaN은 False
+
+    # 앞 행과 이어지지 않는 곳(날짜 공백·지점 경계)에서 끊김
+    brk = np.ones(n, bool)
+    brk[1:] = (np.diff(day) != 1) | (station[1:] != station[:-1])
+    prev = np.r_[False, hit[:-1]] & ~brk
+    nxt = np.r_[hit[1:] & ~brk[1:], False]
+    starts = np.flatnonzero(hit & ~prev)
+    ends = np.flatnonzero(hit & ~nxt)
+
+    length = ends - starts + 1
+    keep = length >= rule.min_days
+    if not keep.any():
+        return np.empty((5, 0))
+    # 조건을 만족한 행만 모으면 사건마다 연속 구간 → reduceat 한 번에 최고·강도
+    offsets = np.r_[0, np.cumsum(length)[:-1]]
+    peak_fn = np.maximum if rule.above else np.minimum
+
+    out = np.empty((5, int(keep.sum())))
+    out[_START] = day[starts[keep]]
+    out[_END] = day[ends[keep]]
+    out[_STATION] = station[starts[keep]]
+    out[_PEAK] = peak_fn.reduceat(values[hit], offsets)[keep]
+    out[_INTENSITY] = np.add.reduceat(excess[hit], offsets)[keep]
+    return out[:, np.lexsort((out[_STATION], out[_START]))]
+
+
+class EventTable:
+    """시작일 순 사건 표 – 기간 조회는 searchsorted, 연도별 집계는 bincount"""
+
+    def __init__(self, rule: Rule, arr: np.ndarray):
+        self.rule = rule
+        self.start = arr[_START].astype(np.int32)
+        self.end = arr[_END].astype(np.int32)
+        self.station = arr[_STATION].astype(np.int32)
+        self.peak = np.asarray(arr[_PEAK])
+        self.intensity = np.asarray(arr[_INTENSITY])
+        self.length = self.end - self.start + 1
+        self.year = split_days(self.start)[0] if len(self.start) else np.empty(0, np.int16)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def between(self, first_day: int, last_day: int) -> np.ndarray:
+        """시작일이 [first_day, last_day]인 사건 위치"""
+        a, b = np.searchsorted(self.start, [first_day, last_day + 1])
+        return np.arange(a, b)
+
+    def in_years(self, years: tuple[int, int]) -> np.ndarray:
+        """시작 연도가 years 범위(양끝 포함)인 사건 위치"""
+        a, b = np.searchsorted(self.year, [years[0], years[1] + 1])
+        return np.arange(a, b)
+
+    def frame(self, idx: np.ndarray | None = None) -> pd.DataFrame:
+        """사건 표 (지점·시작·끝·일수·최댓값/최솟값·강도)"""
+        idx = np.arange(len(self)) if idx is None else idx
+        peak = "최댓값(℃)" if self.rule.above else "최솟값(℃)"
+        return pd.DataFrame({
+            "지점": self.station[idx],
+            "시작": day_dates(self.start[idx]),
+            "끝": day_dates(self.end[idx]),
+            "일수": self.length[idx],
+            peak: self.peak[idx].round(1),
+            "강도(℃·일)": self.intensity[idx].round(1),
+        })
+
+    def top(self, by: str = "length", n: int = 10,
+            idx: np.ndarray | None = None) -> np.ndarray:
+        """긴(by="length") 또는 강한(by="intensity") 순 상위 n개 위치 (동점은 이른 사건 먼저)"""
+        idx = np.arange(len(self)) if idx is None else idx
+        score = getattr(self, by)[idx]
+        return idx[np.argsort(-score, kind="stable")[:n]]
+
+    def per_year(self, years: tuple[int, int]) -> pd.DataFrame:
+        """연도별 사건 수·일수 합·최장·강도 합 (사건 없는 해는 0)"""
+        y0, y1 = years
+        idx = self.in_years(years)
+        y = self.year[idx].astype(np.int64) - y0
+        n = y1 - y0 + 1
+        longest = np.zeros(n, np.int64)
+        np.maximum.at(longest, y, self.length[idx])
+        return pd.DataFrame({
+            "횟수": np.bincount(y, minlength=n),
+            "일수": np.bincount(y, self.length[idx], minlength=n).astype(np.int64),
+            "최장(일)": longest,
+            "강도(℃·일)": np.bincount(y, self.intensity[idx], minlength=n).round(1),
+        }, index=pd.RangeIndex(y0, y1 + 1, name="연도"))
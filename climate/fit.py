@@ -0,0 +1,117 @@
+# ────────────────────────────────────────────────────────────────
+#  연도별 기온 추세 적합·예측 (NumPy만 사용)
+#  ▸ 모든 모형을 "선형 평활기"로 표현: 예측값 = S @ y
+#     - linear    : 직선 [1, x]              (정규방정식)
+#     - piecewise : 꺾인 직선 [1, x, (x-꺾는 연도)+]
+#     - loess     : 국소 선형 회귀 (tricube 가중치, span = 사용하는 자료 비율)
+#  ▸ 열마다 결측 위치가 달라도 S를 (열, 예측 연도, 입력 연도) 배치로 한 번에 계산
+#  ▸ 예측 구간은 잔차 부트스트랩
+#     y* = ŷ + 재표집 잔차 (열 × n_boot × 입력 연도) → 행렬곱 한 번으로 모든 재표집 적합
+#     + 새 관측 잡음(재표집 잔차)을 더한 분위수
+# ────────────────────────────────────────────────────────────────
+from typing import NamedTuple
+
+import numpy as np
+
+MODELS = {"linear": "직선", "piecewise": "꺾인 직선", "loess": "LOESS"}
+
+
+class Forecast(NamedTuple):
+    fitted: np.ndarray   # (열, 예측 연도) 예측값
+    lower: np.ndarray    # (열, 예측 연도) 예측 구간 하한
+    upper: np.ndarray    # (열, 예측 연도) 예측 구간 상한
+
+
+# ────────────── 1. 평활 행렬 ──────────────
+def _basis(x: np.ndarray, model: str, knot: float | None) -> np.ndarray:
+    cols = [np.ones_like(x), x]
+    if model == "piecewise":
+        cols.append(np.maximum(x - knot, 0))
+    return np.stack(cols, axis=1)
+
+
+def _parametric(x, ok, x_new, model, knot) -> np.ndarray:
+    """정규방정식 (XᵀWX)⁻¹XᵀW 를 열별로 풀어 X_new에 곱한 (열, m, n) 행렬"""
+    X, X_new = _basis(x, model, knot), _basis(x_new, model, knot)
+    XtW = X.T[None, :, :] * ok[:, None, :]                 # (열, p, n)
+    A = XtW @ X                                            # (열, p, p)
+    coef = np.linalg.solve(A, XtW)                         # (열, p, n)
+    return X_new[None] @ coef
+
+
+def _loess(x, ok, x_new, span) -> np.ndarray:
+    """국소 선형 회귀 가중치 행렬 (열, m, n)"""
+    dx = x[None, None, :] - x_new[None, :, None]           # (1, m, n)
+    dist = np.where(ok[:, None, :], np.abs(dx), np.inf)    # (열, m, n)
+    q = np.maximum(np.ceil(span * ok.sum(axis=1)).astype(int), 3)
+    h = np.take_along_axis(np.sort(dist, axis=2),
+                           np.minimum(q, ok.shape[1])[:, None, None] - 1, axis=2)
+    h = np.maximum(h * 1.000001, 1e-9)                     # q번째 점도 가중치가 0이 되지 않게
+    w = np.clip(1 - (dist / h) ** 3, 0, None) ** 3
+    s0, s1, s2 = (np.sum(w * dx ** j, axis=2, keepdims=True) for j in range(3))
+    return w * (s2 - s1 * dx) / (s0 * s2 - s1 * s1)
+
+
+def smoother(x, ok: np.ndarray, x_new, model: str = "linear",
+             knot: float | None = None, span: float = 0.5) -> np.ndarray:
+    """입력 연도 x의 값 → x_new 예측값으로 보내는 (열, m, n) 행렬 (결측 열은 가중치 0)"""
+    if model not in MODELS:
+        raise ValueError(f"알 수 없는 모형: {model}")
+    x, x_new = np.asarray(x, np.float64), np.asarray(x_new, np.float64)
+    center = x.mean()                                      # 연도 원점 이동 – 조건수 개선
+    x, x_new = x - center, x_new - center
+    ok = ok.astype(np.float64)
+    if model == "loess":
+        return _loess(x, ok > 0, x_new, span)
+    if model == "piecewise":
+        knot = (np.median(x) if knot is None else knot - center)
+        # 꺾는 연도 앞·뒤 어느 한쪽에 자료가 없으면 정규방정식이 특이 행렬
+        before = ((ok > 0) & (x[None, :] < knot)).any(axis=1)
+        after = ((ok > 0) & (x[None, :] > knot)).any(axis=1)
+        if not (before & after).all():
+            raise ValueError("꺾는 연도 앞뒤에 결측이 아닌 연도가 하나 이상씩 필요합니다")
+    return _parametric(x, ok, x_new, model, knot)
+
+
+# ────────────── 2. 적합·예측 ──────────────
+def fit(x, Y: np.ndarray, x_new, model: str = "linear", **opts) -> np.ndarray:
+    """열별 예측값 (열, m) – Y는 (열, n), 결측은 NaN"""
+    Y = np.atleast_2d(np.asarray(Y, np.float64))
+    ok = ~np.isnan(Y)
+    return np.einsum("kmn,kn->km", smoother(x, ok, x_new, model, **opts), np.where(ok, Y, 0))
+
+
+def forecast(x, Y: np.ndarray, x_new, model: str = "linear", n_boot: int = 2000,
+             level: float = 0.95, seed: int | None = 0, **opts) -> Forecast:
+    """예측값과 잔차 부트스트랩 예측 구간
+
+    열마다 결측이 아닌 연도가 3개 미만이거나, 꺾인 직선의 꺾는 연도 한쪽에
+    자료가 없으면 ValueError.
+    """
+    x = np.asarray(x, np.float64)
+    Y = np.atleast_2d(np.asarray(Y, np.float64))
+    ok = ~np.isnan(Y)
+    n = Y.shape[1]
+    if (ok.sum(axis=1) < 3).any():
+        raise ValueError("열마다 결측이 아닌 연도가 3개 이상 필요합니다")
+    y0 = np.where(ok, Y, 0)
+    S_new = smoother(x, ok, x_new, model, **opts)           # (열, m, n)
+    S_in = smoother(x, ok, x, model, **opts)                # (열, n, n)
+    fitted_in = np.einsum("kmn,kn->km", S_in, y0)
+    fitted = np.einsum("kmn,kn->km", S_new, y0)
+    resid = np.where(ok, Y - fitted_in, 0)
+
+    # 열마다 결측 아닌 잔차 중에서 균등 재표집 (위치 → 해당 열의 유효 위치)
+    rng = np.random.default_rng(seed)
+    valid = [np.flatnonzero(r) for r in ok]
+
+    def pick(size):
+        return np.stack([v[rng.integers(0, len(v), size)] for v in valid])
+
+    idx = pick((n_boot, n))                                  # (열, B, n)
+    Y_star = fitted_in[:, None, :] + np.take_along_axis(resid[:, None, :], idx, axis=2)
+    pred = np.einsum("kmn,kbn->kbm", S_new, Y_star * ok[:, None, :])   # (열, B, m)
+    noise = np.take_along_axis(resid[:, None, :], pick((n_boot, S_new.shape[1])), axis=2)
+    alpha = (1 - level) / 2
+    lower, upper = np.quantile(pred + noise, [alpha, 1 - alpha], axis=1)
+    return Forecast(fitted, lower, upper)
@@ -0,0 +1,74 @@
+# ────────────────────────────────────────────────────────────────
+#  체감온도(Heat Index 등) – NumPy 벡터 계산
+#  ▸ 기온·습도는 스칼라·배열 모두 가능 (브로드캐스팅)
+#  ▸ 조건 분기는 마스크로 처리해 전체 시계열·격자를 한 번에 계산
+#  ▸ 결측(NaN)은 그대로 NaN
+# ────────────────────────────────────────────────────────────────
+import numpy as np
+import pandas as pd
+
+
+def _c_to_f(t_c):
+    return t_c * 9 / 5 + 32
+
+
+def _f_to_c(t_f):
+    return (t_f - 32) * 5 / 9
+
+
+def _rothfusz(t_f, rh):
+    """NWS Rothfusz 회귀식 (화씨)"""
+    return (-42.379 + 2.04901523 * t_f + 10.14333127 * rh
+            - .22475541 * t_f * rh - 6.83783e-3 * t_f ** 2
+            - 5.481717e-2 * rh ** 2 + 1.22874e-3 * t_f ** 2 * rh
+            + 8.5282e-4 * t_f * rh ** 2 - 1.99e-6 * t_f ** 2 * rh ** 2)
+
+
+def heat_index(t_c, rh, method: str = "rothfusz") -> np.ndarray:
+    """섭씨·RH(%) → Heat Index(섭씨)
+
+    method
+      rothfusz : 80°F(26.7℃) 이상·RH 40% 이상에서만 회귀식, 그 밖은 기온 그대로
+      nws      : NWS 절차 – Steadman 단순식 평균이 80°F 이상이면 회귀식 +
+                 저습(RH<13%)·고습(RH>85%) 보정
+    """
+    t_c, rh = np.broadcast_arrays(np.asarray(t_c, np.float64),
+                                  np.asarray(rh, np.float64))
+    t_f = _c_to_f(t_c)
+    full = _rothfusz(t_f, rh)
+
+    if method == "rothfusz":
+        valid = (t_f >= 80) & (rh >= 40)
+        return np.where(valid, _f_to_c(full), t_c)
+    if method != "nws":
+        raise ValueError(f"알 수 없는 계산 방법: {method}")
+
+    simple = 0.5 * (t_f + 61.0 + (t_f - 68.0) * 1.2 + rh * 0.094)
+    use_full = (simple + t_f) / 2 >= 80
+    with np.errstate(invalid="ignore"):
+        dry = (rh < 13) & (t_f >= 80) & (t_f <= 112)
+        adj_dry = ((13 - rh) / 4) * np.sqrt(np.clip(17 - np.abs(t_f - 95), 0, None) / 17)
+        wet = (rh > 85) & (t_f >= 80) & (t_f <= 87)
+        adj_wet = ((rh - 85) / 10) * ((87 - t_f) / 5)
+    full = full - np.where(dry, adj_dry, 0) + np.where(wet, adj_wet, 0)
+    return _f_to_c(np.where(use_full, full, simple))
+
+
+def humidex(t_c, rh) -> np.ndarray:
+    """캐나다 Humidex (섭씨) – 수증기압 기반"""
+    t_c, rh = np.broadcast_arrays(np.asarray(t_c, np.float64),
+                                  np.asarray(rh, np.float64))
+    e = 6.112 * 10 ** (7.5 * t_c / (237.7 + t_c)) * rh / 100
+    return t_c + 5 / 9 * (e - 10)
+
+
+FORMULAS = {"heat_index": heat_index, "humidex": humidex}
+
+
+def grid(temps, rhs, formula: str = "heat_index", **kw) -> pd.DataFrame:
+    """(기온 × 습도) 체감온도 조견표, index = 기온, columns = 습도"""
+    temps = np.asarray(temps, np.float64)
+    rhs = np.asarray(rhs, np.float64)
+    values = FORMULAS[formula](temps[:, None], rhs[None, :], **kw)
+    return pd.DataFrame(values, index=pd.Index(temps, name="기온(℃)"),
+                        columns=pd.Index(rhs, name="습도(%)"))
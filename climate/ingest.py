@@ -0,0 +1,355 @@
+# ────────────────────────────────────────────────────────────────
+#  새 내려받기 파일 증분 반영
+#  ▸ 매일 받는 ta_YYYYMMDDhhmmss.csv는 앞 120년치가 이전 파일과 같고
+#    끝의 며칠만 새로 붙거나 고쳐진다
+#  ▸ 사이드카 meta의 stable = 최근 RECENT_DAYS일 이전까지의 본문 바이트 수·SHA-1
+#     - 새 파일의 같은 앞부분 해시가 같으면 나머지 뒷부분만 파싱해 합침 (tail)
+#     - 다르면 전체를 파싱한 뒤 행 단위로 비교 (full)
+#  ▸ 파생 표도 바뀐 행만 반영
+#     - 열별 순위 정렬 순서: 빠진 행을 지우고 새 행만 끼워 넣기
+#     - 연도별 합·개수: 바뀐 행만 빼고 더하기
+#     - 평년값: 기준 기간에 바뀐 행이 없으면 그대로 재사용
+#  ▸ 반영에 성공하면 이전 내려받기 파일의 사이드카는 최근 KEEP_SIDECARS개만 남긴다
+#    (매일 받는 파일마다 전체 사이드카가 쌓이지 않게, CSV는 건드리지 않음)
+# ────────────────────────────────────────────────────────────────
+import hashlib
+import mmap
+import os
+import re
+import shutil
+from typing import NamedTuple
+
+import numpy as np
+
+from climate import sidecar, yearly as _yearly
+from climate.dayindex import split_days
+from climate.loader import DATE_COL, STATION_COL, TEXT_COLS, list_exports, read_arrays
+from climate.rank import DESCENDING, update_order
+
+# 기상청이 값을 고칠 수 있는 최근 기간 – 이 기간은 매번 다시 읽어 비교
+RECENT_DAYS = 62
+# 정리 후 남길 내려받기 파일 사이드카 수 (이번 파일 포함 – 직전 것은 다음 비교 기준 예비)
+KEEP_SIDECARS = 2
+
+_RANK_RE = re.compile(r"^(?:st(\d+)_)?rank_order_(\d+)$")
+_NORMALS_RE = re.compile(r"^(?:st(\d+)_)?normals_(\d+)_(\d+)_")
+_YEARLY_RE = re.compile(r"^(?:st(\d+)_)?yearly$")
+
+
+class IngestResult(NamedTuple):
+    path: str
+    base: str | None       # 기준으로 삼은 이전 사이드카 버전 폴더 (없으면 None)
+    mode: str              # "tail" 뒷부분만 파싱 / "full" 전체 파싱 후 비교 / "new"
+    added: int             # 새 행
+    corrected: int         # 값이 바뀐 행
+    removed: int           # 없어진 행
+    rows: int
+    saved: bool            # 사이드카 기록 여부
+    arrays: dict
+    pruned: tuple = ()     # 지운 이전 사이드카 폴더
+
+
+# ────────────── 1. 본문 위치·변하지 않는 앞부분 ──────────────
+def _header_span(data: bytes) -> tuple[int, int] | None:
+    """머리글('날짜,...') 행의 [시작, 끝) 바이트 위치"""
+    head = data[:8192]
+    for enc in ("cp949", "utf-8"):
+        token = DATE_COL.encode(enc)
+        if head.startswith(token) or head.startswith(b"\xef\xbb\xbf" + token):
+            start = 0
+        else:
+            i = head.find(b"\n" + token)
+            if i < 0:
+                continue
+            start = i + 1
+        end = data.find(b"\n", start)
+        return (start, len(data) if end < 0 else end + 1)
+    return None
+
+
+_WHITESPACE = (9, 10, 13, 32)
+_BLOCK = 1 << 20
+
+
+def _line_ends(data, start: int):
+    """start부터 공백 아닌 행들의 끝(다음 행 시작) 바이트 위치를 블록 단위로 내보냄
+
+    KMA 파일 끝의 탭·빈 줄처럼 pandas가 건너뛰는 행은 뺀다.
+    """
+    pos, size, pending = start, len(data), False
+    while pos < size:
+        buf = np.frombuffer(data[pos:pos + _BLOCK], np.uint8)
+        nl = np.flatnonzero(buf == 10)
+        filled = np.r_[0, np.cumsum(~np.isin(buf, _WHITESPACE), dtype=np.int32)]
+        starts = np.r_[0, nl[:-1] + 1]
+        has = filled[nl + 1] > filled[starts]
+        if len(nl):
+            has[0] |= pending
+            yield pos + nl[has] + 1
+            rest = nl[-1] + 1
+            pending = bool(filled[-1] > filled[rest])
+        else:
+            pending = pending or bool(filled[-1] > 0)
+        pos += len(buf)
+    if pending:
+        yield np.array([size])
+
+
+def _stable_bytes(data, start: int, days: np.ndarray, cutoff: int) -> int | None:
+    """start 이후 본문에서 cutoff 이전 날짜만 있는 앞쪽 행들의 바이트 수
+
+    그 뒤 행이 모두 cutoff 이후여야 한다 (날짜 순으로 기록된 파일).
+    지점별로 이어 쓴 여러 지점 파일처럼 조건이 안 맞으면 None.
+    """
+    below = days < cutoff
+    p = len(days) if below.all() else int(np.argmin(below))
+    if below[p:].any():
+        return None
+    seen, end = 0, 0 if p == 0 else None
+    for ends in _line_ends(data, start):
+        if end is None and seen + len(ends) >= p:
+            end = int(ends[p - seen - 1]) - start
+        seen += len(ends)
+    if seen != len(days):               # 행 수가 파싱 결과와 다르면 포기
+        return None
+    return end
+
+
+def _sha1(data, start: int, end: int) -> str:
+    h = hashlib.sha1()
+    for pos in range(start, end, _BLOCK):
+        h.update(data[pos:min(pos + _BLOCK, end)])
+    return h.hexdigest()
+
+
+# ────────────── 2. 행 비교 ──────────────
+def _sums(arrays: dict, idx: np.ndarray) -> np.ndarray:
+    return _yearly.sums(arrays["day"][idx], arrays["station"][idx], arrays["values"][:, idx])
+
+
+def _match(old: dict, o_idx: np.ndarray, new: dict, n_idx: np.ndarray):
+    """두 행 집합에서 키가 같은 쌍 (옛 위치, 새 위치, 값이 같은지)"""
+    ok = sidecar.row_keys(old["day"][o_idx], old["station"][o_idx])
+    nk = sidecar.row_keys(new["day"][n_idx], new["station"][n_idx])
+    _, io, in_ = np.intersect1d(ok, nk, assume_unique=True, return_indices=True)
+    a = np.asarray(old["values"][:, o_idx[io]])
+    b = np.asarray(new["values"][:, n_idx[in_]])
+    same = ((a == b) | (np.isnan(a) & np.isnan(b))).all(axis=0)
+    return o_idx[io], n_idx[in_], same
+
+
+class _Diff(NamedTuple):
+    remap: np.ndarray      # 옛 행 → 새 행 위치 (빠지거나 바뀐 행은 -1)
+    added: np.ndarray      # 새로 생겼거나 바뀐 행의 새 위치
+    removed: np.ndarray    # 없어졌거나 바뀐 행의 옛 위치
+    counts: tuple[int, int, int]
+
+
+def _diff(old: dict, new: dict, o_idx: np.ndarray, n_idx: np.ndarray,
+          remap: np.ndarray) -> _Diff:
+    """o_idx·n_idx 범위만 비교해 remap을 채우고 바뀐 행 정리"""
+    o_pair, n_pair, same = _match(old, o_idx, new, n_idx)
+    remap[o_pair[same]] = n_pair[same]
+    removed = np.flatnonzero(remap < 0)
+    hit = np.zeros(len(new["day"]), bool)
+    hit[remap[remap >= 0]] = True
+    added = np.flatnonzero(~hit)
+    corrected = int(np.count_nonzero(~same))
+    return _Diff(remap, added, removed,
+                 (len(n_idx) - len(n_pair), corrected, len(o_idx) - len(o_pair)))
+
+
+# ────────────── 3. 파생 표 갱신 ──────────────
+def _bounds(station: np.ndarray) -> dict[int, tuple[int, int]]:
+    st_ = np.asarray(station)
+    if len(st_) == 0:
+        return {}
+    cuts = np.flatnonzero(np.diff(st_)) + 1
+    return {int(st_[a]): (int(a), int(b))
+            for a, b in zip(np.r_[0, cuts], np.r_[cuts, len(st_)])}
+
+
+def _carry_extras(folder: str, old: dict, new: dict, diff: _Diff) -> dict:
+    """이전 사이드카의 파생 배열 중 바뀐 행만 반영해 새 사이드카로 넘길 것들"""
+    ob, nb = _bounds(old["station"]), _bounds(new["station"])
+    if list(ob) != list(nb):
+        return {}
+    single = len(nb) == 1
+    changed = np.concatenate([old["day"][diff.removed], new["day"][diff.added]])
+    changed_st = np.concatenate([old["station"][diff.removed], new["station"][diff.added]])
+    changed_year, _ = split_days(changed)
+
+    out = {}
+    for name in sidecar.list_extra(folder):
+        arr = sidecar.load_extra(folder, name)
+        if arr is None:
+            continue
+        m = _YEARLY_RE.match(name)
+        if m is not None:
+            table = _yearly.combine(np.asarray(arr), _sums(new, diff.added),
+                                    _sums(old, diff.removed))
+            # 지점별 표는 그 지점 행만 (바뀐 행 집계에는 모든 지점이 섞여 있음)
+            if m.group(1) is not None:
+                table = table[table[:, 0] == int(m.group(1))]
+            out[name] = table
+            continue
+
+        m = _RANK_RE.match(name) or _NORMALS_RE.match(name)
+        if m is None or (m.group(1) is None) != single:
+            continue
+        sid = next(iter(nb)) if single else int(m.group(1))
+        if sid not in nb:
+            continue
+        (a0, b0), (a1, b1) = ob[sid], nb[sid]
+
+        if m.re is _NORMALS_RE:
+            lo, hi = int(m.group(2)), int(m.group(3))
+            hit = (changed_st == sid) & (changed_year >= lo) & (changed_year <= hi)
+            if not hit.any() and (int(arr[-1, 0]), int(arr[-1, 1])) == (lo, hi):
+                out[name] = np.asarray(arr)
+            continue
+
+        i = int(m.group(2))
+        if i >= len(new["names"]):
+            continue
+        remap = diff.remap[a0:b0]
+        remap = np.where(remap >= 0, remap - a1, -1)
+        added = diff.added[(diff.added >= a1) & (diff.added < b1)] - a1
+        day = np.asarray(new["day"][a1:b1])
+        _, key = split_days(day)
+        sign = -1.0 if DESCENDING.get(new["names"][i], True) else 1.0
+        score = sign * np.asarray(new["values"][i, a1:b1], np.float64)
+        order = update_order(np.asarray(arr, np.int64), remap, added, score, key, day)
+        out[name] = order.astype(np.int32)
+    return out
+
+
+# ────────────── 4. 반영 ──────────────
+def _find_base(path: str) -> tuple[str, dict, dict] | None:
+    """비교 기준 사이드카: 같은 파일의 낡은 사이드카, 없으면 이전 내려받기 파일 것"""
+    path = os.path.abspath(path)
+    exports = [os.path.abspath(p) for p in list_exports(os.path.dirname(path))]
+    older = exports[:exports.index(path)] if path in exports else []
+    for csv in [path] + older[::-1]:
+        store = sidecar.load_store(sidecar.sidecar_dir(csv))
+        if store is not None:
+            return store.path, store.arrays, store.meta
+    return None
+
+
+def _merge_tail(old: dict, tail: dict, cutoff: int) -> tuple[dict, np.ndarray]:
+    """cutoff 이전 옛 행 + 새 뒷부분 행 → 새 배열과 옛 앞부분 행의 새 위치"""
+    keep = np.flatnonzero(np.asarray(old["day"]) < cutoff)
+    k_keep = sidecar.row_keys(old["day"][keep], old["station"][keep])
+    k_tail = sidecar.row_keys(tail["day"], tail["station"])
+    pos = np.searchsorted(k_keep, k_tail)
+    new = {"day": np.insert(np.asarray(old["day"][keep]), pos, tail["day"]),
+           "station": np.insert(np.asarray(old["station"][keep]), pos, tail["station"]),
+           "values": np.insert(np.asarray(old["values"][:, keep]), pos, tail["values"], axis=1),
+           "names": list(old["names"])}
+    remap = np.full(len(old["day"]), -1, np.int64)
+    remap[keep] = np.arange(len(keep)) + np.searchsorted(k_tail, k_keep)
+    return new, remap
+
+
+def prune_exports(path: str, keep: int = KEEP_SIDECARS) -> list[str]:
+    """path보다 오래된 내려받기 파일의 사이드카 폴더를 지우고 최근 keep개(path 포함)만 남김
+
+    이미 mmap으로 연 프로세스는 폴더가 지워져도 계속 읽을 수 있다 (POSIX).
+    """
+    path = os.path.abspath(path)
+    exports = [os.path.abspath(p) for p in list_exports(os.path.dirname(path))]
+    if path not in exports:
+        return []
+    older = exports[:exports.index(path)]
+    removed = []
+    for csv in older[:max(len(older) - (keep - 1), 0)]:
+        folder = sidecar.sidecar_dir(csv)
+        if os.path.isdir(folder):
+            shutil.rmtree(folder, ignore_errors=True)
+            removed.append(folder)
+    return removed
+
+
+def ingest(path: str, skiprows: int | None = None, progress=None) -> IngestResult:
+    """CSV를 이전 사이드카와 비교해 바뀐 부분만 반영하고 새 사이드카 기록
+
+    파일은 mmap으로 열어 해시·행 위치만 훑고, 파싱은 뒷부분 또는
+    블록 단위 스트리밍(loader.read_arrays)으로 한다.
+    """
+    if os.path.getsize(path) == 0:
+        raise ValueError("빈 파일입니다.")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return _ingest(path, data, skiprows, progress)
+
+
+def _ingest(path: str, data, skiprows: int | None, progress) -> IngestResult:
+    sha1 = hashlib.sha1(data).hexdigest()
+    span = _header_span(data) if skiprows is None else None
+    base = _find_base(path)
+
+    new = mode = stable = None
+    if base is not None and span is not None and (base[2].get("stable") or {}).get("sha1"):
+        folder, old, meta = base
+        prev = meta["stable"]
+        body, cut = span[1], prev["bytes"]
+        if (body + cut <= len(data) and _sha1(data, body, body + cut) == prev["sha1"]
+                and list(old["names"]) == _column_names(data, span)):
+            tail = read_arrays(data[span[0]:span[1]] + data[body + cut:], 0, progress)
+            tail_days = tail["day"]
+            tail = sidecar.sort_arrays(tail)
+            if not (tail["day"] < prev["cutoff"]).any():
+                new, remap = _merge_tail(old, tail, prev["cutoff"])
+                o_idx = np.flatnonzero(remap < 0)
+                fresh = np.ones(len(new["day"]), bool)
+                fresh[remap[remap >= 0]] = False
+                n_idx = np.flatnonzero(fresh)
+                diff = _diff(old, new, o_idx, n_idx, remap)
+                mode = "tail"
+                cutoff = int(new["day"].max()) - RECENT_DAYS if len(new["day"]) else 0
+                if cutoff >= prev["cutoff"]:
+                    extra = _stable_bytes(data, body + cut, tail_days, cutoff)
+                    if extra is not None:
+                        stable = {"bytes": cut + extra, "cutoff": cutoff,
+                                  "sha1": _sha1(data, body, body + cut + extra)}
+                else:
+                    stable = prev
+
+    if new is None:
+        new = read_arrays(path, skiprows, progress)
+        if span is not None and len(new["day"]):
+            cutoff = int(new["day"].max()) - RECENT_DAYS
+            n = _stable_bytes(data, span[1], new["day"], cutoff)
+            if n is not None:
+                stable = {"bytes": n, "cutoff": cutoff,
+                          "sha1": _sha1(data, span[1], span[1] + n)}
+        new = sidecar.sort_arrays(new)
+        if base is not None and list(base[1]["names"]) == list(new["names"]):
+            folder, old, _ = base
+            remap = np.full(len(old["day"]), -1, np.int64)
+            diff = _diff(old, new, np.arange(len(old["day"])),
+                         np.arange(len(new["day"])), remap)
+            mode = "full"
+        else:
+            diff = _Diff(np.empty(0, np.int64), np.arange(len(new["day"])),
+                         np.empty(0, np.int64), (len(new["day"]), 0, 0))
+            mode = "new"
+
+    extras = _carry_extras(base[0], base[1], new, diff) if mode != "new" else {}
+    saved = sidecar.save(path, new, stable, extras, sha1) is not None
+    # CURRENT 교체까지 끝난 뒤에만 이전 파일 사이드카 정리
+    pruned = tuple(prune_exports(path)) if saved else ()
+    return IngestResult(os.fspath(path), base[0] if base else None, mode,
+                        *diff.counts, len(new["day"]), saved, new, pruned)
+
+
+def _column_names(data: bytes, span: tuple[int, int]) -> list[str] | None:
+    """머리글 행의 기온 열 이름들"""
+    line = data[span[0]:span[1]]
+    for enc in ("cp949", "utf-8-sig"):
+        try:
+            cols = [c.strip() for c in line.decode(enc).strip().split(",")]
+        except UnicodeDecodeError:
+            continue
+        return [c for c in cols if c not in (DATE_COL, STATION_COL) + TEXT_COLS]
+    return None
@@ -0,0 +1,573 @@
+# ────────────────────────────────────────────────────────────────
+#  기온 CSV 로더 + 프로세스 공용 캐시
+#  ▸ 같은 파일(경로·크기·수정시각 / 업로드 내용 해시)은 프로세스당 한 번만 파싱
+#  ▸ 모든 세션이 읽기 전용 DataFrame 하나를 공유
+#  ▸ 메모리 상한(SEOULTEMP_CACHE_MB)을 넘으면 오래된 항목부터 제거
+#  ▸ 경로로 연 파일은 바이너리 사이드카(climate.sidecar)로 재시작도 빠르게
+#  ▸ 새 내려받기 파일은 이전 사이드카에 바뀐 부분만 반영 (climate.ingest)
+#  ▸ 날짜 색인·순위 정렬 순서·누적합 등 파생 배열도 사이드카에 두고 mmap으로 열어
+#    같은 호스트의 여러 서버 프로세스가 메모리를 나눠 쓴다 (Dataset.shared)
+#  ▸ 폭염·한파 등 기본 규칙의 사건 표도 한 번 찾아 사이드카에 (Dataset.events)
+#  ▸ ±k일 창 백분위 표본도 기준 기간별로 한 번 정렬해 사이드카에 (Dataset.percentiles)
+#  ▸ 날짜별 자료 존재 비트맵·연/월 완전성도 한 번 만들어 사이드카에 (Dataset.quality)
+# ────────────────────────────────────────────────────────────────
+import codecs
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from climate import events as _events, normals as _normals, percentile as _percentile, \
+    quality as _quality, sidecar, trend as _trend, window as _window, yearly as _yearly
+from climate.dayindex import DayIndex, split_days
+from climate.rank import RankEngine
+from climate.trend import TrendEngine
+from climate.window import WindowEngine
+
+DATE_COL = sidecar.DATE_COL
+STATION_COL = sidecar.STATION_COL
+TEMP_COLS = ("최고기온(℃)", "평균기온(℃)", "최저기온(℃)")
+
+_DEFAULT_CACHE_MB = 512
+# 사이드카에 저장하지 않는 사용자 지정 설정(평년 기준 기간 등)은 최근 몇 개만 메모리에
+RECENT_LIMIT = 8
+
+# 기상청 내려받기 파일 이름: ta_YYYYMMDDhhmmss.csv (내려받은 시각)
+EXPORT_RE = re.compile(r"^ta_(\d{14})\.csv$")
+
+
+# ────────────── 1. 파싱 ──────────────
+CHUNK_ROWS = 100_000          # 한 번에 읽는 행 수
+_SNIFF_BYTES = 1 << 16        # 인코딩·머리글 판별에 쓰는 앞부분 크기
+TEXT_COLS = ("지점명",)       # 숫자가 아닌 열 – 읽지 않음
+_NA_VALUES = ["", "-", "null", "NULL"]
+
+
+def sniff_encoding(head: bytes) -> str:
+    """앞부분 블록으로 인코딩 판별: BOM → UTF-8-SIG, UTF-8로 풀리면 UTF-8, 아니면 CP949"""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    cut = head.rfind(b"\n") + 1 or len(head)      # 블록 끝에서 잘린 글자 제외
+    for enc in ("utf-8", "cp949"):
+        try:
+            head[:cut].decode(enc)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("지원되지 않는 인코딩입니다.")
+
+
+def _header_row(head: bytes, enc: str, max_lines: int = 30) -> int:
+    """앞부분에서 '날짜'로 시작하는 머리글 행 번호를 찾고, 없으면 7 반환"""
+    lines = head.decode(enc, errors="ignore").splitlines()
+    for i, line in enumerate(lines[:max_lines]):
+        if line.lstrip("\ufeff").startswith(DATE_COL):
+            return i
+    return 7
+
+
+def _open_binary(src):
+    """경로·bytes·업로드 파일 → (바이너리 파일 객체, 전체 크기, 닫아야 하는지)"""
+    if isinstance(src, (str, os.PathLike)):
+        return open(src, "rb"), os.path.getsize(src), True
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return io.BytesIO(src), len(src), True
+    size = src.seek(0, io.SEEK_END)
+    src.seek(0)
+    return src, size, False
+
+
+def read_arrays(src, skiprows: int | None = None, progress=None,
+                chunk_rows: int = CHUNK_ROWS) -> dict:
+    """CSV를 chunk_rows행씩 읽어 압축 배열(day·station·values)로 변환 (파일 행 순서 그대로)
+
+    - 인코딩은 앞부분 블록 하나로 판별하고 다시 읽지 않는다
+    - 날짜 int32, 지점 int16, 기온 float32로 바로 읽어 최종 배열에 채움
+      → 최대 메모리는 최종 배열 크기 + 한 블록
+    - skiprows가 None이면 '날짜'로 시작하는 머리글 행을 찾아 그 앞을 건너뜀
+      (KMA 내려받기 파일은 7행 설명 포함, 가공된 CSV는 0행)
+    - progress(읽은 바이트, 전체 바이트)를 블록마다 호출
+    """
+    fh, total, owned = _open_binary(src)
+    try:
+        head = fh.read(_SNIFF_BYTES)
+        fh.seek(0)
+        enc = sniff_encoding(head)
+        skip = skiprows if skiprows is not None else _header_row(head, enc)
+        lines = head.decode(enc, errors="ignore").splitlines()
+        if skip >= len(lines):
+            raise ValueError(f"'{DATE_COL}' 열이 없습니다.")
+        cols = [c.strip().strip('"') for c in lines[skip].lstrip("\ufeff").split(",")]
+        if DATE_COL not in cols:
+            raise ValueError(f"'{DATE_COL}' 열이 없습니다.")
+        names = [c for c in cols if c and c not in (DATE_COL, STATION_COL) + TEXT_COLS]
+        dtype = {DATE_COL: str, STATION_COL: np.int32, **{c: np.float32 for c in names}}
+        dtype = {c: t for c, t in dtype.items() if c in cols}
+
+        # 앞부분의 행 길이로 전체 행 수를 어림해 한 번에 할당
+        body = "\n".join(lines[skip + 1:]).encode(enc)
+        per_line = max(len(body) / max(len(lines) - skip - 1, 1), 8)
+        cap = int(total / per_line * 1.05) + 1024
+        day = np.empty(cap, np.int32)
+        station = np.zeros(cap, np.int16)
+        values = np.empty((len(names), cap), np.float32)
+
+        reader = pd.read_csv(fh, encoding=enc, skiprows=skip,
+                             usecols=list(dtype), dtype=dtype,
+                             na_values=_NA_VALUES, keep_default_na=True,
+                             chunksize=chunk_rows)
+        n = 0
+        for chunk in _chunks(reader, skip):
+            dates = chunk[DATE_COL].str.strip()
+            chunk = chunk[dates.notna() & (dates != "")]
+            m = len(chunk)
+            if n + m > cap:
+                cap = max(int(cap * 1.5), n + m)
+                day, station = np.resize(day, cap), np.resize(station, cap)
+                grown = np.empty((len(names), cap), np.float32)
+                grown[:, :n] = values[:, :n]
+                values = grown
+
+            parsed = pd.to_datetime(dates[chunk.index], format="%Y-%m-%d", errors="coerce")
+            if parsed.isna().any():
+                bad = int(np.argmax(parsed.isna().to_numpy()))
+                raise ValueError(f"{skip + 2 + n + bad}행 날짜 형식 오류: "
+                                 f"{dates[chunk.index].iat[bad]!r}")
+            day[n:n + m] = parsed.to_numpy().astype("datetime64[D]").astype(np.int64)
+            if STATION_COL in chunk.columns:
+                sid = chunk[STATION_COL].to_numpy()
+                if m and (sid.min() < 0 or sid.max() > np.iinfo(np.int16).max):
+                    raise ValueError(f"{skip + 2 + n}행 이후 지점 번호가 범위를 벗어났습니다.")
+                station[n:n + m] = sid
+            for i, col in enumerate(names):
+                values[i, n:n + m] = chunk[col].to_numpy()
+            n += m
+            if progress is not None:
+                progress(min(fh.tell(), total), total)
+    finally:
+        if owned:
+            fh.close()
+
+    # 어림한 여분은 잘라낸 보기만 남긴다 (복사 없음)
+    return {"day": day[:n], "station": station[:n], "values": values[:, :n],
+            "names": names}
+
+
+def _chunks(reader, skip: int):
+    """read_csv 블록 반복 – 숫자가 아닌 값 등 오류에 행 위치를 붙인다"""
+    n = 0
+    while True:
+        try:
+            chunk = next(reader)
+        except StopIteration:
+            return
+        except ValueError as e:
+            raise ValueError(f"{skip + 2 + n}행 이후 읽기 오류: {e}") from e
+        n += len(chunk)
+        yield chunk
+
+
+def parse_temperature_csv(src, skiprows: int | None = None, progress=None) -> pd.DataFrame:
+    """CSV를 읽어 날짜·지점·기온 DataFrame 반환 (파일 행 순서, 기온은 float32)"""
+    return sidecar.to_frame(read_arrays(src, skiprows, progress))
+
+
+def list_exports(folder: str = ".") -> list[str]:
+    """폴더의 ta*.csv를 오래된 것부터 정렬
+
+    ta_YYYYMMDDhhmmss.csv는 이름의 시각 순, 그 밖의 ta*.csv는 그보다 앞에
+    수정시각 순으로 둔다.
+    """
+    found = []
+    for f in os.listdir(folder):
+        if not (f.startswith("ta") and f.endswith(".csv")):
+            continue
+        path = os.path.join(folder, f) if folder != "." else f
+        m = EXPORT_RE.match(f)
+        found.append((1, m.group(1), f) if m else (0, os.stat(path).st_mtime_ns, f))
+    return [os.path.join(folder, f) if folder != "." else f
+            for *_, f in sorted(found)]
+
+
+def find_default_csv(folder: str = ".") -> str | None:
+    """폴더에서 가장 최근 내려받은 데이터 파일(ta*.csv) 경로"""
+    exports = list_exports(folder)
+    return exports[-1] if exports else None
+
+
+# ────────────── 2. 공유 데이터셋 ──────────────
+class Dataset:
+    """프로세스 전체에서 공유되는 읽기 전용 기온 데이터
+
+    day(int32 일수)·station(int16)·values(float32, 열×행) 배열을 보관하고,
+    frame은 그 배열을 복사 없이 감싼 DataFrame이다.
+    행은 (지점, 날짜) 순이며, 여러 지점이 섞인 파일은 for_station()으로
+    지점별 Dataset(같은 배열의 연속 구간)을 얻어 분석한다.
+    """
+
+    def __init__(self, arrays: dict, key: tuple, source: str | None = None,
+                 cache_dir: str | None = None, frame: pd.DataFrame | None = None,
+                 station_id: int | None = None):
+        self.day = arrays["day"]
+        self.station = arrays["station"]
+        self.values = arrays["values"]
+        self.names = list(arrays["names"])
+        self.frame = sidecar.to_frame(arrays) if frame is None else frame
+        self.key = key
+        self.source = source
+        self.cache_dir = cache_dir
+        self.station_id = station_id
+        self._normals: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._events: "OrderedDict[_events.Rule, _events.EventTable]" = OrderedDict()
+        self._percentiles: "OrderedDict[tuple, _percentile.PercentileEngine]" = OrderedDict()
+        self._children: dict[int, Dataset] = {}
+        self._yearly: pd.DataFrame | None = None
+        self._lock = threading.Lock()
+        self.nbytes = int(self.frame.memory_usage(deep=True).sum())
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @cached_property
+    def station_bounds(self) -> dict[int, tuple[int, int]]:
+        """지점 번호 → [시작, 끝) 행 구간"""
+        st_ = np.asarray(self.station)
+        cuts = np.flatnonzero(np.diff(st_)) + 1
+        starts = np.r_[0, cuts] if len(st_) else np.empty(0, np.int64)
+        ends = np.r_[cuts, len(st_)] if len(st_) else np.empty(0, np.int64)
+        return {int(st_[a]): (int(a), int(b)) for a, b in zip(starts, ends)}
+
+    @property
+    def station_ids(self) -> list[int]:
+        return list(self.station_bounds)
+
+    def for_station(self, sid: int | None = None) -> "Dataset":
+        """지점 하나만의 Dataset (배열·DataFrame은 복사 없이 구간만 참조)
+
+        sid가 None이면 첫 지점. 지점이 하나뿐이면 자기 자신을 돌려준다.
+        """
+        bounds = self.station_bounds
+        if sid is None:
+            sid = next(iter(bounds), None)
+        if len(bounds) <= 1 and (sid is None or sid in bounds):
+            return self
+        if sid not in bounds:
+            raise KeyError(f"지점 {sid} 자료가 없습니다.")
+
+        with self._lock:
+            child = self._children.get(sid)
+            if child is None:
+                a, b = bounds[sid]
+                arrays = {"day": self.day[a:b], "station": self.station[a:b],
+                          "values": self.values[:, a:b], "names": self.names}
+                frame = self.frame.iloc[a:b].reset_index(drop=True)
+                child = Dataset(arrays, self.key + (sid,), self.source,
+                                self.cache_dir, frame, sid)
+                self._children[sid] = child
+        return child
+
+    def _extra_name(self, name: str) -> str:
+        return name if self.station_id is None else f"st{self.station_id}_{name}"
+
+    def load_extra(self, name: str) -> np.ndarray | None:
+        """사이드카의 파생 배열 (지점별 Dataset은 지점 번호가 붙은 이름)"""
+        if not self.cache_dir:
+            return None
+        return sidecar.load_extra(self.cache_dir, self._extra_name(name))
+
+    def save_extra(self, name: str, arr: np.ndarray) -> bool:
+        if not self.cache_dir:
+            return False
+        return sidecar.save_extra(self.cache_dir, self._extra_name(name), arr)
+
+    def shared(self, name: str, build) -> np.ndarray:
+        """사이드카의 파생 배열을 읽기 전용 mmap으로 (같은 호스트 프로세스끼리 공유)
+
+        없으면 build()로 만들어 저장한 뒤 다시 mmap으로 연다.
+        사이드카가 없는 업로드 자료는 build() 결과를 그대로 쓴다.
+        """
+        arr = self.load_extra(name)
+        if arr is None:
+            arr = build()
+            if self.save_extra(name, arr):
+                mapped = self.load_extra(name)
+                arr = arr if mapped is None else mapped
+        return arr
+
+    @cached_property
+    def days(self) -> DayIndex:
+        """MM-DD 키·연도 배열과 같은 날짜 묶음 인덱스 (처음 사용할 때 한 번 생성)"""
+        year = self.shared("day_year", lambda: split_days(self.day)[0])
+        key = self.shared("day_key", lambda: split_days(self.day)[1])
+        order = self.shared("day_order",
+                            lambda: np.lexsort((self.day, key)).astype(np.int32))
+        return DayIndex(self.day, year, key, order)
+
+    @cached_property
+    def quality(self) -> _quality.QualityIndex:
+        """날짜별 자료 존재 비트맵·연/월 완전성·공백 구간 (지점 하나 기준)"""
+        built = {}
+
+        def part(name):
+            if not built:
+                built["bits"], built["counts"] = _quality.build(self.day, self.values)
+            return built[name]
+
+        bits = self.shared("quality_bits", lambda: part("bits"))
+        counts = self.shared("quality_counts", lambda: part("counts"))
+        first_year = int(self.days.year.min()) if len(self) else 1970
+        return _quality.QualityIndex(self.names, first_year, bits, counts)
+
+    @cached_property
+    def ranks(self) -> RankEngine:
+        """같은 MM-DD 순위 엔진 (열별 정렬 배열은 처음 조회할 때 생성)"""
+        return RankEngine(self)
+
+    def _temp_values(self) -> tuple[list[str], np.ndarray]:
+        """최고·평균·최저기온 열 이름과 (열, 행) 값 – 엔진을 새로 만들 때만 복사"""
+        cols = [c for c in TEMP_COLS if c in self.frame.columns]
+        return cols, self.values[[self.names.index(c) for c in cols]]
+
+    @cached_property
+    def windows(self) -> WindowEngine:
+        """최고·평균·최저기온 누적합 기반 최근 N일 평균 엔진"""
+        cols = [c for c in TEMP_COLS if c in self.frame.columns]
+        built = {}
+
+        def part(name):
+            if not built:
+                built.update(_window.prefix_sums(self.day, self._temp_values()[1]))
+            return built[name]
+
+        sums = {name: self.shared(f"window_{name}", lambda name=name: part(name))
+                for name in ("dense", "csum", "ccnt")}
+        return WindowEngine(self.day, None, cols, sums)
+
+    @cached_property
+    def trends(self) -> TrendEngine:
+        """같은 MM-DD 366일 × 기온 열 추세 엔진 (연도 범위별 표는 최근 RECENT_LIMIT개)"""
+        cols = [c for c in TEMP_COLS if c in self.frame.columns]
+        csum = self.shared("trend_csum", lambda: _trend.prefix_sums(
+            self._temp_values()[1], self.days.key, self.days.year))
+        return TrendEngine(None, self.days.key, self.days.year, cols, csum, RECENT_LIMIT)
+
+    def _recent_get(self, cache: OrderedDict, key):
+        """최근 사용 캐시 조회 (찾으면 가장 최근으로)"""
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+        return value
+
+    def _recent_put(self, cache: OrderedDict, key, value):
+        """최근 사용 캐시에 넣고 RECENT_LIMIT개를 넘으면 오래된 것부터 버림"""
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > RECENT_LIMIT:
+                cache.popitem(last=False)
+        return value
+
+    def normals(self, baseline: tuple[int, int] = _normals.WMO_BASELINE,
+                method: str = "window", smooth: int = 0) -> pd.DataFrame:
+        """MM-DD 키별 평년값 표 (366행)
+
+        WMO 기준 기간(1991-2020)만 사이드카에 저장·재사용하고, 다른 기준 기간은
+        계산해 최근 RECENT_LIMIT개만 메모리에 둔다 (사용자 조합마다 파일이 쌓이지 않게).
+        """
+        ck = (tuple(baseline), method, smooth)
+        table = self._recent_get(self._normals, ck)
+        if table is not None:
+            return table
+
+        cols = [c for c in TEMP_COLS if c in self.frame.columns]
+        persist = tuple(baseline) == _normals.WMO_BASELINE
+        name = _normals.cache_name(baseline, method, smooth)
+        arr = self.load_extra(name) if persist else None
+        if arr is not None:
+            table = _normals.from_array(arr, cols)
+        else:
+            table = _normals.compute_normals(self.frame[cols].to_numpy().T,
+                                             self.days.key, self.days.year, cols,
+                                             baseline, method, smooth)
+            if persist:
+                self.save_extra(name, _normals.to_array(table, cols))
+        return self._recent_put(self._normals, ck, table)
+
+    def events(self, rule: _events.Rule) -> _events.EventTable:
+        """규칙(폭염·열대야·한파 …)을 만족하는 연속 구간 사건 표
+
+        PRESETS 규칙만 사이드카에 저장·공유하고, 직접 설정한 규칙은 계산해
+        최근 RECENT_LIMIT개만 메모리에 둔다.
+        """
+        table = self._recent_get(self._events, rule)
+        if table is not None:
+            return table
+        col = self.names.index(rule.column)
+
+        def build():
+            return _events.detect(self.day, self.station, self.values[col], rule,
+                                  self.days.key)
+
+        arr = (self.shared(_events.cache_name(rule, col), build)
+               if _events.is_preset(rule) else build())
+        return self._recent_put(self._events, rule, _events.EventTable(rule, arr))
+
+    def percentiles(self, baseline: tuple[int, int] = _percentile.ETCCDI_BASELINE,
+                    window: int = _percentile.WINDOW) -> _percentile.PercentileEngine:
+        """±window일 창 MM-DD별 백분위 엔진 (기준 기간에 자료가 없으면 전체 연도)
+
+        ETCCDI 기준 기간(1961-1990)·기본 창의 표본만 사이드카에 저장·공유하고, 다른
+        조합은 계산해 최근 RECENT_LIMIT개만 메모리에 둔다.
+        """
+        ck = (tuple(baseline), window)
+        engine = self._recent_get(self._percentiles, ck)
+        if engine is not None:
+            return engine
+
+        mask, used = _percentile.baseline_mask(self.days.year, baseline)
+        persist = (tuple(baseline), window) == (_percentile.ETCCDI_BASELINE, _percentile.WINDOW)
+        cols = [c for c in TEMP_COLS if c in self.frame.columns]
+        columns = {c: self.values[self.names.index(c)] for c in cols}
+        samples = {}
+        for c in cols:
+            def build(c=c):
+                return _percentile.window_samples(columns[c], self.days.key, window, mask)
+            name = _percentile.cache_name(used, window, self.names.index(c))
+            samples[c] = self.shared(name, build) if persist else build()
+        engine = _percentile.PercentileEngine(self.day, self.station, columns,
+                                              self.days.key, self.days.year,
+                                              samples, used, window)
+        return self._recent_put(self._percentiles, ck, engine)
+
+    def yearly(self) -> pd.DataFrame:
+        """연도별 평균과 열별 자료 일수 (지점 하나 기준, 처음 호출 때 한 번 만들어 보관)
+
+        집계 표는 지점별 이름으로 사이드카에 저장해 새 파일은 바뀐 행만 반영한다.
+        여러 지점이 섞인 Dataset은 연도가 겹치므로 for_station()으로 나눠 쓴다.
+        """
+        if self._yearly is not None:
+            return self._yearly
+        if self.station_id is None and len(self.station_bounds) > 1:
+            raise ValueError("여러 지점 자료입니다. for_station()으로 지점을 고른 뒤 호출하세요.")
+        table = self.shared("yearly", lambda: _yearly.sums(self.day, self.station, self.values))
+        self._yearly = _yearly.to_frame(np.asarray(table), self.names, self.station_id)
+        return self._yearly
+
+    def __repr__(self) -> str:
+        return f"Dataset({self.source or 'upload'}, {len(self)} rows)"
+
+
+def _build(src, key: tuple, skiprows: int | None, use_sidecar: bool,
+           progress=None) -> Dataset:
+    """경로면 사이드카를 우선 열고, 없으면 CSV를 파싱해 사이드카까지 기록"""
+    if not isinstance(src, (str, os.PathLike)):
+        return Dataset(sidecar.sort_arrays(read_arrays(src, skiprows, progress)), key)
+
+    path = os.fspath(src)
+    if not use_sidecar:
+        arrays = sidecar.sort_arrays(read_arrays(path, skiprows, progress))
+        return Dataset(arrays, key, path)
+    store = sidecar.load(path)
+    if store is None:
+        # 이전 내려받기 파일의 사이드카가 있으면 바뀐 부분만 반영
+        from climate.ingest import ingest
+        res = ingest(path, skiprows, progress)
+        # 기록했으면 방금 쓴 버전을 mmap으로 다시 열고 파싱한 사본은 버린다
+        store = sidecar.load(path) if res.saved else None
+        if store is None:
+            return Dataset(res.arrays, key, path)
+    return Dataset(store.arrays, key, path, store.path)
+
+
+def _upload_sha1(src) -> str:
+    """업로드 파일(Streamlit UploadedFile 등)·bytes 내용 SHA-1 (통째로 복사하지 않음)"""
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return hashlib.sha1(src).hexdigest()
+    if hasattr(src, "getbuffer"):
+        with src.getbuffer() as buf:
+            return hashlib.sha1(buf).hexdigest()
+    h = hashlib.sha1()
+    src.seek(0)
+    while block := src.read(1 << 20):
+        h.update(block)
+    src.seek(0)
+    return h.hexdigest()
+
+
+def source_key(src) -> tuple:
+    """경로는 (절대경로, 크기, 수정시각), 업로드는 내용 SHA-1로 캐시 키 생성"""
+    if isinstance(src, (str, os.PathLike)):
+        st_ = os.stat(src)
+        return ("path", os.path.abspath(src), st_.st_size, st_.st_mtime_ns)
+    return ("upload", _upload_sha1(src))
+
+
+# ────────────── 3. 프로세스 캐시 ──────────────
+_cache: "OrderedDict[tuple, Dataset]" = OrderedDict()
+_cache_lock = threading.Lock()
+_key_locks: dict[tuple, threading.Lock] = {}
+_limit_bytes = int(float(os.environ.get("SEOULTEMP_CACHE_MB", _DEFAULT_CACHE_MB))
+                   * 1024 * 1024)
+
+
+def set_cache_limit(mb: float) -> None:
+    """캐시 메모리 상한(MB) 변경 후 즉시 정리"""
+    global _limit_bytes
+    with _cache_lock:
+        _limit_bytes = int(mb * 1024 * 1024)
+        _evict()
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _key_locks.clear()
+
+
+def cache_info() -> dict:
+    with _cache_lock:
+        return {"entries": len(_cache),
+                "bytes": sum(d.nbytes for d in _cache.values()),
+                "limit_bytes": _limit_bytes}
+
+
+def _evict() -> None:
+    """가장 오래 사용되지 않은 항목부터 제거 (가장 최근 항목 하나는 유지)"""
+    total = sum(d.nbytes for d in _cache.values())
+    while total > _limit_bytes and len(_cache) > 1:
+        key, old = _cache.popitem(last=False)
+        _key_locks.pop(key, None)
+        total -= old.nbytes
+
+
+def load(src, skiprows: int | None = None, use_sidecar: bool = True,
+         progress=None) -> Dataset:
+    """경로·업로드 파일을 캐시에서 찾고, 없으면 한 번만 파싱해 등록
+
+    progress(읽은 바이트, 전체 바이트)는 실제로 파싱할 때만 호출된다.
+    """
+    key = source_key(src)
+    with _cache_lock:
+        ds = _cache.get(key)
+        if ds is not None:
+            _cache.move_to_end(key)
+            return ds
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    # 같은 파일을 여러 세션이 동시에 요청해도 파싱은 한 번만
+    with key_lock:
+        with _cache_lock:
+            ds = _cache.get(key)
+        if ds is None:
+            ds = _build(src, key, skiprows, use_sidecar, progress)
+            with _cache_lock:
+                _cache[key] = ds
+                _evict()
+    return ds
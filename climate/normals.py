@@ -0,0 +1,109 @@
+# ────────────────────────────────────────────────────────────────
+#  평년값(기후 평균) 표
+#  ▸ 기준 기간(기본 WMO 1991-2020)의 MM-DD 키별 최고·평균·최저 평균, 366행
+#  ▸ 선택적 평활
+#     - window  : ±k일 이동 평균 (연말·연초는 이어서 계산)
+#     - harmonic: 연주기 조화 함수 n차 최소제곱 적합
+#  ▸ WMO 기준 기간 표는 데이터셋마다 한 번 계산해 사이드카 폴더에 함께 저장
+#    (다른 기준 기간은 Dataset.normals가 최근 몇 개만 메모리에 둔다)
+# ────────────────────────────────────────────────────────────────
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import N_KEYS, key_label
+
+WMO_BASELINE = (1991, 2020)
+
+
+def _key_sums(values: np.ndarray, key: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """열별 MM-DD 키 합계·개수 (열, 366)"""
+    sums = np.zeros((len(values), N_KEYS))
+    cnts = np.zeros((len(values), N_KEYS))
+    for i, row in enumerate(values):
+        ok = ~np.isnan(row)
+        sums[i] = np.bincount(key[ok], row[ok], minlength=N_KEYS)
+        cnts[i] = np.bincount(key[ok], minlength=N_KEYS)
+    return sums, cnts
+
+
+def _smooth_window(sums: np.ndarray, cnts: np.ndarray, k: int) -> np.ndarray:
+    """±k일 이동 합으로 평균 (표본 수 가중, 12-31 ↔ 01-01 순환)"""
+    if k <= 0:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / cnts
+    kernel = np.ones(2 * k + 1)
+
+    def wrap(a):
+        return np.concatenate([a[:, -k:], a, a[:, :k]], axis=1)
+
+    s = np.stack([np.convolve(r, kernel, "valid") for r in wrap(sums)])
+    c = np.stack([np.convolve(r, kernel, "valid") for r in wrap(cnts)])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return s / c
+
+
+def _smooth_harmonic(sums: np.ndarray, cnts: np.ndarray, n: int) -> np.ndarray:
+    """키별 평균에 상수 + n차 조화 함수를 표본 수 가중 최소제곱으로 적합"""
+    t = 2 * np.pi * np.arange(N_KEYS) / N_KEYS
+    basis = np.column_stack([np.ones(N_KEYS)]
+                            + [f(h * t) for h in range(1, n + 1) for f in (np.cos, np.sin)])
+    out = np.full(sums.shape, np.nan)
+    for i in range(len(sums)):
+        ok = cnts[i] > 0
+        if ok.sum() < basis.shape[1]:
+            continue
+        w = np.sqrt(cnts[i][ok])
+        coef, *_ = np.linalg.lstsq(basis[ok] * w[:, None], sums[i][ok] / cnts[i][ok] * w,
+                                   rcond=None)
+        out[i] = basis @ coef
+    return out
+
+
+def compute_normals(values: np.ndarray, key: np.ndarray, year: np.ndarray,
+                    names: list[str], baseline: tuple[int, int] = WMO_BASELINE,
+                    method: str = "window", smooth: int = 0) -> pd.DataFrame:
+    """평년값 표 (index = MM-DD 키 0~365)
+
+    기준 기간에 자료가 하나도 없으면 전체 연도로 계산하고 attrs["baseline"]에 기록.
+    """
+    in_base = (year >= baseline[0]) & (year <= baseline[1])
+    used = baseline
+    if not in_base.any():
+        in_base = np.ones(len(year), bool)
+        used = (int(year.min()), int(year.max())) if len(year) else baseline
+
+    sums, cnts = _key_sums(values[:, in_base], key[in_base])
+    if method == "harmonic":
+        normal = _smooth_harmonic(sums, cnts, max(smooth, 1))
+    elif method == "window":
+        normal = _smooth_window(sums, cnts, smooth)
+    else:
+        raise ValueError(f"알 수 없는 평활 방법: {method}")
+
+    out = pd.DataFrame(normal.T, columns=names, index=pd.RangeIndex(N_KEYS, name="키"))
+    out.insert(0, "MM-DD", [key_label(k) for k in range(N_KEYS)])
+    out["표본수"] = cnts.min(axis=0).astype(int)
+    out.attrs["baseline"] = used
+    return out
+
+
+def cache_name(baseline: tuple[int, int], method: str, smooth: int) -> str:
+    """사이드카에 저장할 배열 이름"""
+    return f"normals_{baseline[0]}_{baseline[1]}_{method}{smooth}"
+
+
+def to_array(table: pd.DataFrame, names: list[str]) -> np.ndarray:
+    """평년값 표 → 저장용 배열 (열 수 + 2, 366): 값들, 표본수, 실제 기준 기간"""
+    used = table.attrs["baseline"]
+    meta = np.full(N_KEYS, np.nan)
+    meta[:2] = used
+    return np.vstack([table[names].to_numpy().T, table["표본수"].to_numpy(), meta])
+
+
+def from_array(arr: np.ndarray, names: list[str]) -> pd.DataFrame:
+    out = pd.DataFrame(arr[:len(names)].T, columns=names,
+                       index=pd.RangeIndex(N_KEYS, name="키"))
+    out.insert(0, "MM-DD", [key_label(k) for k in range(N_KEYS)])
+    out["표본수"] = arr[len(names)].astype(int)
+    out.attrs["baseline"] = (int(arr[-1, 0]), int(arr[-1, 1]))
+    return out
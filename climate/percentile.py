@@ -0,0 +1,197 @@
+# ────────────────────────────────────────────────────────────────
+#  MM-DD별 백분위 기준값과 ETCCDI 극한 기온 지수
+#  ▸ 기준 기간(기본 1961-1990) 값을 앞뒤 ±k일(기본 5일 창) MM-DD 키마다 복제해
+#    (창 키, 값) 순으로 한 번만 정렬 → 키별 정렬 표본이 연속 구간
+#     - 값 정렬 한 번 + 창 키 기수 정렬 한 번 (lexsort보다 몇 배 빠름)
+#     - 366일 각각 따로 정렬하지 않고, 분위수·순위는 구간 안 인덱싱·이진 탐색
+#     - 12-31 ↔ 01-01은 이어서 창을 잡는다
+#  ▸ 분위수는 Hyndman-Fan 8형 (ETCCDI·climdex와 같은 보간)
+#  ▸ 지수 (연도별, 유효 일수 대비 %)
+#     - TX90p·TX10p : 최고기온 > 90백분위 / < 10백분위
+#     - TN90p·TN10p : 최저기온 > 90백분위 / < 10백분위
+#     - WSDI·CSDI   : TX>90p / TN<10p가 6일 이상 이어진 날 수
+#    기준 기간 안쪽 연도의 부트스트랩 보정은 하지 않는다
+#  ▸ 정렬 표본은 사이드카에 저장해 프로세스끼리 mmap으로 공유 (Dataset.percentiles)
+# ────────────────────────────────────────────────────────────────
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import N_KEYS, key_label
+
+ETCCDI_BASELINE = (1961, 1990)
+WINDOW = 2                     # ±2일 = 5일 창
+SPELL_DAYS = 6                 # WSDI·CSDI 최소 연속 일수
+
+# 지수 이름 → (열, 백분위, 초과 방향: True면 >, False면 <)
+INDICES = {
+    "TX90p": ("최고기온(℃)", 90, True),
+    "TX10p": ("최고기온(℃)", 10, False),
+    "TN90p": ("최저기온(℃)", 90, True),
+    "TN10p": ("최저기온(℃)", 10, False),
+}
+SPELLS = {"WSDI": "TX90p", "CSDI": "TN10p"}
+
+
+def window_samples(values: np.ndarray, key: np.ndarray, window: int = WINDOW,
+                   mask: np.ndarray | None = None) -> np.ndarray:
+    """±window일 창 키별 정렬 표본 → 저장용 배열 [offsets(367), 정렬 값…] float64
+
+    mask가 있으면 그 행(기준 기간)만 쓴다. 결측은 뺀다.
+    """
+    ok = ~np.isnan(values)
+    if mask is not None:
+        ok &= mask
+    v, k = values[ok].astype(np.float64), key[ok].astype(np.int16)
+    # 값으로 한 번 정렬 → 행마다 창 키를 나란히 붙이면 값 순서가 유지되므로
+    # 창 키 안정 정렬(정수라 기수 정렬)만 하면 키 안에서도 값 순
+    by_value = np.argsort(v, kind="stable")
+    v, k = v[by_value], k[by_value]
+    shifts = np.arange(-window, window + 1, dtype=np.int16)
+    wk = ((k[:, None] + shifts[None, :]) % N_KEYS).ravel()
+    order = np.argsort(wk, kind="stable")
+    offsets = np.r_[0, np.cumsum(np.bincount(wk, minlength=N_KEYS))]
+    return np.r_[offsets, np.repeat(v, len(shifts))[order]]
+
+
+def split_samples(arr: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """저장용 배열 → (offsets int64 (367,), 정렬 값)"""
+    return arr[:N_KEYS + 1].astype(np.int64), arr[N_KEYS + 1:]
+
+
+def quantiles(offsets: np.ndarray, sorted_v: np.ndarray, q: float) -> np.ndarray:
+    """키별 q 백분위 (366,) – Hyndman-Fan 8형, 표본이 없으면 NaN"""
+    n = np.diff(offsets)
+    out = np.full(N_KEYS, np.nan)
+    has = n > 0
+    n = n[has]
+    h = np.clip((n + 1 / 3) * (q / 100) + 1 / 3, 1, n)     # 1부터 세는 위치
+    lo = np.floor(h).astype(np.int64)
+    i = offsets[:-1][has] + lo - 1
+    j = np.minimum(i + 1, offsets[1:][has] - 1)
+    out[has] = sorted_v[i] + (h - lo) * (sorted_v[j] - sorted_v[i])
+    return out
+
+
+def thresholds(values: np.ndarray, key: np.ndarray, q: float, window: int = WINDOW,
+               mask: np.ndarray | None = None) -> np.ndarray:
+    """한 열의 키별 q 백분위 기준값 (366,) – 엔진 없이 한 번 쓸 때"""
+    return quantiles(*split_samples(window_samples(values, key, window, mask)), q)
+
+
+def window_rank(values: np.ndarray, days, key: int, value: float,
+                years: tuple[int, int] | None, descending: bool,
+                window: int = WINDOW) -> tuple[float | None, int]:
+    """값 하나가 ±window일 창 표본(연도 범위) 중 상위 몇 %인지 → (백분율, 표본 수)
+
+    같은 MM-DD만 쓰는 순위보다 표본이 (2·window+1)배라 덜 흔들린다.
+    days는 DayIndex, 더 나은 값(내림차순이면 더 큰 값)의 비율을 돌려준다.
+    """
+    keys = (np.arange(key - window, key + window + 1)) % N_KEYS
+    sample = values[days.rows_many(keys, years)]
+    sample = sample[~np.isnan(sample)]
+    if not len(sample) or np.isnan(value):
+        return None, len(sample)
+    better = (sample > value) if descending else (sample < value)
+    return 100 * np.count_nonzero(better) / len(sample), len(sample)
+
+
+def baseline_mask(year: np.ndarray, baseline: tuple[int, int]) -> tuple[np.ndarray, tuple]:
+    """기준 기간 행 마스크와 실제 기간 (자료가 없으면 전체 연도)"""
+    mask = (year >= baseline[0]) & (year <= baseline[1])
+    if mask.any() or not len(year):
+        return mask, tuple(baseline)
+    return np.ones(len(year), bool), (int(year.min()), int(year.max()))
+
+
+def cache_name(baseline: tuple[int, int], window: int, col: int) -> str:
+    """사이드카에 저장할 배열 이름 (col = 열 위치)"""
+    return f"pctl_{baseline[0]}_{baseline[1]}_w{window}_{col}"
+
+
+class PercentileEngine:
+    """열별 창 표본 → 기준값 표·연도별 초과 일수·ETCCDI 지수
+
+    columns: 열 이름 → 값 배열(행 순서, mmap 가능), samples: 열 이름 → 저장용 배열
+    """
+
+    def __init__(self, day: np.ndarray, station: np.ndarray, columns: dict,
+                 key: np.ndarray, year: np.ndarray, samples: dict,
+                 baseline: tuple[int, int], window: int = WINDOW):
+        self.day, self.station = day, station
+        self.columns = columns
+        self.key, self.year = key, year
+        self.baseline, self.window = baseline, window
+        self._samples = {c: split_samples(a) for c, a in samples.items()}
+        self._thr: dict[tuple, np.ndarray] = {}
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def threshold(self, col: str, q: float) -> np.ndarray:
+        """열의 키별 q 백분위 (366,)"""
+        ck = (col, q)
+        thr = self._thr.get(ck)
+        if thr is None:
+            thr = self._thr[ck] = quantiles(*self._samples[col], q)
+        return thr
+
+    def table(self, qs=(10, 90)) -> pd.DataFrame:
+        """366행 기준값 표 (MM-DD, '열 pq' …, 표본수)"""
+        out = pd.DataFrame({"MM-DD": [key_label(k) for k in range(N_KEYS)]},
+                           index=pd.RangeIndex(N_KEYS, name="키"))
+        for col in self.columns:
+            for q in qs:
+                out[f"{col} p{q:g}"] = self.threshold(col, q)
+        out["표본수"] = np.min([np.diff(self._samples[c][0]) for c in self.columns], axis=0)
+        return out
+
+    def exceed(self, col: str, q: float, above: bool) -> np.ndarray:
+        """행별 초과 여부 (> 기준 또는 < 기준, 결측은 False)"""
+        v = self.columns[col]
+        thr = self.threshold(col, q)[self.key]
+        with np.errstate(invalid="ignore"):
+            return v > thr if above else v < thr
+
+    def exceedance(self, col: str, q: float, above: bool,
+                   years: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        """연도별 (초과 일수, 유효 일수) – bincount 한 번씩"""
+        y0, y1 = years
+        n = y1 - y0 + 1
+        y = self.year.astype(np.int64) - y0
+        inside = (y >= 0) & (y < n)
+        hit = self.exceed(col, q, above)
+        valid = ~np.isnan(self.columns[col])
+        return (np.bincount(y[inside & hit], minlength=n),
+                np.bincount(y[inside & valid], minlength=n))
+
+    def _spell_days(self, hit: np.ndarray, years: tuple[int, int]) -> np.ndarray:
+        """hit이 SPELL_DAYS일 이상 이어진 날을 연도별로 센 값 (날짜 공백·지점 경계에서 끊김)"""
+        n = len(hit)
+        y0, y1 = years
+        if not n:
+            return np.zeros(y1 - y0 + 1, np.int64)
+        brk = np.ones(n, bool)
+        brk[1:] = (np.diff(self.day) != 1) | (self.station[1:] != self.station[:-1])
+        run_id = np.cumsum(brk | np.r_[True, hit[1:] != hit[:-1]])
+        length = np.bincount(run_id)[run_id]
+        in_spell = hit & (length >= SPELL_DAYS)
+        y = self.year[in_spell].astype(np.int64) - y0
+        return np.bincount(y[(y >= 0) & (y <= y1 - y0)], minlength=y1 - y0 + 1)
+
+    def indices(self, years: tuple[int, int] | None = None) -> pd.DataFrame:
+        """연도별 ETCCDI 지수 표 – TX90p 등은 %, WSDI·CSDI는 일수"""
+        if years is None:
+            years = (int(self.year.min()), int(self.year.max()))
+        out = pd.DataFrame(index=pd.RangeIndex(years[0], years[1] + 1, name="연도"))
+        for name, (col, q, above) in INDICES.items():
+            if col not in self.columns:
+                continue
+            hit, valid = self.exceedance(col, q, above, years)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[name] = np.where(valid > 0, 100 * hit / valid, np.nan)
+        for name, base in SPELLS.items():
+            col, q, above = INDICES[base]
+            if col in self.columns:
+                out[name] = self._spell_days(self.exceed(col, q, above), years)
+        return out.round(2)
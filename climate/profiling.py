@@ -0,0 +1,254 @@
+# ────────────────────────────────────────────────────────────────
+#  재실행 구간별 시간·메모리 기록
+#  ▸ 페이지마다 재실행 한 번에 Profiler 하나
+#     - mark("6. 랭킹")        : 이전 구간을 닫고 새 구간 시작 (페이지 섹션 머리에)
+#     - with section("로드")   : 블록 하나만 측정
+#     - @timed("그림")          : 함수 호출마다 측정
+#     - with fragment("10. …")  : st.fragment 본문 – 조각만 다시 실행되면 따로 기록
+#  ▸ 메모리: RSS 변화(Linux /proc) 항상, tracemalloc 최대 할당은
+#    SEOULTEMP_PROFILE_MEMORY=1일 때만 (켜면 전체가 느려짐)
+#  ▸ finish() 때 기록
+#     - SEOULTEMP_PROFILE_LOG  : 재실행마다 JSON 한 줄 추가 (JSONL)
+#     - SEOULTEMP_PROFILE_PROM : Prometheus 텍스트 형식 파일을 통째로 갱신
+#       (node_exporter textfile collector 등이 읽음, 재실행 시간 히스토그램 포함)
+#       집계는 프로세스마다 따로이므로 파일 이름에 pid를 붙이고(metrics.prom →
+#       metrics.<pid>.prom) 모든 시계열에 pid 레이블을 단다 – 종료 시 파일 삭제
+#     - 최근 RECENT_RUNS회 총 시간은 프로세스에 보관 → 백분위 표시
+# ────────────────────────────────────────────────────────────────
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+RECENT_RUNS = 200
+# 재실행 시간 히스토그램 경계(초)
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class Section(NamedTuple):
+    name: str
+    ms: float
+    rss_mb: float | None      # RSS 변화
+    peak_mb: float | None     # 구간 시작 대비 tracemalloc 최대 할당 (꺼져 있으면 None)
+
+
+def _rss() -> int | None:
+    """현재 RSS(바이트) – /proc가 없으면 None"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def memory_enabled() -> bool:
+    return os.environ.get("SEOULTEMP_PROFILE_MEMORY", "") not in ("", "0")
+
+
+# ────────────── 1. 프로세스 공용 집계 ──────────────
+_lock = threading.Lock()
+_recent: dict[str, deque] = defaultdict(lambda: deque(maxlen=RECENT_RUNS))
+_runs: dict[str, list] = defaultdict(lambda: [0, 0.0, [0] * len(BUCKETS)])   # 횟수, 합, 버킷
+_sections: dict[tuple, list] = defaultdict(lambda: [0, 0.0])                  # 횟수, 합
+
+
+def _label(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _prometheus() -> str:
+    """누적 집계 → Prometheus 텍스트 형식 (이 프로세스 것만, pid 레이블)"""
+    pid = os.getpid()
+    out = ["# HELP seoultemp_rerun_seconds 페이지 재실행 한 번의 시간",
+           "# TYPE seoultemp_rerun_seconds histogram"]
+    for page, (count, total, buckets) in sorted(_runs.items()):
+        p = f'pid="{pid}",page="{_label(page)}"'
+        for le, n in zip(BUCKETS, buckets):
+            out.append(f'seoultemp_rerun_seconds_bucket{{{p},le="{le}"}} {n}')
+        out += [f'seoultemp_rerun_seconds_bucket{{{p},le="+Inf"}} {count}',
+                f"seoultemp_rerun_seconds_sum{{{p}}} {total:.6f}",
+                f"seoultemp_rerun_seconds_count{{{p}}} {count}"]
+    out += ["# HELP seoultemp_section_seconds 재실행 구간별 시간",
+            "# TYPE seoultemp_section_seconds summary"]
+    for (page, name), (count, total) in sorted(_sections.items()):
+        lab = f'pid="{pid}",page="{_label(page)}",section="{_label(name)}"'
+        out += [f"seoultemp_section_seconds_sum{{{lab}}} {total:.6f}",
+                f"seoultemp_section_seconds_count{{{lab}}} {count}"]
+    return "\n".join(out) + "\n"
+
+
+def prom_path(prom: str) -> str:
+    """SEOULTEMP_PROFILE_PROM 경로 → 이 프로세스의 파일 (확장자 앞에 pid)"""
+    root, ext = os.path.splitext(prom)
+    return f"{root}.{os.getpid()}{ext or '.prom'}"
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_prom_written: set[str] = set()
+
+
+def _record(page: str, total: float, sections: list[Section]) -> None:
+    with _lock:
+        _recent[page].append(total * 1000)
+        run = _runs[page]
+        run[0] += 1
+        run[1] += total
+        for i, le in enumerate(BUCKETS):
+            if total <= le:
+                run[2][i] += 1
+        for s in sections:
+            agg = _sections[(page, s.name)]
+            agg[0] += 1
+            agg[1] += s.ms / 1000
+
+        log = os.environ.get("SEOULTEMP_PROFILE_LOG")
+        if log:
+            rec = {"ts": round(time.time(), 3), "page": page, "pid": os.getpid(),
+                   "total_ms": round(total * 1000, 3),
+                   "sections": [s._asdict() for s in sections]}
+            with open(log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+        prom = os.environ.get("SEOULTEMP_PROFILE_PROM")
+        if prom:
+            # 프로세스마다 따로 쓴다 – 한 파일을 덮어쓰면 카운터가 프로세스 사이를 오가며 줄어듦
+            path = prom_path(prom)
+            # 수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일 → 교체
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(_prometheus())
+            os.replace(tmp, path)
+            if path not in _prom_written:
+                _prom_written.add(path)
+                atexit.register(_remove, path)
+
+
+def percentiles(page: str, qs=(50, 95, 99)) -> dict[int, float]:
+    """이 프로세스에서 최근 RECENT_RUNS회 재실행 총 시간(ms)의 백분위"""
+    with _lock:
+        runs = list(_recent.get(page, ()))
+    if not runs:
+        return {}
+    return dict(zip(qs, np.percentile(runs, qs).tolist()))
+
+
+# ────────────── 2. 재실행 측정기 ──────────────
+class Profiler:
+    """페이지 재실행 한 번의 구간별 시간·메모리"""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.sections: list[Section] = []
+        self.memory = memory_enabled()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._t0 = time.perf_counter()
+        self._open: tuple | None = None
+        self.total_ms: float | None = None
+
+    def _start(self, name: str) -> tuple:
+        traced = 0
+        if self.memory:
+            tracemalloc.reset_peak()
+            traced = tracemalloc.get_traced_memory()[0]
+        return name, time.perf_counter(), _rss(), traced
+
+    def _stop(self, state: tuple) -> None:
+        name, t0, rss0, traced0 = state
+        ms = (time.perf_counter() - t0) * 1000
+        rss1 = _rss()
+        rss = (rss1 - rss0) / 2 ** 20 if rss0 is not None and rss1 is not None else None
+        peak = (tracemalloc.get_traced_memory()[1] - traced0) / 2 ** 20 if self.memory else None
+        self.sections.append(Section(name, ms, rss, peak))
+
+    def mark(self, name: str) -> None:
+        """열린 구간을 닫고 name 구간 시작"""
+        if self._open is not None:
+            self._stop(self._open)
+        self._open = self._start(name)
+
+    @contextmanager
+    def section(self, name: str):
+        """with 블록 하나를 측정 (mark 구간 안에 중첩 가능)"""
+        state = self._start(name)
+        try:
+            yield
+        finally:
+            self._stop(state)
+
+    def timed(self, name: str | None = None):
+        """함수 호출마다 측정하는 데코레이터"""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kw):
+                with self.section(name or fn.__name__):
+                    return fn(*args, **kw)
+            return inner
+        return wrap
+
+    @contextmanager
+    def fragment(self, name: str):
+        """st.fragment 본문 측정 → 구간 안에서 쓸 Profiler를 돌려줌
+
+        페이지 전체 재실행 중이면 mark(name)과 같고, 조각 안 위젯으로 그 조각만
+        다시 실행될 때(이 Profiler는 이미 finish됨)는 '페이지/name'으로 따로 기록."""
+        if self.total_ms is None:
+            self.mark(name)
+            yield self
+            return
+        sub = Profiler(f"{self.page}/{name}")
+        sub.mark(name)
+        try:
+            yield sub
+        finally:
+            sub.finish()
+
+    def finish(self) -> float:
+        """열린 구간을 닫고 집계·파일에 기록, 총 시간(ms) 반환 (두 번째 호출은 무시)"""
+        if self.total_ms is None:
+            if self._open is not None:
+                self._stop(self._open)
+                self._open = None
+            total = time.perf_counter() - self._t0
+            self.total_ms = total * 1000
+            _record(self.page, total, self.sections)
+        return self.total_ms
+
+    def frame(self) -> pd.DataFrame:
+        """구간별 표 (사이드바 표시용)"""
+        out = pd.DataFrame({"구간": [s.name for s in self.sections],
+                            "ms": [round(s.ms, 1) for s in self.sections],
+                            "RSS Δ MB": [s.rss_mb for s in self.sections]})
+        if self.memory:
+            out["최대 할당 MB"] = [s.peak_mb for s in self.sections]
+        return out.round(2)
+
+    def summary(self) -> str:
+        """'이번 x ms · 최근 n회 p50 … p95 …' 한 줄"""
+        total = self.total_ms
+        if total is None:
+            total = (time.perf_counter() - self._t0) * 1000
+        text = f"이번 재실행 {total:.0f} ms"
+        pct = percentiles(self.page)
+        if pct:
+            with _lock:
+                n = len(_recent[self.page])
+            text += f" · 최근 {n}회 " + " · ".join(f"p{q} {v:.0f} ms" for q, v in pct.items())
+        return text
@@ -0,0 +1,189 @@
+# ────────────────────────────────────────────────────────────────
+#  자료 품질 색인 – 날짜별 존재 비트맵, 연·월 완전성, 공백 구간
+#  ▸ 첫날~마지막 날 달력 전체를 하루 1비트로 (열마다 + 행 존재 1줄)
+#     - 1 = 그날 행이 있고 값이 결측이 아님 → 특정 날짜 확인은 O(1)
+#  ▸ (연도, 월)별 열마다 자료 일수를 한 번 세어 두고 달력 일수로 나눈 비율
+#     → "완전한 해·달" 거르기와 그래프 표시는 배열 조회
+#  ▸ 공백 구간: 자료가 연속으로 빠진 날(행 없음 또는 결측)의 시작·끝·일수
+#     (1950-1952 한국전쟁 시기처럼 몇 달~1년 넘게 빈 구간)
+#  ▸ 지점 하나 기준 – 여러 지점이 섞인 Dataset은 for_station()으로 나눠 쓴다
+#  ▸ 비트맵·일수 표는 사이드카에 저장해 프로세스끼리 mmap으로 공유 (Dataset.quality)
+# ────────────────────────────────────────────────────────────────
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import split_days
+from climate.sidecar import day_dates
+
+ROW = "행"                     # 그날 행이 있는지 (값 결측과 무관)
+ALL = "전체"                   # 모든 열이 있는 날 (비율은 열별 비율의 최솟값)
+COMPLETE = 1.0                 # 완전한 해·달 기준 비율
+FLAG_BELOW = 0.9               # 그래프에서 표시할 불완전 기준 비율
+
+
+def build(day: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(날짜 순) 일수·(열, 행) 값 → (비트맵 uint8 (열+1, ⌈일수/8⌉), 월별 일수 int32 (월, 열+1))
+
+    비트맵 첫 줄~열 수 줄은 열별 값 존재, 마지막 줄은 행 존재.
+    기간 = 첫날이 속한 해 1월 1일 ~ 마지막 날이 속한 해 12월 31일.
+    """
+    day = np.asarray(day)
+    k = len(values)
+    if not len(day):
+        return np.zeros((k + 1, 0), np.uint8), np.zeros((0, k + 1), np.int32)
+    y0, y1 = (int(y) for y in split_days(np.array([day.min(), day.max()]))[0])
+    # 첫 해 1월부터 센 월 번호
+    month = day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) \
+        - (y0 - 1970) * 12
+    first = int(np.datetime64(f"{y0}-01-01", "D").astype(np.int64))
+    last = int(np.datetime64(f"{y1}-12-31", "D").astype(np.int64))
+    pos = np.asarray(day, np.int64) - first
+
+    present = np.zeros((k + 1, last - first + 1), bool)
+    present[k, pos] = True
+    n_months = (y1 - y0 + 1) * 12
+    counts = np.zeros((n_months, k + 1), np.int32)
+    counts[:, k] = np.bincount(month, minlength=n_months)
+    for i in range(k):
+        ok = ~np.isnan(values[i])
+        present[i, pos[ok]] = True
+        counts[:, i] = np.bincount(month[ok], minlength=n_months)
+    return np.packbits(present, axis=1), counts
+
+
+class QualityIndex:
+    """비트맵·월별 일수에서 완전성 비율과 공백 구간을 꺼내는 조회기"""
+
+    def __init__(self, names: list[str], first_year: int, bits: np.ndarray,
+                 counts: np.ndarray):
+        self.names = list(names)
+        self.first_year = first_year
+        self.bits = bits
+        self.counts = counts
+        self.n_years = len(counts) // 12
+        self.first_day = int(np.datetime64(f"{first_year}-01-01", "D").astype(np.int64))
+        # 달력 일수 (연도, 12)
+        starts = np.arange(np.datetime64(f"{first_year}-01", "M"),
+                           np.datetime64(f"{first_year + self.n_years}-01", "M") + 1)
+        cal = np.diff(starts.astype("datetime64[D]").astype(np.int64))
+        self.calendar = cal.reshape(self.n_years, 12)
+        by_year = counts.reshape(self.n_years, 12, -1).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            per_month = counts.reshape(self.n_years, 12, -1) / self.calendar[..., None]
+            per_year = by_year / self.calendar.sum(axis=1)[:, None]
+        # 열별 + 행 + 전체(열별 최솟값) 비율·일수 (연도, 열+2) / (연도, 12, 열+2)
+        k = len(self.names)
+        self.year_days = np.concatenate(
+            [by_year, by_year[:, :k].min(axis=1, keepdims=True)], axis=1)
+        self.month_ratio = np.concatenate(
+            [per_month, per_month[..., :k].min(axis=2, keepdims=True)], axis=2)
+        self.year_ratio = np.concatenate(
+            [per_year, per_year[:, :k].min(axis=1, keepdims=True)], axis=1)
+
+    @property
+    def years(self) -> np.ndarray:
+        return np.arange(self.first_year, self.first_year + self.n_years)
+
+    def _col(self, col: str | None) -> int:
+        """열 이름 → 비율 표 위치 (None은 전체)"""
+        if col in (None, ALL):
+            return len(self.names) + 1
+        return len(self.names) if col == ROW else self.names.index(col)
+
+    def present(self, day: int, col: str | None = None) -> bool:
+        """그날 자료가 있는지 – 비트 몇 개만 읽는다 (col이 None이면 모든 열)"""
+        i = int(day) - self.first_day
+        if not 0 <= i < self.bits.shape[1] * 8:
+            return False
+        rows = range(len(self.names)) if col in (None, ALL) else (self._col(col),)
+        return all(self.bits[r, i >> 3] >> (7 - (i & 7)) & 1 for r in rows)
+
+    def mask(self, col: str | None = None) -> np.ndarray:
+        """첫 해 1월 1일부터 날짜별 존재 여부 (col이 None이면 모든 열이 있는 날)"""
+        n = int(self.calendar.sum())
+        if col in (None, ALL):
+            packed = np.bitwise_and.reduce(self.bits[:len(self.names)], axis=0)
+        else:
+            packed = self.bits[self._col(col)]
+        return np.unpackbits(packed, count=n).astype(bool)
+
+    def year_completeness(self, year: int, col: str | None = None) -> float:
+        """연도의 자료 비율 (범위 밖이면 0)"""
+        i = year - self.first_year
+        return float(self.year_ratio[i, self._col(col)]) if 0 <= i < self.n_years else 0.0
+
+    def month_completeness(self, year: int, month: int, col: str | None = None) -> float:
+        i = year - self.first_year
+        return (float(self.month_ratio[i, month - 1, self._col(col)])
+                if 0 <= i < self.n_years else 0.0)
+
+    def complete_years(self, col: str | None = None, min_ratio: float = COMPLETE,
+                       years: tuple[int, int] | None = None,
+                       min_days: int | None = None) -> np.ndarray:
+        """자료 비율이 min_ratio 이상인 연도 (min_days가 있으면 자료 일수 min_days 이상)
+
+        min_days=365는 윤년도 365일이면 완전한 해로 본다 (비율 기준은 366일 필요).
+        """
+        ys = self.years
+        if min_days is not None:
+            ok = self.year_days[:, self._col(col)] >= min_days
+        else:
+            ok = self.year_ratio[:, self._col(col)] >= min_ratio
+        if years is not None:
+            ok &= (ys >= years[0]) & (ys <= years[1])
+        return ys[ok]
+
+    def incomplete_years(self, col: str | None = None, min_ratio: float = FLAG_BELOW,
+                         years: tuple[int, int] | None = None) -> np.ndarray:
+        """자료 비율이 min_ratio 미만인 연도 (그래프 표시용)"""
+        ys = self.years
+        bad = ~(self.year_ratio[:, self._col(col)] >= min_ratio)
+        if years is not None:
+            bad &= (ys >= years[0]) & (ys <= years[1])
+        return ys[bad]
+
+    def year_table(self) -> pd.DataFrame:
+        """연도별 열별 자료 비율 표"""
+        return pd.DataFrame(self.year_ratio, columns=self.names + [ROW, ALL],
+                            index=pd.Index(self.years, name="연도"))
+
+    def month_table(self, col: str | None = None) -> pd.DataFrame:
+        """연도 × 월 자료 비율 표 (한 열 또는 전체)"""
+        return pd.DataFrame(self.month_ratio[..., self._col(col)],
+                            columns=pd.RangeIndex(1, 13, name="월"),
+                            index=pd.Index(self.years, name="연도"))
+
+    def gaps(self, col: str | None = None, min_days: int = 1,
+             years: tuple[int, int] | None = None) -> pd.DataFrame:
+        """자료가 min_days일 이상 연속으로 빠진 구간 (자료 첫날~마지막 날 안쪽)
+
+        col이 None이면 어느 한 열이라도 빠진 날, ROW면 행 자체가 없는 날.
+        years가 있으면 그 범위와 겹치는 구간만.
+        """
+        have = self.mask(col)
+        idx = np.flatnonzero(have)
+        if not len(idx):
+            return pd.DataFrame({"시작": [], "끝": [], "일수": []})
+        have = have[idx[0]:idx[-1] + 1]
+        edges = np.diff(np.r_[1, have.astype(np.int8), 1])
+        starts = np.flatnonzero(edges == -1)
+        ends = np.flatnonzero(edges == 1) - 1
+        keep = ends - starts + 1 >= min_days
+        first = self.first_day + int(idx[0])
+        start, end = starts[keep] + first, ends[keep] + first
+        if years is not None:
+            lo = int(np.datetime64(f"{years[0]}-01-01", "D").astype(np.int64))
+            hi = int(np.datetime64(f"{years[1]}-12-31", "D").astype(np.int64))
+            inside = (end >= lo) & (start <= hi)
+            start, end = start[inside], end[inside]
+        return pd.DataFrame({"시작": day_dates(start), "끝": day_dates(end),
+                             "일수": end - start + 1})
+
+    def gap_text(self, col: str | None = None, min_days: int = 30,
+                 years: tuple[int, int] | None = None) -> str | None:
+        """'1950-10-31~1951-12-01(397일) · …' 경고 문구 (공백이 없으면 None)"""
+        g = self.gaps(col, min_days, years)
+        if not len(g):
+            return None
+        return " · ".join(f"{a:%Y-%m-%d}~{b:%Y-%m-%d}({n}일)"
+                          for a, b, n in zip(g["시작"], g["끝"], g["일수"]))
@@ -0,0 +1,201 @@
+# ────────────────────────────────────────────────────────────────
+#  같은 MM-DD 순위 엔진
+#  ▸ 열마다 (MM-DD 키, 값, 날짜) 순으로 한 번만 정렬해 둔다
+#  ▸ "X일의 값이 [a, b]년 같은 날 중 몇 위인가"를 이진 탐색으로 계산
+#  ▸ 순위 규칙
+#     - 최고·평균기온은 높을수록, 최저기온은 낮을수록 1위
+#     - 동점은 같은 (가장 좋은) 순위 → 1, 2, 2, 4 …
+#     - 결측(NaN)은 순위·표본 수에서 제외, 선택일이 결측이면 순위 없음
+#     - 기록 보유일이 여러 개면 가장 이른 날짜
+#  ▸ 상위 %는 같은 MM-DD 대신 ±2일 창 표본으로도 (window_pct, 표본이 5배라 덜 흔들림)
+#  ▸ 정렬 순서(order)는 사이드카에 저장해 두고, 새 자료가 들어오면
+#    바뀐 행만 빼고 끼워 넣어 갱신 (climate.ingest)
+# ────────────────────────────────────────────────────────────────
+from typing import NamedTuple
+
+import numpy as np
+
+from climate.dayindex import N_KEYS
+from climate.percentile import WINDOW, window_rank
+
+# 열 이름 → 내림차순(높을수록 1위) 여부
+DESCENDING = {"최고기온(℃)": True, "평균기온(℃)": True, "최저기온(℃)": False}
+
+
+class RankResult(NamedTuple):
+    rank: int | None       # 1부터, 값이 결측이면 None
+    pct: float | None      # 상위 백분율 100·(rank-1)/n
+    n: int                 # 비교 표본 수 (결측 제외)
+    record: int | None     # 기록(1위) 행 위치
+
+
+def sort_order(score: np.ndarray, key: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """결측을 뺀 행 위치를 (키, 점수, 날짜) 순으로 정렬"""
+    rows = np.flatnonzero(~np.isnan(score))
+    return rows[np.lexsort((day[rows], score[rows], key[rows]))]
+
+
+def update_order(order: np.ndarray, remap: np.ndarray, added: np.ndarray,
+                 score: np.ndarray, key: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """기존 정렬 순서를 새 행 위치로 옮기고 추가된 행만 끼워 넣기
+
+    remap  : 옛 행 위치 → 새 행 위치 (빠진 행은 -1)
+    added  : 새로 들어왔거나 값이 바뀐 행의 새 위치
+    score·key·day는 새 데이터 기준. 남은 행끼리의 순서는 그대로라 다시 정렬하지 않는다.
+    """
+    kept = remap[order]
+    kept = kept[kept >= 0]
+    added = added[~np.isnan(score[added])]
+    if len(added) == 0:
+        return kept
+    added = added[np.lexsort((day[added], score[added], key[added]))]
+    k_key, k_score, k_day = key[kept], score[kept], day[kept]
+    pos = np.empty(len(added), np.int64)
+    for i, r in enumerate(added):
+        lo = np.searchsorted(k_key, key[r], "left")
+        hi = np.searchsorted(k_key, key[r], "right")
+        a = lo + np.searchsorted(k_score[lo:hi], score[r], "left")
+        b = lo + np.searchsorted(k_score[lo:hi], score[r], "right")
+        pos[i] = a + np.searchsorted(k_day[a:b], day[r])
+    return np.insert(kept, pos, added)
+
+
+class ColumnRanks:
+    """한 열의 MM-DD 키별 정렬 배열
+
+    정렬 순서(rows)만 보관하고 값·연도는 조회할 키 구간만 원본 배열에서 꺼낸다
+    → 원본과 순서가 사이드카 mmap이면 프로세스별 복사본이 없다.
+    """
+
+    def __init__(self, values: np.ndarray, key: np.ndarray, year: np.ndarray,
+                 day: np.ndarray, descending: bool, order: np.ndarray | None = None):
+        self.sign = -1.0 if descending else 1.0
+        self.values = values
+        self.year_of = year
+        if order is None:
+            order = sort_order(self.sign * values.astype(np.float64), key, day)
+        self.rows = order                       # 정렬된 행 위치
+        self.offsets = np.r_[0, np.cumsum(np.bincount(key[order], minlength=N_KEYS))]
+
+    def _slice(self, key: int) -> slice:
+        return slice(int(self.offsets[key]), int(self.offsets[key + 1]))
+
+    def _score(self, rows: np.ndarray) -> np.ndarray:
+        """행들의 점수 (작을수록 상위)"""
+        return self.sign * self.values[rows].astype(np.float64)
+
+    def rank_value(self, key: int, value: float,
+                   years: tuple[int, int] | None = None) -> RankResult:
+        """값 하나의 순위 (years가 None이면 전체 연도)"""
+        sl = self._slice(key)
+        rows = self.rows[sl]
+        if years is None:
+            mask = None
+            n = len(rows)
+        else:
+            yrs = self.year_of[rows]
+            mask = (yrs >= years[0]) & (yrs <= years[1])
+            n = int(np.count_nonzero(mask))
+        if n == 0:
+            return RankResult(None, None, 0, None)
+
+        first = 0 if mask is None else int(np.argmax(mask))
+        record = int(rows[first])
+        if np.isnan(value):
+            return RankResult(None, None, n, record)
+
+        score = self._score(rows)
+        pos = int(np.searchsorted(score, self.sign * float(value), "left"))
+        better = pos if mask is None else int(np.count_nonzero(mask[:pos]))
+        rank = better + 1
+        return RankResult(rank, 100 * (rank - 1) / n, n, record)
+
+    def top(self, key: int, years: tuple[int, int] | None = None,
+            k: int | None = None) -> np.ndarray:
+        """상위 k개(None이면 전부) 행 위치, 순위 순"""
+        sl = self._slice(key)
+        rows = self.rows[sl]
+        if years is not None:
+            yrs = self.year_of[rows]
+            rows = rows[(yrs >= years[0]) & (yrs <= years[1])]
+        return rows if k is None else rows[:k]
+
+    def records(self, years: tuple[int, int] | None = None) -> np.ndarray:
+        """MM-DD 키별 기록(1위) 행 위치 (366,), 자료가 없으면 -1"""
+        out = np.full(N_KEYS, -1, np.int64)
+        for key in range(N_KEYS):
+            rows = self.top(key, years, 1)
+            if len(rows):
+                out[key] = rows[0]
+        return out
+
+    def rank_all(self, n_rows: int) -> tuple[np.ndarray, np.ndarray]:
+        """모든 행의 전체 연도 기준 (순위, 표본 수). 결측 행은 순위 0"""
+        sizes = np.diff(self.offsets)
+        score = self._score(self.rows)
+        idx = np.arange(len(score))
+        group_start = np.repeat(self.offsets[:-1], sizes)
+        tie_start = idx == group_start
+        tie_start[1:] |= score[1:] != score[:-1]
+        first_of_tie = np.maximum.accumulate(np.where(tie_start, idx, 0))
+
+        rank = np.zeros(n_rows, np.int32)
+        count = np.zeros(n_rows, np.int32)
+        rank[self.rows] = first_of_tie - group_start + 1
+        count[self.rows] = np.repeat(sizes, sizes)
+        return rank, count
+
+
+def order_name(i: int) -> str:
+    """사이드카에 저장할 i번째 열의 정렬 순서 이름"""
+    return f"rank_order_{i}"
+
+
+class RankEngine:
+    """데이터셋의 열별 ColumnRanks를 필요할 때 만들어 보관"""
+
+    def __init__(self, ds):
+        self._ds = ds
+        self._cols: dict[str, ColumnRanks] = {}
+
+    def column(self, col: str) -> ColumnRanks:
+        """열의 정렬 배열 – 순서는 사이드카에 있으면 mmap으로 읽고, 없으면 정렬해 저장"""
+        cr = self._cols.get(col)
+        if cr is None:
+            ds = self._ds
+            values = ds.frame[col].to_numpy()
+            sign = -1.0 if DESCENDING.get(col, True) else 1.0
+            order = ds.shared(order_name(ds.names.index(col)), lambda: sort_order(
+                sign * values.astype(np.float64), ds.days.key, ds.day).astype(np.int32))
+            cr = ColumnRanks(values, ds.days.key, ds.days.year, ds.day,
+                             DESCENDING.get(col, True), order)
+            self._cols[col] = cr
+        return cr
+
+    def query(self, col: str, row: int,
+              years: tuple[int, int] | None = None) -> RankResult:
+        """행 위치 row의 값이 같은 MM-DD 중 몇 위인지"""
+        ds = self._ds
+        return self.column(col).rank_value(int(ds.days.key[row]),
+                                           ds.frame[col].iat[row], years)
+
+    def window_pct(self, col: str, row: int, years: tuple[int, int] | None = None,
+                   window: int = WINDOW) -> tuple[float | None, int]:
+        """행 row의 값이 ±window일 창 표본(연도 범위) 중 상위 몇 %인지 → (백분율, 표본 수)
+
+        같은 날짜 순위(query)와 표본이 다르므로 함께 표시할 때는 표본 수를 따로 밝힌다.
+        """
+        ds = self._ds
+        values = ds.frame[col].to_numpy()
+        return window_rank(values, ds.days, int(ds.days.key[row]), float(values[row]),
+                           years, DESCENDING.get(col, True), window)
+
+    def top(self, col: str, key: int, years: tuple[int, int] | None = None,
+            k: int | None = None) -> np.ndarray:
+        return self.column(col).top(key, years, k)
+
+    def rank_all(self, col: str) -> tuple[np.ndarray, np.ndarray]:
+        return self.column(col).rank_all(len(self._ds))
+
+    def records(self, col: str, years: tuple[int, int] | None = None) -> np.ndarray:
+        return self.column(col).records(years)
@@ -0,0 +1,131 @@
+# ────────────────────────────────────────────────────────────────
+#  일괄 분석 리포트 (Streamlit 없이 실행)
+#  ▸ 날짜마다: 기온, 같은 MM-DD 순위·백분위·역대 기록, 평년 편차,
+#     최근 N일 평균과 역대 동기간 중 순위
+#  ▸ batch_report  : 한 프로세스에서 날짜 범위 전체를 배열 연산으로 계산
+#  ▸ parallel_report: 날짜 범위를 나눠 프로세스 풀로 계산 후 합침
+# ────────────────────────────────────────────────────────────────
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import day_number
+from climate.loader import TEMP_COLS, Dataset, load
+from climate.normals import WMO_BASELINE
+
+SHORT = {"최고기온(℃)": "최고", "평균기온(℃)": "평균", "최저기온(℃)": "최저"}
+
+
+def _rows_between(ds: Dataset, start, end) -> np.ndarray:
+    """[start, end] 날짜(양 끝 포함)에 속하는 행 위치"""
+    lo = day_number(start) if start is not None else np.iinfo(np.int32).min
+    hi = day_number(end) if end is not None else np.iinfo(np.int32).max
+    return np.flatnonzero((ds.day >= lo) & (ds.day <= hi))
+
+
+def _nullable(a: np.ndarray, missing: np.ndarray):
+    """정수 배열 → 결측 자리가 <NA>인 Int32 배열"""
+    return pd.arrays.IntegerArray(np.where(missing, 0, a).astype(np.int32), missing)
+
+
+def batch_report(ds: Dataset, start=None, end=None, years: tuple[int, int] | None = None,
+                 n: int = 14, baseline: tuple[int, int] = WMO_BASELINE,
+                 rows: np.ndarray | None = None) -> pd.DataFrame:
+    """날짜 범위(또는 행 위치 rows)의 날짜별 리포트 표
+
+    여러 지점이 든 데이터셋은 지점별로 계산해 이어 붙인다 (rows는 지점 하나일 때만).
+    """
+    if len(ds.station_ids) > 1:
+        return pd.concat([batch_report(ds.for_station(sid), start, end, years, n, baseline)
+                          for sid in ds.station_ids], ignore_index=True)
+    if rows is None:
+        rows = _rows_between(ds, start, end)
+    df = ds.frame
+    keys = ds.days.key[rows]
+    yrs = ds.days.year[rows]
+    dates = df["날짜"].to_numpy()
+    out = {"날짜": dates[rows], "지점": ds.station[rows]}
+
+    normals = ds.normals(baseline)
+    cols = [c for c in TEMP_COLS if c in df.columns]
+    for col in cols:
+        s = SHORT.get(col, col)
+        v = df[col].to_numpy()[rows]
+        out[col] = v
+        out[f"{s}_평년편차"] = v - normals[col].to_numpy()[keys]
+
+        # 같은 MM-DD 순위 – 전체 연도는 한 번에, 연도 범위가 있으면 날짜별 이진 탐색
+        if years is None:
+            rank, cnt = ds.ranks.rank_all(col)
+            rank, cnt = rank[rows], cnt[rows]
+        else:
+            cr = ds.ranks.column(col)
+            res = [cr.rank_value(int(k), float(x), years) for k, x in zip(keys, v)]
+            rank = np.array([r.rank or 0 for r in res])
+            cnt = np.array([r.n for r in res])
+        missing = rank == 0
+        out[f"{s}_순위"] = _nullable(rank, missing)
+        out[f"{s}_표본수"] = cnt.astype(np.int32)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[f"{s}_상위백분율"] = np.where(missing, np.nan, 100 * (rank - 1) / cnt)
+
+        rec = ds.ranks.records(col, years)[keys]
+        no_rec = rec < 0
+        rec = np.where(no_rec, 0, rec)
+        out[f"{s}_기록일"] = np.where(no_rec, np.datetime64("NaT"), dates[rec])
+        out[f"{s}_기록값"] = np.where(no_rec, np.nan, df[col].to_numpy()[rec])
+
+    # 최근 N일 평균과 역대 동기간 순위
+    win = ds.windows
+    recent, _ = win.trailing(ds.day[rows], n)
+    for i, col in enumerate(win.names):
+        out[f"최근{n}일_{SHORT.get(col, col)}"] = recent[i]
+    if "평균기온(℃)" in win.names:
+        all_years = win.all_years()
+        p_rank, p_cnt = win.period_ranks(n, "평균기온(℃)", all_years)
+        yi = yrs.astype(np.int64) - all_years[0]
+        pr = p_rank[keys, yi]
+        out[f"최근{n}일_평균_순위"] = _nullable(pr, pr == 0)
+        out[f"최근{n}일_비교연도수"] = p_cnt[keys, yi].astype(np.int32)
+
+    return pd.DataFrame(out)
+
+
+# ────────────── 프로세스 풀 ──────────────
+def _worker(path: str, sid: int, rows: np.ndarray, years, n: int,
+            baseline) -> pd.DataFrame:
+    # 각 프로세스는 사이드카를 mmap으로 열어 원본 CSV를 다시 파싱하지 않는다
+    ds = load(path).for_station(sid)
+    return batch_report(ds, years=years, n=n, baseline=baseline, rows=rows)
+
+
+def parallel_report(path: str, start=None, end=None, years: tuple[int, int] | None = None,
+                    n: int = 14, baseline: tuple[int, int] = WMO_BASELINE,
+                    workers: int | None = None, chunk: int = 5000) -> pd.DataFrame:
+    """파일 경로 기준으로 (지점, chunk 행) 단위로 나눠 병렬 계산"""
+    ds = load(path)
+    tasks = []
+    for sid in ds.station_ids:
+        rows = _rows_between(ds.for_station(sid), start, end)
+        tasks += [(sid, rows[i:i + chunk]) for i in range(0, len(rows), chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return batch_report(ds, start, end, years, n, baseline)
+
+    for sid in ds.station_ids:
+        # 사이드카에 먼저 저장해 두면 작업 프로세스는 읽기만 한다
+        ds.for_station(sid).normals(baseline)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        futures = [pool.submit(_worker, path, sid, rows, years, n, baseline)
+                   for sid, rows in tasks]
+        return pd.concat([f.result() for f in futures], ignore_index=True)
+
+
+def write_columnar(table: pd.DataFrame, out: str) -> None:
+    """확장자에 따라 Parquet(.parquet) 또는 Feather(.feather)로 저장"""
+    if out.endswith(".feather"):
+        table.to_feather(out)
+    else:
+        table.to_parquet(out, index=False)
@@ -0,0 +1,302 @@
+# ────────────────────────────────────────────────────────────────
+#  바이너리 사이드카 캐시
+#  ▸ ta_*.csv 옆에 .ta_*.csv.cache/ 폴더를 두고, 내용은 버전 폴더에 저장
+#     CURRENT        지금 쓰는 버전 폴더 이름 (한 줄)
+#     v-<해시>-<시각>/
+#       day.npy      int32   1970-01-01 기준 일수
+#       station.npy  int16   지점 번호
+#       values.npy   float32 (기온 열 수, 행 수)
+#       dates.npy    datetime64[s] DataFrame 날짜 열
+#       meta.json    원본 크기·수정시각·SHA-1, 열 이름,
+#                    다음 내려받기 파일과 비교할 변하지 않는 앞부분(stable)
+#       extra/*.npy  평년값·정렬 순서·날짜 색인·연도별 집계 등 파생 표
+#  ▸ 행은 (지점, 날짜) 순으로 정렬해 저장 → 지점별로 연속 구간
+#  ▸ 모든 배열은 읽기 전용 mmap으로 열어 DataFrame까지 복사 없이 참조
+#     → 같은 호스트의 여러 Streamlit 프로세스가 같은 페이지 캐시를 공유
+#  ▸ 새 버전은 새 폴더에 다 쓴 뒤 CURRENT만 원자적으로 교체
+#     (열려 있는 옛 버전 mmap은 그대로 유효, 직전 버전 하나는 남겨 둔다)
+#  ▸ 크기·수정시각이 바뀌면 해시를 비교해 내용이 다를 때만 다시 만든다
+# ────────────────────────────────────────────────────────────────
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 3
+DATE_COL = "날짜"
+STATION_COL = "지점"
+
+_ARRAYS = ("day", "station", "values", "dates")
+_POINTER = "CURRENT"
+
+
+class Store(NamedTuple):
+    path: str       # 버전 폴더
+    arrays: dict    # mmap 배열 + names
+    meta: dict
+
+
+# ────────────── 1. DataFrame ↔ 배열 ──────────────
+def to_arrays(df: pd.DataFrame) -> dict:
+    """파싱된 DataFrame을 압축 배열(day·station·values)과 열 이름으로 변환
+
+    (지점, 날짜) 순이 아니면 정렬해 지점마다 연속 구간이 되게 한다.
+    """
+    names = [c for c in df.columns if c not in (DATE_COL, STATION_COL)]
+    day = (df[DATE_COL].to_numpy().astype("datetime64[D]")
+           .astype(np.int64).astype(np.int32))
+    if STATION_COL in df.columns:
+        station = df[STATION_COL].to_numpy().astype(np.int16)
+    else:
+        station = np.zeros(len(df), np.int16)
+    values = np.empty((len(names), len(df)), np.float32)
+    for i, col in enumerate(names):
+        values[i] = pd.to_numeric(df[col], errors="coerce").to_numpy(np.float32)
+    return sort_arrays({"day": day, "station": station, "values": values, "names": names})
+
+
+def sort_arrays(arrays: dict) -> dict:
+    """(지점, 날짜) 순이 아니면 정렬한 새 dict, 이미 정렬돼 있으면 그대로"""
+    key = row_keys(arrays["day"], arrays["station"])
+    if len(key) <= 1 or (np.diff(key) >= 0).all():
+        return arrays
+    order = np.argsort(key, kind="stable")
+    return {"day": arrays["day"][order], "station": arrays["station"][order],
+            "values": arrays["values"][:, order], "names": arrays["names"]}
+
+
+def row_keys(day: np.ndarray, station: np.ndarray) -> np.ndarray:
+    """(지점, 날짜) 순서를 그대로 따르는 int64 행 키"""
+    station = np.asarray(station).astype(np.int64)
+    return (station << 32) + (np.asarray(day).astype(np.int64) + 2 ** 31)
+
+
+def day_dates(day: np.ndarray) -> np.ndarray:
+    """일수 배열 → DataFrame 날짜 열 (datetime64[s])"""
+    return np.asarray(day).astype("datetime64[D]").astype("datetime64[s]")
+
+
+def to_frame(arrays: dict) -> pd.DataFrame:
+    """압축 배열로 DataFrame 구성 (모든 열이 배열을 복사 없이 참조)"""
+    day, station, values = arrays["day"], arrays["station"], arrays["values"]
+    dates = arrays.get("dates")
+    if dates is None:
+        dates = day_dates(day)
+    for arr in (day, station, values, dates):
+        if arr.flags.writeable:
+            arr.flags.writeable = False
+    cols = {DATE_COL: dates, STATION_COL: station}
+    cols.update(zip(arrays["names"], values))
+    return pd.DataFrame({k: pd.Series(v, copy=False) for k, v in cols.items()}, copy=False)
+
+
+def display_frame(frame: pd.DataFrame, decimals: int = 1) -> pd.DataFrame:
+    """표시용 사본 – float32 값 열을 float64로 바꿔 반올림 (20.700001 → 20.7)"""
+    floats = frame.select_dtypes("floating").columns
+    return frame.astype({c: np.float64 for c in floats}).round({c: decimals for c in floats})
+
+
+# ────────────── 2. 사이드카 경로·검증 ──────────────
+def sidecar_dir(csv_path: str) -> str:
+    folder, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, f".{name}.cache")
+
+
+def file_sha1(path: str, block: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(block):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def current(folder: str) -> str | None:
+    """CURRENT가 가리키는 버전 폴더 경로 (없으면 None)"""
+    try:
+        with open(os.path.join(folder, _POINTER), encoding="utf-8") as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    if not name or os.sep in name or name.startswith("."):
+        return None
+    return os.path.join(folder, name)
+
+
+def _read_meta(store: str) -> dict | None:
+    try:
+        with open(os.path.join(store, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == FORMAT_VERSION else None
+
+
+def _write_meta(store: str, meta: dict) -> None:
+    tmp = os.path.join(store, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(store, "meta.json"))
+
+
+def _open_store(store: str) -> Store | None:
+    meta = _read_meta(store)
+    if meta is None:
+        return None
+    try:
+        arrays = {name: np.load(os.path.join(store, f"{name}.npy"), mmap_mode="r")
+                  for name in _ARRAYS}
+    except (OSError, ValueError):
+        return None
+    if len(arrays["day"]) != meta["rows"]:
+        return None
+    arrays["names"] = meta["names"]
+    return Store(store, arrays, meta)
+
+
+def load_store(folder: str) -> Store | None:
+    """원본 CSV 확인 없이 사이드카 폴더의 현재 버전 (mmap 배열, meta)"""
+    for _ in range(2):
+        store = current(folder)
+        if store is None:
+            return None
+        opened = _open_store(store)
+        # 여는 사이에 다른 프로세스가 교체·정리했으면 새 CURRENT로 한 번 더
+        if opened is not None or current(folder) == store:
+            return opened
+    return None
+
+
+def load(csv_path: str) -> Store | None:
+    """유효한 사이드카가 있으면 현재 버전 Store 반환, 없거나 낡았으면 None"""
+    store = load_store(sidecar_dir(csv_path))
+    if store is None:
+        return None
+
+    meta = store.meta
+    st_ = os.stat(csv_path)
+    if (meta["size"], meta["mtime_ns"]) != (st_.st_size, st_.st_mtime_ns):
+        # 수정시각만 바뀐 경우(복사·체크아웃 등)는 해시로 확인 후 재사용
+        if meta["size"] != st_.st_size or meta["sha1"] != file_sha1(csv_path):
+            return None
+        meta["mtime_ns"] = st_.st_mtime_ns
+        try:
+            _write_meta(store.path, meta)
+        except OSError:
+            pass
+    return store
+
+
+def _swap(folder: str, name: str) -> None:
+    """CURRENT를 name으로 원자적 교체"""
+    fd, tmp = tempfile.mkstemp(prefix=f".{_POINTER}.", dir=folder)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(name + "\n")
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, os.path.join(folder, _POINTER))
+
+
+def _prune(folder: str, keep: set[str]) -> None:
+    """keep(현재·직전 버전)과 쓰는 중인 임시 폴더를 뺀 나머지 정리
+
+    이미 mmap으로 연 프로세스는 파일이 지워져도 계속 읽을 수 있다 (POSIX).
+    """
+    for entry in os.listdir(folder):
+        path = os.path.join(folder, entry)
+        if entry in keep or entry == _POINTER or entry.startswith("."):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def save(csv_path: str, arrays: dict, stable: dict | None = None,
+         extras: dict[str, np.ndarray] | None = None, sha1: str | None = None) -> str | None:
+    """새 버전 폴더에 쓴 뒤 CURRENT 교체. 새 버전 폴더 경로 (쓰기 권한이 없으면 None)
+
+    stable : 다음 파일과 비교할 앞부분 정보 (climate.ingest)
+    extras : 함께 기록할 파생 배열 (이전 사이드카에서 갱신해 넘겨받은 것)
+    """
+    folder = sidecar_dir(csv_path)
+    st_ = os.stat(csv_path)
+    sha1 = sha1 or file_sha1(csv_path)
+    meta = {"version": FORMAT_VERSION, "size": st_.st_size,
+            "mtime_ns": st_.st_mtime_ns, "sha1": sha1,
+            "rows": int(len(arrays["day"])), "names": list(arrays["names"]),
+            "stable": stable}
+    name = f"v-{sha1[:12]}-{time.time_ns()}"
+    tmp = None
+    try:
+        os.makedirs(folder, exist_ok=True)
+        previous = current(folder)
+        # 쓰는 동안은 "."으로 시작하는 이름 → 다른 프로세스의 정리 대상에서 제외
+        tmp = tempfile.mkdtemp(prefix=f".{name}.", dir=folder)
+        os.chmod(tmp, 0o755)
+        data = dict(arrays)
+        data["dates"] = arrays.get("dates")
+        if data["dates"] is None:
+            data["dates"] = day_dates(arrays["day"])
+        for key in _ARRAYS:
+            np.save(os.path.join(tmp, f"{key}.npy"), np.ascontiguousarray(data[key]))
+        if extras:
+            os.makedirs(os.path.join(tmp, "extra"))
+            for key, arr in extras.items():
+                np.save(os.path.join(tmp, "extra", f"{key}.npy"), np.ascontiguousarray(arr))
+        _write_meta(tmp, meta)
+        os.replace(tmp, os.path.join(folder, name))
+        tmp = None
+        _swap(folder, name)
+    except OSError:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return None
+    keep = {name} | ({os.path.basename(previous)} if previous else set())
+    _prune(folder, keep)
+    return os.path.join(folder, name)
+
+
+# ────────────── 3. 파생 표 ──────────────
+def list_extra(store: str) -> list[str]:
+    """버전 폴더에 저장된 파생 배열 이름들"""
+    try:
+        files = os.listdir(os.path.join(store, "extra"))
+    except OSError:
+        return []
+    return sorted(f[:-4] for f in files if f.endswith(".npy") and not f.startswith("."))
+
+
+def load_extra(store: str, name: str) -> np.ndarray | None:
+    """버전 폴더의 파생 배열 (읽기 전용 mmap, 없으면 None)"""
+    try:
+        return np.load(os.path.join(store, "extra", f"{name}.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+
+def save_extra(store: str, name: str, arr: np.ndarray) -> bool:
+    """파생 배열을 임시 파일에 쓴 뒤 교체. 실패하면 False
+
+    정리된 옛 버전 폴더에는 다시 만들지 않는다.
+    """
+    if not os.path.isdir(store):
+        return False
+    extra = os.path.join(store, "extra")
+    try:
+        os.makedirs(extra, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".", suffix=".npy", dir=extra)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.ascontiguousarray(arr))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, os.path.join(extra, f"{name}.npy"))
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,17 @@
+# ────────────────────────────────────────────────────────────────
+#  기상청 ASOS 지점 번호 → 이름 (자주 쓰는 지점만)
+# ────────────────────────────────────────────────────────────────
+STATION_NAMES = {
+    90: "속초", 95: "철원", 98: "동두천", 100: "대관령", 101: "춘천",
+    105: "강릉", 108: "서울", 112: "인천", 114: "원주", 119: "수원",
+    127: "충주", 131: "청주", 133: "대전", 136: "안동", 138: "포항",
+    143: "대구", 146: "전주", 152: "울산", 156: "광주", 159: "부산",
+    165: "목포", 168: "여수", 184: "제주", 185: "고산", 189: "서귀포",
+    192: "진주",
+}
+
+
+def station_label(sid: int) -> str:
+    """지점 번호 → '서울(108)' 형태, 모르는 번호는 '지점 123'"""
+    name = STATION_NAMES.get(int(sid))
+    return f"{name}({sid})" if name else f"지점 {sid}"
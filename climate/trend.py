@@ -0,0 +1,172 @@
+# ────────────────────────────────────────────────────────────────
+#  같은 MM-DD 장기 추세 지도 (366일 × 기온 열)
+#  ▸ 키·연도 격자마다 최소제곱 통계량(n, Σx, Σy, Σx², Σxy, Σy²)을 만들고
+#    연도 방향 누적합을 한 번 계산
+#     → 어떤 연도 범위든 366일 × 열 전체의 기울기·절편·표준오차·p값을
+#       누적합 차이와 닫힌 식으로 한 번에 계산 (반복 적합 없음)
+#  ▸ x = 연도 (기울기 단위 ℃/년), 결측은 제외
+#  ▸ p값은 기울기 = 0 양측 t검정 (자유도 n-2)
+#  ▸ 전체 연도 표는 고정 보관, 다른 연도 범위는 최근 limit개만 보관
+# ────────────────────────────────────────────────────────────────
+import math
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import N_KEYS, key_label
+
+# Student t 분포 p값 계산용 불완전 베타 함수 연분수 반복 횟수
+_BETACF_ITER = 200
+
+
+class TrendTable(NamedTuple):
+    names: list[str]
+    slope: np.ndarray        # (열, 366) ℃/년
+    intercept: np.ndarray    # (열, 366) 연도 0 기준 절편 → 값 = 절편 + 기울기·연도
+    stderr: np.ndarray       # (열, 366) 기울기 표준오차
+    pvalue: np.ndarray       # (열, 366)
+    n: np.ndarray            # (열, 366) 사용한 연도 수
+
+    def frame(self, col: str) -> pd.DataFrame:
+        """한 열의 366일 추세 표 (기울기는 ℃/10년)"""
+        i = self.names.index(col)
+        return pd.DataFrame({"MM-DD": [key_label(k) for k in range(N_KEYS)],
+                             "기울기(℃/10년)": self.slope[i] * 10,
+                             "표준오차": self.stderr[i] * 10,
+                             "p값": self.pvalue[i],
+                             "표본수": self.n[i]},
+                            index=pd.RangeIndex(N_KEYS, name="키"))
+
+
+# ────────────── 1. t 분포 ──────────────
+def _betacf(a, b, x):
+    """불완전 베타 함수 연분수 (Numerical Recipes betacf, 배열 연산)"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = np.ones_like(x)
+    d = 1 - qab * x / qap
+    d = 1 / np.where(np.abs(d) < tiny, tiny, d)
+    h = d
+    for m in range(1, _BETACF_ITER + 1):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1 + aa * d
+            d = 1 / np.where(np.abs(d) < tiny, tiny, d)
+            c = 1 + aa / c
+            c = np.where(np.abs(c) < tiny, tiny, c)
+            h = h * d * c
+    return h
+
+
+def _betainc(a, b, x):
+    """정규화 불완전 베타 함수 I_x(a, b)"""
+    lg = np.frompyfunc(math.lgamma, 1, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        front = np.exp((lg(a + b) - lg(a) - lg(b)).astype(np.float64)
+                       + a * np.log(x) + b * np.log1p(-x))
+        direct = front * _betacf(a, b, x) / a
+        flipped = 1 - front * _betacf(b, a, 1 - x) / b
+    out = np.where(x < (a + 1) / (a + b + 2), direct, flipped)
+    return np.where(x <= 0, 0.0, np.where(x >= 1, 1.0, out))
+
+
+def t_pvalue(t: np.ndarray, dof: np.ndarray) -> np.ndarray:
+    """양측 t검정 p값 = I_{dof/(dof+t²)}(dof/2, 1/2)"""
+    t, dof = np.broadcast_arrays(np.asarray(t, np.float64), np.asarray(dof, np.float64))
+    ok = (dof > 0) & np.isfinite(t)
+    out = np.full(t.shape, np.nan)
+    if ok.any():
+        d, tt = dof[ok], t[ok]
+        out[ok] = _betainc(d / 2, np.full_like(d, 0.5), d / (d + tt * tt))
+    return out
+
+
+# ────────────── 2. 엔진 ──────────────
+def prefix_sums(values: np.ndarray, key: np.ndarray, year: np.ndarray) -> np.ndarray:
+    """(통계량 6, 열, 366, 연도 수 + 1) 연도 방향 누적합 – 연도는 year.min()부터"""
+    year = np.asarray(year, np.int64)
+    year0 = int(year.min()) if len(year) else 0
+    n_years = int(year.max()) - year0 + 1 if len(year) else 0
+    cell = np.asarray(key, np.int64) * n_years + (year - year0)
+    size = N_KEYS * n_years
+    x = (year - _ref(year0, n_years)).astype(np.float64)
+
+    stats = np.zeros((6, len(values), N_KEYS, n_years + 1))
+    for i in range(len(values)):
+        y = np.asarray(values[i], np.float64)
+        ok = ~np.isnan(y)
+        c, xx, yy = cell[ok], x[ok], y[ok]
+        for s, w in enumerate((None, xx, yy, xx * xx, xx * yy, yy * yy)):
+            grid = np.bincount(c, w, size).reshape(N_KEYS, n_years)
+            stats[s, i, :, 1:] = np.cumsum(grid, axis=1)
+    return stats
+
+
+def _ref(year0: int, n_years: int) -> int:
+    """연도 중앙을 원점으로 – 자릿수 손실 방지"""
+    return year0 + n_years // 2
+
+
+class TrendEngine:
+    """키·연도 격자 누적합으로 연도 범위별 추세 표를 계산
+
+    csum(prefix_sums 결과)을 넘기면 (사이드카 mmap 등) 그대로 쓰고 values는 보지 않는다.
+    """
+
+    def __init__(self, values: np.ndarray | None, key: np.ndarray, year: np.ndarray,
+                 names: list[str], csum: np.ndarray | None = None, limit: int = 8):
+        self.names = list(names)
+        self.year0 = int(year.min()) if len(year) else 0
+        if csum is None:
+            csum = prefix_sums(values, key, year)
+        self.ref = _ref(self.year0, csum.shape[-1] - 1)
+        self._csum = csum
+        self._limit = limit
+        self._full: TrendTable | None = None
+        self._tables: "OrderedDict[tuple, TrendTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def table(self, years: tuple[int, int] | None = None) -> TrendTable:
+        """연도 범위(양 끝 포함, None이면 전체)의 366일 × 열 추세 표"""
+        n_years = self._csum.shape[-1] - 1
+        lo, hi = (self.year0, self.year0 + n_years - 1) if years is None else years
+        a = min(max(int(lo) - self.year0, 0), n_years)
+        b = min(max(int(hi) - self.year0 + 1, a), n_years)
+        ck = (a, b)
+        full = ck == (0, n_years)
+        if full and self._full is not None:
+            return self._full
+        with self._lock:
+            cached = self._tables.get(ck)
+            if cached is not None:
+                self._tables.move_to_end(ck)
+                return cached
+
+        n, sx, sy, sxx, sxy, syy = self._csum[:, :, :, b] - self._csum[:, :, :, a]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vxx = sxx - sx * sx / n
+            vxy = sxy - sx * sy / n
+            vyy = syy - sy * sy / n
+            slope = vxy / vxx
+            icpt = sy / n - slope * sx / n - slope * self.ref
+            sse = np.maximum(vyy - slope * vxy, 0)
+            stderr = np.sqrt(sse / (n - 2) / vxx)
+            t = slope / stderr
+        valid = (n >= 3) & (vxx > 0)
+        slope, icpt, stderr = (np.where(valid, v, np.nan) for v in (slope, icpt, stderr))
+        pvalue = np.where(valid, t_pvalue(np.where(valid, t, 0), n - 2), np.nan)
+        pvalue = np.where(valid & (stderr == 0), 0.0, pvalue)
+        table = TrendTable(self.names, slope, icpt, stderr, pvalue, n.astype(np.int32))
+        if full:
+            self._full = table
+            return table
+        with self._lock:
+            self._tables[ck] = table
+            self._tables.move_to_end(ck)
+            while len(self._tables) > self._limit:
+                self._tables.popitem(last=False)
+        return table
@@ -0,0 +1,150 @@
+# ────────────────────────────────────────────────────────────────
+#  최근 N일 이동 평균 엔진
+#  ▸ 첫날~마지막날을 빈틈없는 달력으로 펼친 뒤(결측일은 NaN)
+#     열별 누적합·누적 개수를 한 번 계산
+#  ▸ "e일 직전 N일 평균" = (누적합[e] − 누적합[e−N]) / (개수[e] − 개수[e−N])
+#     → 끝 날짜가 몇 개든, N이 얼마든 배열 뺄셈 몇 번으로 끝난다
+#  ▸ 역대 동기간 = 각 연도의 같은 MM-DD를 끝 날짜로 하는 직전 N일
+#     (평년의 2월 29일은 3월 1일로 대응)
+# ────────────────────────────────────────────────────────────────
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import KEY_FEB29, N_KEYS, split_days
+
+# 연도별 동기간 평균 표의 열 이름 (원본 열 → 결과 열)
+PERIOD_NAMES = {"최고기온(℃)": "최고평균", "평균기온(℃)": "평균평균",
+                "최저기온(℃)": "최저평균"}
+
+
+def _year_start(years: np.ndarray) -> np.ndarray:
+    """연도 배열 → 그해 1월 1일의 1970 기준 일수"""
+    return (years - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+
+
+def _is_leap(years: np.ndarray) -> np.ndarray:
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def prefix_sums(day: np.ndarray, values: np.ndarray) -> dict[str, np.ndarray]:
+    """달력 펼침 값과 누적합·누적 개수 (WindowEngine 재료, 사이드카 저장용)"""
+    day0 = int(day.min()) if len(day) else 0
+    length = int(day.max()) - day0 + 1 if len(day) else 0
+    dense = np.full((values.shape[0], length), np.nan, np.float32)
+    dense[:, day.astype(np.int64) - day0] = values
+
+    ok = ~np.isnan(dense)
+    csum = np.zeros((values.shape[0], length + 1))
+    ccnt = np.zeros((values.shape[0], length + 1), np.int32)
+    np.cumsum(np.where(ok, dense, 0), axis=1, out=csum[:, 1:])
+    np.cumsum(ok, axis=1, out=ccnt[:, 1:])
+    return {"dense": dense, "csum": csum, "ccnt": ccnt}
+
+
+class WindowEngine:
+    """열별 누적합으로 임의의 (끝 날짜, N) 구간 평균을 계산
+
+    sums(prefix_sums 결과)를 넘기면 (사이드카 mmap 등) 그대로 쓰고 values는 보지 않는다.
+    """
+
+    def __init__(self, day: np.ndarray, values: np.ndarray | None, names: list[str],
+                 sums: dict[str, np.ndarray] | None = None):
+        self.names = list(names)
+        self.day0 = int(day.min()) if len(day) else 0
+        if sums is None:
+            sums = prefix_sums(day, values)
+        self.dense = sums["dense"]               # (열, 달력일) 결측은 NaN
+        self.csum = sums["csum"]
+        self.ccnt = sums["ccnt"]
+        self._key_means = None
+
+    @property
+    def length(self) -> int:
+        return self.dense.shape[1]
+
+    def trailing(self, end_days, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """끝 날짜(미포함) 직전 n일의 (평균, 자료 일수), 모양 (열, 끝 날짜 수)"""
+        e = np.clip(np.asarray(end_days, np.int64) - self.day0, 0, self.length)
+        s = np.clip(e - n, 0, self.length)
+        cnt = self.ccnt[:, e] - self.ccnt[:, s]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (self.csum[:, e] - self.csum[:, s]) / cnt
+        return np.where(cnt > 0, mean, np.nan), cnt
+
+    def table(self, ns) -> np.ndarray:
+        """모든 끝 날짜 × 모든 N의 평균표, 모양 (len(ns), 열, 달력일 + 1)"""
+        ends = np.arange(self.length + 1) + self.day0
+        return np.stack([self.trailing(ends, n)[0] for n in ns])
+
+    def daily(self, start_day: int, end_day: int) -> np.ndarray:
+        """[start_day, end_day) 달력일 값 (열, end_day − start_day), 결측일·자료 범위 밖은 NaN"""
+        n = max(int(end_day) - int(start_day), 0)
+        out = np.full((self.dense.shape[0], n), np.nan, self.dense.dtype)
+        s = int(np.clip(start_day - self.day0, 0, self.length))
+        e = int(np.clip(end_day - self.day0, 0, self.length))
+        if e > s:
+            at = s + self.day0 - int(start_day)
+            out[:, at:at + e - s] = self.dense[:, s:e]
+        return out
+
+    def period_ends(self, key: int, years: np.ndarray) -> np.ndarray:
+        """각 연도에서 MM-DD 키에 해당하는 날(1970 기준 일수)"""
+        shift = (~_is_leap(years)) & (key > KEY_FEB29)
+        return _year_start(years) + key - shift
+
+    def same_period(self, key: int, n: int, years=None,
+                    min_days: int = 1) -> pd.DataFrame:
+        """연도별 '같은 MM-DD 직전 n일' 평균표 (index = 연도)"""
+        years = self.all_years() if years is None else np.asarray(years, np.int64)
+        mean, cnt = self.trailing(self.period_ends(key, years), n)
+        out = pd.DataFrame({PERIOD_NAMES.get(c, c): mean[i]
+                            for i, c in enumerate(self.names)},
+                           index=pd.Index(years, name="연도"))
+        out["일수"] = cnt.min(axis=0)
+        return out[out["일수"] >= min_days]
+
+    def all_years(self) -> np.ndarray:
+        """자료가 걸친 모든 연도"""
+        first = np.datetime64(self.day0, "D").astype("datetime64[Y]").astype(int)
+        last = (np.datetime64(self.day0 + self.length - 1, "D")
+                .astype("datetime64[Y]").astype(int))
+        return np.arange(first, last + 1) + 1970
+
+    def period_ranks(self, n: int, col: str, years=None) -> tuple[np.ndarray, np.ndarray]:
+        """모든 (MM-DD 키, 연도)의 동기간 평균 순위·비교 연도 수, 모양 (366, 연도 수)
+
+        같은 키의 연도들 사이에서 높을수록 1위, 동점은 같은 순위, 결측은 순위 0.
+        """
+        years = self.all_years() if years is None else np.asarray(years, np.int64)
+        i = self.names.index(col)
+        ends = np.stack([self.period_ends(k, years) for k in range(N_KEYS)])
+        mean = self.trailing(ends.ravel(), n)[0][i].reshape(ends.shape)
+
+        score = np.where(np.isnan(mean), np.inf, -mean)
+        srt = np.sort(score, axis=1)
+        rank = np.stack([np.searchsorted(srt[k], score[k], "left")
+                         for k in range(N_KEYS)]) + 1
+        valid = ~np.isnan(mean)
+        rank[~valid] = 0
+        return rank, np.broadcast_to(valid.sum(axis=1, keepdims=True), rank.shape)
+
+    def key_means(self) -> np.ndarray:
+        """MM-DD 키별 전체 연도 평균 (열, 366), 처음 호출 때 계산해 보관"""
+        if self._key_means is None:
+            _, keys = split_days(np.arange(self.length) + self.day0)
+            out = np.full((len(self.names), N_KEYS), np.nan)
+            for i, row in enumerate(self.dense):
+                ok = ~np.isnan(row)
+                total = np.bincount(keys[ok], row[ok], minlength=N_KEYS)
+                cnt = np.bincount(keys[ok], minlength=N_KEYS)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    out[i] = np.where(cnt > 0, total / cnt, np.nan)
+            self._key_means = out
+        return self._key_means
+
+
+def rank_in_period(table: pd.DataFrame, col: str, value: float) -> tuple[int, float, int]:
+    """동기간 평균표에서 value의 (순위, 상위 백분율, 비교 연도 수), 높을수록 1위"""
+    s = table[col].dropna()
+    rank = int((s > value).sum()) + 1
+    return rank, 100 * (rank - 1) / max(len(s), 1), len(s)
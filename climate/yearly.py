@@ -0,0 +1,83 @@
+# ────────────────────────────────────────────────────────────────
+#  연도별 집계 (합·개수)
+#  ▸ (지점, 연도)마다 열별 결측 제외 개수와 합을 한 표로 보관
+#     열 = [지점, 연도, 개수×열 수, 합×열 수], 행 = (지점, 연도) 순
+#  ▸ 모든 열이 결측뿐인 연도는 표에 넣지 않는다
+#  ▸ 평균은 합/개수라 행을 더하고 빼는 것만으로 갱신 가능
+#     → 새 내려받기 파일은 바뀐 행만 반영 (climate.ingest)
+#  ▸ 월별 평균은 DayIndex.month(키 → 월 표 조회)에 bincount (month_means)
+# ────────────────────────────────────────────────────────────────
+import numpy as np
+import pandas as pd
+
+from climate.dayindex import split_days
+
+
+def sums(day: np.ndarray, station: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """행들의 (지점, 연도)별 개수·합 표"""
+    k = values.shape[0]
+    if len(day) == 0:
+        return np.empty((0, 2 + 2 * k))
+    year, _ = split_days(day)
+    gid = station.astype(np.int64) * 10000 + year
+    uniq, inv = np.unique(gid, return_inverse=True)
+    out = np.zeros((len(uniq), 2 + 2 * k))
+    out[:, 0], out[:, 1] = uniq // 10000, uniq % 10000
+    for i in range(k):
+        v = np.asarray(values[i], np.float64)
+        ok = ~np.isnan(v)
+        out[:, 2 + i] = np.bincount(inv, ok, len(uniq))
+        out[:, 2 + k + i] = np.bincount(inv, np.where(ok, v, 0), len(uniq))
+    return _nonempty(out)
+
+
+def _nonempty(table: np.ndarray) -> np.ndarray:
+    """모든 열이 결측뿐인 (지점, 연도) 행 제거"""
+    k = (table.shape[1] - 2) // 2
+    return table[table[:, 2:2 + k].sum(axis=1) > 0]
+
+
+def combine(base: np.ndarray, add: np.ndarray | None = None,
+            sub: np.ndarray | None = None) -> np.ndarray:
+    """base + add - sub (같은 (지점, 연도) 행끼리), 개수가 0이 된 행은 제거"""
+    parts = [base] + [t for t in (add,) if t is not None]
+    if sub is not None and len(sub):
+        neg = sub.copy()
+        neg[:, 2:] *= -1
+        parts.append(neg)
+    table = np.concatenate(parts)
+    gid = table[:, 0].astype(np.int64) * 10000 + table[:, 1].astype(np.int64)
+    uniq, inv = np.unique(gid, return_inverse=True)
+    out = np.zeros((len(uniq), table.shape[1]))
+    out[:, 0], out[:, 1] = uniq // 10000, uniq % 10000
+    np.add.at(out[:, 2:], inv, table[:, 2:])
+    return _nonempty(out)
+
+
+def to_frame(table: np.ndarray, names: list[str], station: int | None = None) -> pd.DataFrame:
+    """집계 표 → 연도별 평균 DataFrame (index=연도, 열별 평균과 '<열> 일수')"""
+    if station is not None:
+        table = table[table[:, 0] == station]
+    k = len(names)
+    cnt, total = table[:, 2:2 + k], table[:, 2 + k:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(cnt > 0, total / cnt, np.nan)
+    out = pd.DataFrame(mean, columns=names,
+                       index=pd.Index(table[:, 1].astype(int), name="연도"))
+    for i, name in enumerate(names):
+        out[f"{name} 일수"] = cnt[:, i].astype(int)
+    return out
+
+
+def month_means(month: np.ndarray, values: np.ndarray, names: list[str],
+                rows: np.ndarray | None = None) -> pd.DataFrame:
+    """월별 평균 (index=월 1~12) – rows(불리언)가 있으면 그 행만, 결측 제외"""
+    out = {}
+    for i, name in enumerate(names):
+        v = np.asarray(values[i])
+        ok = ~np.isnan(v) if rows is None else rows & ~np.isnan(v)
+        cnt = np.bincount(month[ok], minlength=13)[1:]
+        total = np.bincount(month[ok], v[ok].astype(np.float64), minlength=13)[1:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[name] = np.where(cnt > 0, total / cnt, np.nan)
+    return pd.DataFrame(out, index=pd.RangeIndex(1, 13, name="월"))
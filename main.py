@@ -5,42 +5,41 @@
 # ────────────────────────────────────────────────────────────────
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime
-import os
 import plotly.express as px
+import plotly.graph_objects as go
+
+from climate import charts, find_default_csv, load as load_dataset, profiling
+from climate.dayindex import date_key, day_number, split_days
+from climate.sidecar import display_frame
+from climate.stations import station_label
+from climate.window import rank_in_period
+
+# 재실행 구간별 시간·메모리 (사이드바 맨 아래에 표시)
+prof = profiling.Profiler("main")
+
+# 위젯 → 다시 실행할 구간
+#  ▸ 파일·지점·날짜·연도 범위: 모든 구간이 의존 → 페이지 전체 재실행
+#  ▸ 아래 위젯은 st.fragment 안에 두어 그 구간만 다시 계산·표시
+FRAGMENTS = {
+    "day_range": "10. 최근 N일 vs 역대 동일 기간",     # 10, 10-A
+}
 
 # ────────────── 1. 페이지 설정 ──────────────
+prof.mark("1. 페이지 설정")
 st.set_page_config(page_title="지난주는 얼마나 더웠을까요",
                    page_icon="📈", layout="centered")
 st.title("📈 지난주는 얼마나 더웠을까요?")
 
-# ────────────── 2. CSV 로드 함수 ──────────────
-def load_temperature_csv(src, skiprows: int = 7) -> pd.DataFrame:
-    """CP949 → UTF-8-SIG 순으로 시도해 CSV를 읽어 DataFrame 반환"""
-    for enc in ("cp949", "utf-8-sig"):
-        try:
-            df = pd.read_csv(src, encoding=enc, skiprows=skiprows)
-            break
-        except UnicodeDecodeError:
-            continue
-    else:
-        raise ValueError("지원되지 않는 인코딩입니다.")
-
-    if "날짜" not in df.columns:
-        raise ValueError("'날짜' 열이 없습니다.")
-
-    df["날짜"] = pd.to_datetime(df["날짜"].astype(str).str.strip(),
-                               format="%Y-%m-%d")
-    return df
-
-# ────────────── 3. 파일 업로드 / 기본 파일 ──────────────
+# ────────────── 2. 파일 업로드 / 기본 파일 ──────────────
+prof.mark("2. 파일 업로드 / 기본 파일")
 uploaded_file = st.file_uploader(
     "CSV 파일을 업로드하세요 (CP949 또는 UTF-8, 7행 설명 포함)", type="csv"
 )
 
 if uploaded_file is None:
-    default = next((f for f in os.listdir(".")
-                    if f.startswith("ta") and f.endswith(".csv")), None)
+    default = find_default_csv()
     if default:
         uploaded_file = default
         st.info(f"기본 파일 **{default}** 을(를) 사용합니다.")
@@ -48,14 +47,28 @@ if uploaded_file is None:
         st.warning("CSV를 업로드하거나 'ta*.csv' 파일을 폴더에 두세요.")
         st.stop()
 
+# ────────────── 3. CSV 로드 (프로세스 공용 캐시) ──────────────
+prof.mark("3. CSV 로드")
+# 처음 읽는 파일만 블록 단위로 파싱하며 진행률 표시 (캐시에 있으면 바로 반환)
+load_bar = st.empty()
 try:
-    df = load_temperature_csv(uploaded_file)
+    ds = load_dataset(uploaded_file, progress=lambda done, total: load_bar.progress(
+        done / total, text=f"CSV 읽는 중… {done / 2**20:.0f}/{total / 2**20:.0f} MB"))
 except Exception as e:
+    load_bar.empty()
     st.error(f"CSV 로드 오류: {e}")
     st.stop()
+load_bar.empty()
+
+# 여러 지점이 든 파일이면 지점 선택 (지점별 구간만 참조, 복사 없음)
+if len(ds.station_ids) > 1:
+    ds = ds.for_station(st.selectbox("지점", ds.station_ids,
+                                     format_func=station_label))
+df = ds.frame
 
 # ────────────── 4. 날짜 선택 위젯 ──────────────
-min_d, max_d = df["날짜"].dt.date.min(), df["날짜"].dt.date.max()
+prof.mark("4. 날짜 선택 위젯")
+min_d, max_d = df["날짜"].min().date(), df["날짜"].max().date()
 yesterday = datetime.date.today() - datetime.timedelta(days=1)
 default_date = yesterday if (min_d <= yesterday <= max_d) else max_d
 
@@ -68,177 +81,230 @@ selected_date = st.date_input(
 selected_dt = pd.to_datetime(selected_date)
 st.subheader(f"🔍 분석 대상 날짜: {selected_date:%Y-%m-%d}")
 
-df_sel = df[df["날짜"] == selected_dt]
-if df_sel.empty:
+sel_row = ds.days.row(selected_date)
+if sel_row is None:
     st.warning("선택한 날짜의 데이터가 없습니다.")
     st.stop()
+df_sel = df.iloc[[sel_row]]
 
 # ────────────── 5. 연도 범위 선택 ──────────────
-ymin, ymax = int(df["날짜"].dt.year.min()), int(df["날짜"].dt.year.max())
+prof.mark("5. 연도 범위 선택")
+ymin, ymax = int(ds.days.year.min()), int(ds.days.year.max())
 sel_years = st.slider("비교할 연도 범위", ymin, ymax, (ymin, ymax))
 
-same_day_df = df[
-    (df["날짜"].dt.strftime("%m-%d") == selected_date.strftime("%m-%d")) &
-    (df["날짜"].dt.year.between(*sel_years))
-]
+sel_key = date_key(selected_date)
+same_day_df = df.iloc[ds.days.rows(sel_key, sel_years)]
+
+# 긴 자료 공백은 순위·평균을 조용히 왜곡하므로 알림 (품질 색인 조회)
+gap_text = ds.quality.gap_text(years=sel_years)
+if gap_text:
+    st.warning(f"⚠️ 비교 기간에 30일 이상 자료 공백이 있습니다: {gap_text}")
 
 # ────────────── 6. 최고·평균·최저 랭킹 계산 ──────────────
+prof.mark("6. 최고·평균·최저 랭킹 계산")
 high_sel = df_sel["최고기온(℃)"].iloc[0]
 avg_sel  = df_sel["평균기온(℃)"].iloc[0]
 low_sel  = df_sel["최저기온(℃)"].iloc[0]
 
-rank_high_df = same_day_df.sort_values("최고기온(℃)", ascending=False).reset_index(drop=True)
-rank_avg_df  = same_day_df.sort_values("평균기온(℃)", ascending=False).reset_index(drop=True)
-rank_low_df  = same_day_df.sort_values("최저기온(℃)").reset_index(drop=True)
+# 같은 MM-DD·연도 범위 안에서의 순위 (정렬은 데이터셋당 한 번, 조회는 이진 탐색)
+r_high = ds.ranks.query("최고기온(℃)", sel_row, sel_years)
+r_avg  = ds.ranks.query("평균기온(℃)", sel_row, sel_years)
+r_low  = ds.ranks.query("최저기온(℃)", sel_row, sel_years)
+# 앞뒤 2일을 합친 5일 창 표본의 상위 % (같은 날짜 순위와 별도 항목으로 표시)
+p_high = ds.ranks.window_pct("최고기온(℃)", sel_row, sel_years)
+p_avg  = ds.ranks.window_pct("평균기온(℃)", sel_row, sel_years)
+p_low  = ds.ranks.window_pct("최저기온(℃)", sel_row, sel_years)
+if r_high.record is None or r_avg.record is None or r_low.record is None:
+    st.warning("선택한 연도 범위에 같은 날짜 데이터가 없습니다.")
+    st.stop()
+
+rec_high = df.iloc[r_high.record]
+rec_avg  = df.iloc[r_avg.record]
+rec_low  = df.iloc[r_low.record]
+
 
-rank_high = rank_high_df[rank_high_df["날짜"] == selected_dt].index[0] + 1
-rank_avg  = rank_avg_df [rank_avg_df ["날짜"] == selected_dt].index[0] + 1
-rank_low  = rank_low_df [rank_low_df ["날짜"] == selected_dt].index[0] + 1
+def rank_label(r) -> str:
+    """같은 날짜 RankResult → '상위 x%(n일 중 k위)' (선택일 결측이면 순위 없음)"""
+    if r.rank is None:
+        return f"순위 없음(결측, {r.n}일 비교)"
+    return f"상위 {r.pct:.1f}%({r.n}일 중 {r.rank}위)"
 
-pct_high = 100 * (rank_high - 1) / len(rank_high_df)
-pct_avg  = 100 * (rank_avg  - 1) / len(rank_avg_df)
-pct_low  = 100 * (rank_low  - 1) / len(rank_low_df)
 
-rec_high = rank_high_df.iloc[0]
-rec_avg  = rank_avg_df.iloc[0]
-rec_low  = rank_low_df.iloc[0]
+def window_label(name: str, p) -> str:
+    """(창 백분율, 표본 수) → '최고 상위 x%(n일)'"""
+    pct, n = p
+    return f"{name} 순위 없음" if pct is None else f"{name} 상위 {pct:.1f}%({n}일)"
 
 # ────────────── 7. 역대 기록 표시 ──────────────
+prof.mark("7. 역대 기록 표시")
 st.markdown("### 🏆 역대 기록")
-st.write(f"📈 **역대 최고**: {rec_high['최고기온(℃)']}℃ "
+st.write(f"📈 **역대 최고**: {rec_high['최고기온(℃)']:.1f}℃ "
          f"({rec_high['날짜'].date()}) → 선택일보다 "
          f"{rec_high['최고기온(℃)'] - high_sel:+.1f}℃")
 
-st.write(f"🌡️ **역대 평균**: {rec_avg['평균기온(℃)']}℃ "
+st.write(f"🌡️ **역대 평균**: {rec_avg['평균기온(℃)']:.1f}℃ "
          f"({rec_avg['날짜'].date()}) → 선택일보다 "
          f"{rec_avg['평균기온(℃)'] - avg_sel:+.1f}℃")
 
-st.write(f"❄️ **역대 최저**: {rec_low['최저기온(℃)']}℃ "
+st.write(f"❄️ **역대 최저**: {rec_low['최저기온(℃)']:.1f}℃ "
          f"({rec_low['날짜'].date()}) → 선택일보다 "
          f"{rec_low['최저기온(℃)'] - low_sel:+.1f}℃")
 
 # ────────────── 8. metric 카드 ──────────────
+prof.mark("8. metric 카드")
 c1, c2, c3 = st.columns(3)
 
 c1.metric(
     "🌡️ 선택일 최고기온",
     f"{high_sel:.1f}℃",
-    f"상위 {pct_high:.1f}%({len(rank_high_df)}일 중 {rank_high}위)"
+    rank_label(r_high)
 )
 
 c2.metric(
     "🌡️ 선택일 평균기온",
     f"{avg_sel:.1f}℃",
-    f"상위 {pct_avg:.1f}%({len(rank_avg_df)}일 중 {rank_avg}위)"
+    rank_label(r_avg)
 )
 
 c3.metric(
     "🌙 선택일 최저기온",
     f"{low_sel:.1f}℃",
-    f"상위 {pct_low:.1f}%({len(rank_low_df)}일 중 {rank_low}위)"
+    rank_label(r_low)
 )
 
+# 평년값(1991-2020, 데이터셋당 한 번 계산) 대비 편차
+normal = ds.normals().loc[sel_key]
+st.caption("{}-{} 평년 대비: ".format(*ds.normals().attrs["baseline"])
+           + f"최고 {high_sel - normal['최고기온(℃)']:+.1f}℃ · "
+           f"평균 {avg_sel - normal['평균기온(℃)']:+.1f}℃ · "
+           f"최저 {low_sel - normal['최저기온(℃)']:+.1f}℃")
+st.caption("5일 창(앞뒤 2일 포함) 표본 기준: " + " · ".join(
+    window_label(name, p) for name, p in (("최고", p_high), ("평균", p_avg), ("최저", p_low))))
+st.caption("카드의 상위 %·순위는 같은 날짜끼리 비교한 값입니다.")
+
 # ────────────── 9. Top5 표 & 추이 그래프 ──────────────
+prof.mark("9. Top5 표 & 추이 그래프")
 st.markdown("---")
 st.subheader("🔥 가장 더웠던 날 Top 5 (동일 날짜)")
-st.dataframe(rank_high_df.head(5).reset_index(drop=True))
-fig_high = px.line(rank_high_df.sort_values("날짜"),
-                   x="날짜", y="최고기온(℃)",
-                   title=f"역대 {selected_date:%m월 %d일} 최고기온 추이")
-fig_high.add_scatter(x=[selected_dt], y=[high_sel], mode="markers+text",
-                     text=["선택일"], name="선택일",
-                     marker=dict(size=12, color="red"),
-                     textposition="top center")
+st.dataframe(display_frame(df.iloc[ds.ranks.top("최고기온(℃)", sel_key, sel_years, 5)]
+                           .reset_index(drop=True)))
+
+
+@prof.timed()
+def same_day_figure(col: str, value: float, color: str, title: str) -> go.Figure:
+    """같은 MM-DD 역대 추이 + 선택일 표시 (긴 기간은 다운샘플링·WebGL)"""
+    fig = go.Figure(charts.line(same_day_df["날짜"], same_day_df[col],
+                                name=col, showlegend=False))
+    fig.add_scatter(x=[selected_dt], y=[value], mode="markers+text",
+                    text=["선택일"], name="선택일",
+                    marker=dict(size=12, color=color),
+                    textposition="top center")
+    fig.update_layout(title=title, xaxis_title="날짜", yaxis_title=col)
+    return fig
+
+
+# 그림은 (데이터셋, 날짜, 연도 범위)가 같으면 재실행 때 다시 만들지 않음
+fig_key = (ds.key, selected_date, sel_years)
+fig_high = charts.cached_figure(
+    ("main.high",) + fig_key,
+    lambda: same_day_figure("최고기온(℃)", high_sel, "red",
+                            f"역대 {selected_date:%m월 %d일} 최고기온 추이"))
 st.plotly_chart(fig_high, use_container_width=True)
 
 st.markdown("---")
 st.subheader("❄️ 가장 추웠던 날 Top 5 (동일 날짜)")
-st.dataframe(rank_low_df.head(5).reset_index(drop=True))
-fig_low = px.line(rank_low_df.sort_values("날짜"),
-                  x="날짜", y="최저기온(℃)",
-                  title=f"역대 {selected_date:%m월 %d일} 최저기온 추이")
-fig_low.add_scatter(x=[selected_dt], y=[low_sel], mode="markers+text",
-                    text=["선택일"], name="선택일",
-                    marker=dict(size=12, color="blue"),
-                    textposition="top center")
+st.dataframe(display_frame(df.iloc[ds.ranks.top("최저기온(℃)", sel_key, sel_years, 5)]
+                           .reset_index(drop=True)))
+fig_low = charts.cached_figure(
+    ("main.low",) + fig_key,
+    lambda: same_day_figure("최저기온(℃)", low_sel, "blue",
+                            f"역대 {selected_date:%m월 %d일} 최저기온 추이"))
 st.plotly_chart(fig_low, use_container_width=True)
 
 # ────────────── 10. 최근 N일 vs 역대 동일 기간 ──────────────
-st.markdown("---")
-st.subheader("📅 최근 기간 평균 기온 분석")
-
-day_range = st.slider("비교할 최근 일 수", 3, 30, 14)
-start_day = selected_dt - pd.Timedelta(days=day_range)
-recent_df = df[(df["날짜"] >= start_day) & (df["날짜"] < selected_dt)]
-
-avg_high = recent_df["최고기온(℃)"].mean()
-avg_low  = recent_df["최저기온(℃)"].mean()
-avg_mean = recent_df["평균기온(℃)"].mean()
-
-# (1) MM-DD 목록
-period_days = [(selected_date - datetime.timedelta(days=i)).strftime("%m-%d")
-               for i in range(1, day_range + 1)]
-
-# (2) 연도별 N일 평균
-period_df = df[df["날짜"].dt.strftime("%m-%d").isin(period_days)]
-yearly_avg = (period_df
-              .groupby(period_df["날짜"].dt.year)
-              .agg(최고평균=("최고기온(℃)", "mean"),
-                   최저평균=("최저기온(℃)", "mean"),
-                   평균평균=("평균기온(℃)", "mean"))
-              .reset_index())
-
-# (3) 백분위·순위
-all_years_mean = yearly_avg["평균평균"]
-pct_mean  = 100 * (all_years_mean < avg_mean).sum() / len(all_years_mean)
-rank_mean = (all_years_mean > avg_mean).sum() + 1
-
-st.write(f"최근 {day_range}일 평균 (최고/평균/최저): "
-         f"**{avg_high:.2f} / {avg_mean:.2f} / {avg_low:.2f}℃**")
-st.write(f"역대 동기간 평균 : "
-         f"**{yearly_avg['최고평균'].mean():.2f} / "
-         f"{yearly_avg['평균평균'].mean():.2f} / "
-         f"{yearly_avg['최저평균'].mean():.2f}℃**")
-st.info(f"📈 최근 {day_range}일 평균기온은 역대 동일 기간 중 "
-        f"상위 **{100-pct_mean:.1f}%** "
-        f"(전체 {len(all_years_mean)}개 기간 중 {rank_mean}위)")
-
-# ─── 10-A. 최근 vs 역대 일자별 꺾은선 ───
-recent_plot = (recent_df[["날짜", "최고기온(℃)", "최저기온(℃)"]]
-               .sort_values("날짜")
-               .reset_index(drop=True))
-recent_plot["날짜_str"] = recent_plot["날짜"].dt.strftime("%Y-%m-%d")
-hist_daily = (period_df
-              .groupby(period_df["날짜"].dt.strftime("%m-%d"))
-              .agg(역대최고=("최고기온(℃)", "mean"),
-                   역대최저=("최저기온(℃)", "mean")))
-recent_plot["역대최고"] = recent_plot["날짜"].dt.strftime("%m-%d").map(hist_daily["역대최고"])
-recent_plot["역대최저"] = recent_plot["날짜"].dt.strftime("%m-%d").map(hist_daily["역대최저"])
-
-long_df = pd.melt(recent_plot,
-                  id_vars="날짜_str",
-                  value_vars=["최고기온(℃)", "역대최고",
-                              "최저기온(℃)", "역대최저"],
-                  var_name="구분", value_name="기온(℃)")
-
-fig_cmp = px.line(long_df, x="날짜_str", y="기온(℃)",
-                  color="구분", markers=True,
-                  title=f"최근 {day_range}일 실제 vs 역대 평균 (최고·최저)",
-                  labels={"날짜_str": "날짜"})
-fig_cmp.update_layout(xaxis_tickangle=-45)
-st.plotly_chart(fig_cmp, use_container_width=True)
+# 일 수 슬라이더는 이 조각만 다시 실행 (선택일·데이터는 전체 재실행 때 값 그대로)
+sel_day = day_number(selected_date)
+
+
+@st.fragment
+def recent_period():
+    with prof.fragment(FRAGMENTS["day_range"]) as p:
+        st.markdown("---")
+        st.subheader("📅 최근 기간 평균 기온 분석")
+        day_range = st.slider("비교할 최근 일 수", 3, 30, 14, key="day_range")
+        win = ds.windows
+
+        # (1) 최근 N일 평균 – 누적합 차이로 계산
+        recent_mean, _ = win.trailing([sel_day], day_range)
+        avg_high, avg_mean, avg_low = recent_mean[:, 0]
+
+        # (2) 연도별 같은 MM-DD 직전 N일 평균
+        yearly_avg = win.same_period(sel_key, day_range)
+
+        # (3) 백분위·순위
+        rank_mean, pct_mean, n_years = rank_in_period(yearly_avg, "평균평균", avg_mean)
+
+        st.write(f"최근 {day_range}일 평균 (최고/평균/최저): "
+                 f"**{avg_high:.2f} / {avg_mean:.2f} / {avg_low:.2f}℃**")
+        st.write(f"역대 동기간 평균 : "
+                 f"**{yearly_avg['최고평균'].mean():.2f} / "
+                 f"{yearly_avg['평균평균'].mean():.2f} / "
+                 f"{yearly_avg['최저평균'].mean():.2f}℃**")
+        st.info(f"📈 최근 {day_range}일 평균기온은 역대 동일 기간 중 "
+                f"상위 **{pct_mean:.1f}%** "
+                f"(전체 {n_years}개 기간 중 {rank_mean}위)")
+
+        # ─── 10-A. 최근 vs 역대 일자별 꺾은선 ───
+        p.mark("10-A. 최근 vs 역대 일자별 꺾은선")
+        recent_days = np.arange(sel_day - day_range, sel_day)
+        recent_vals = win.daily(sel_day - day_range, sel_day)
+        hist_daily = win.key_means()[:, split_days(recent_days)[1]]
+        recent_plot = pd.DataFrame({
+            "날짜_str": recent_days.astype("datetime64[D]").astype(str),
+            "최고기온(℃)": recent_vals[0], "역대최고": hist_daily[0],
+            "최저기온(℃)": recent_vals[2], "역대최저": hist_daily[2],
+        })
+
+        long_df = pd.melt(recent_plot,
+                          id_vars="날짜_str",
+                          value_vars=["최고기온(℃)", "역대최고",
+                                      "최저기온(℃)", "역대최저"],
+                          var_name="구분", value_name="기온(℃)")
+
+        fig_cmp = px.line(long_df, x="날짜_str", y="기온(℃)",
+                          color="구분", markers=True,
+                          title=f"최근 {day_range}일 실제 vs 역대 평균 (최고·최저)",
+                          labels={"날짜_str": "날짜"})
+        fig_cmp.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig_cmp, use_container_width=True)
+
+
+recent_period()
 
 # ────────────── 11. 최고 vs 최저 스캐터 ──────────────
+prof.mark("11. 최고 vs 최저 스캐터")
 st.markdown("---")
 st.subheader("📍 최고기온 vs 최저기온 분포 (동일 날짜)")
 
-scatter_df = same_day_df.copy()
-scatter_df["날짜_str"] = scatter_df["날짜"].dt.strftime("%Y-%m-%d")
-scatter_df["선택일"] = scatter_df["날짜"] == selected_dt
 
-fig_scatter = px.scatter(scatter_df,
-                         x="최고기온(℃)", y="최저기온(℃)",
-                         color="선택일", hover_name="날짜_str",
-                         title="역대 최고-최저 분포",
-                         labels={"선택일": "선택일 여부"})
+@prof.timed()
+def scatter_figure():
+    scatter_df = same_day_df.copy()
+    scatter_df["날짜_str"] = scatter_df["날짜"].dt.strftime("%Y-%m-%d")
+    scatter_df["선택일"] = scatter_df["날짜"] == selected_dt
+    return px.scatter(scatter_df,
+                      x="최고기온(℃)", y="최저기온(℃)",
+                      color="선택일", hover_name="날짜_str",
+                      title="역대 최고-최저 분포",
+                      labels={"선택일": "선택일 여부"},
+                      render_mode="auto")
+
+
+fig_scatter = charts.cached_figure(("main.scatter",) + fig_key, scatter_figure)
 st.plotly_chart(fig_scatter, use_container_width=True)
+
+# ────────────── 12. 구간별 실행 시간 (사이드바) ──────────────
+prof.finish()
+with st.sidebar.expander("⏱️ 구간별 실행 시간"):
+    st.caption(prof.summary())
+    st.dataframe(prof.frame(), hide_index=True, use_container_width=True)
@@ -5,161 +5,265 @@
 # ────────────────────────────────────────────────────────────────
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime as dt
-import os, math
 import plotly.express as px
-
-# ────────────── 0. 공통 함수 ──────────────
-def load_csv(src, skiprows=7):
-    for enc in ("cp949", "utf-8-sig"):
-        try:
-            df = pd.read_csv(src, encoding=enc, skiprows=skiprows)
-            break
-        except UnicodeDecodeError:
-            continue
-    else:
-        st.error("CSV 인코딩을 확인하세요."); st.stop()
-
-    if "날짜" not in df.columns:
-        st.error("'날짜' 열이 없습니다."); st.stop()
-
-    df["날짜"] = pd.to_datetime(df["날짜"].astype(str).str.strip(), format="%Y-%m-%d")
-    return df
-
-def heat_index_c(t_c, rh):
-    """섭씨·RH(%) → Heat Index(섭씨). 논리적 범위 외에는 원본 반환."""
-    t_f = t_c * 9/5 + 32
-    if t_f < 80 or rh < 40:
-        return t_c
-    hi_f = (-42.379 + 2.04901523*t_f + 10.14333127*rh
-            - .22475541*t_f*rh - 6.83783e-3*t_f**2
-            - 5.481717e-2*rh**2 + 1.22874e-3*t_f**2*rh
-            + 8.5282e-4*t_f*rh**2 - 1.99e-6*t_f**2*rh**2)
-    return (hi_f - 32) * 5/9
+import plotly.graph_objects as go
+
+from climate import charts, find_default_csv, load as load_dataset, profiling
+from climate.dayindex import date_key, day_number, split_days
+from climate.heat import grid as heat_grid, heat_index
+from climate.sidecar import display_frame
+from climate.stations import station_label
+
+# 재실행 구간별 시간·메모리 (사이드바 맨 아래에 표시)
+prof = profiling.Profiler("00_ChatGPT제안버전")
+
+# 위젯 → 다시 실행할 구간
+#  ▸ 사이드바(파일·지점·날짜·연도 범위·설명·평년 설정): 여러 구간이 의존 → 전체 재실행
+#  ▸ 아래 위젯은 st.fragment 안에 두어 그 구간만 다시 계산·표시
+FRAGMENTS = {
+    "rh":        "8-A. 체감온도",
+    "trend_col": "10-A. 가장 빨리 더워지는 날",
+    "day_rng":   "11. 최근 N일 vs 평년 그래프",
+}
 
 # ────────────── 1. 페이지 ──────────────
+prof.mark("1. 페이지")
 st.set_page_config("선택 날짜 vs 역대 기온", "📈", "centered")
 st.title("📈 선택 날짜는 평년보다 얼마나 더웠을까?")
 
 # ────────────── 2. 데이터 로드 ──────────────
+prof.mark("2. 데이터 로드")
 up = st.file_uploader("CSV 업로드 (or 기본 ta*.csv)", type="csv")
 if up is None:
-    up = next((f for f in os.listdir(".") if f.startswith("ta") and f.endswith(".csv")), None)
+    up = find_default_csv()
     if up: st.info(f"기본 파일 **{up}** 사용")
     else: st.stop()
 
-df = load_csv(up)
+load_bar = st.empty()
+try:
+    ds = load_dataset(up, progress=lambda done, total: load_bar.progress(
+        done / total, text=f"CSV 읽는 중… {done / 2**20:.0f}/{total / 2**20:.0f} MB"))
+except ValueError as e:
+    load_bar.empty()
+    st.error(f"CSV를 확인하세요: {e}"); st.stop()
+load_bar.empty()
 
 # ────────────── 3. 사이드바 입력 ──────────────
+prof.mark("3. 사이드바 입력")
 sb = st.sidebar
 sb.header("⚙️ 설정")
 
-min_d, max_d = df["날짜"].dt.date.min(), df["날짜"].dt.date.max()
+if len(ds.station_ids) > 1:
+    ds = ds.for_station(sb.selectbox("지점", ds.station_ids, format_func=station_label))
+df = ds.frame
+
+min_d, max_d = df["날짜"].min().date(), df["날짜"].max().date()
 yesterday = dt.date.today() - dt.timedelta(days=1)
 default_d = yesterday if min_d <= yesterday <= max_d else max_d
 
 sel_date = sb.date_input("날짜 선택", default_d, min_value=min_d, max_value=max_d)
 sel_dt   = pd.to_datetime(sel_date)
 
-ymin, ymax = int(df["날짜"].dt.year.min()), int(df["날짜"].dt.year.max())
+ymin, ymax = int(ds.days.year.min()), int(ds.days.year.max())
 year_rng   = sb.slider("비교 연도 범위", ymin, ymax, (ymin, ymax))
-
-day_rng    = sb.slider("최근 N일(평균 비교)", 3, 30, 14)
+# 긴 자료 공백은 순위·평균을 조용히 왜곡하므로 알림 (품질 색인 조회)
+gap_text   = ds.quality.gap_text(years=year_rng)
+if gap_text:
+    sb.warning(f"⚠️ 30일 이상 자료 공백: {gap_text}")
 
 show_expl  = sb.checkbox("📖 각 섹션 설명 보기", value=True)
 
-rh = sb.slider("체감온도 계산용 습도(%)", 10, 100, 60)
+with sb.expander("📐 평년값 설정"):
+    base_default = (max(ymin, 1991), min(ymax, 2020))
+    if base_default[0] > base_default[1]: base_default = (ymin, ymax)
+    clim_rng = st.slider("평년 기준 기간", ymin, ymax, base_default)
+    clim_k = st.slider("평활 창(±일, 0=같은 날짜만)", 0, 15, 0)
 
 # ────────────── 4. 선택일 존재 확인 ──────────────
-df_sel = df[df["날짜"] == sel_dt]
-if df_sel.empty:
+prof.mark("4. 선택일 존재 확인")
+sel_row = ds.days.row(sel_date)
+if sel_row is None:
     st.error("선택한 날짜 데이터가 없습니다."); st.stop()
+df_sel = df.iloc[[sel_row]]
 
 # ────────────── 5. 동일 MM-DD 데이터, 평년값 ──────────────
+prof.mark("5. 동일 MM-DD 데이터, 평년값")
 mmdd = sel_dt.strftime("%m-%d")
-same_day = df[df["날짜"].dt.strftime("%m-%d") == mmdd]
-same_day_yr = same_day[same_day["날짜"].dt.year.between(*year_rng)]
+sel_key = date_key(sel_date)
+same_day_yr = df.iloc[ds.days.rows(sel_key, year_rng)]
 
-# WMO 1991-2020 평년
-clim_base = same_day[(same_day["날짜"].dt.year >= 1991) &
-                     (same_day["날짜"].dt.year <= 2020)]
-if clim_base.empty: clim_base = same_day_yr   # fallback
-
-clim_mean = clim_base[["최고기온(℃)", "평균기온(℃)", "최저기온(℃)"]].mean()
+# 평년값 표(366일)는 데이터셋·설정마다 한 번 계산, 기준 기간에 자료가 없으면 전체 연도
+normals = ds.normals(clim_rng, smooth=clim_k)
+clim_label = "{}-{} 평년".format(*normals.attrs["baseline"])
+clim_mean = normals.loc[sel_key, ["최고기온(℃)", "평균기온(℃)", "최저기온(℃)"]]
 
 # ────────────── 6. 선택일 값 & Δ ──────────────
+prof.mark("6. 선택일 값 & Δ")
 high, avg, low = df_sel.iloc[0][["최고기온(℃)", "평균기온(℃)", "최저기온(℃)"]]
-Δhigh, Δavg, Δlow = high - clim_mean[0], avg - clim_mean[1], low - clim_mean[2]
-
-# Heat Index
-hi_c = heat_index_c(high, rh)
+Δhigh, Δavg, Δlow = high - clim_mean.iloc[0], avg - clim_mean.iloc[1], low - clim_mean.iloc[2]
 
 # ────────────── 7. 랭킹 계산 ──────────────
-def rank_pct(series, val, ascending=False):
-    sorted_s = series.sort_values(ascending=ascending).reset_index(drop=True)
-    rank = sorted_s[sorted_s == val].index[0] + 1
-    pct  = 100 * (rank - 1) / len(sorted_s)
-    return rank, pct, len(sorted_s)
-
-rank_high, pct_high, n_high = rank_pct(same_day_yr["최고기온(℃)"], high, False)
-rank_low , pct_low , n_low  = rank_pct(same_day_yr["최저기온(℃)"], low, True)
+prof.mark("7. 랭킹 계산")
+# 같은 MM-DD 순위 (동점은 같은 순위, 결측 제외)
+r_high = ds.ranks.query("최고기온(℃)", sel_row, year_rng)
+r_low  = ds.ranks.query("최저기온(℃)", sel_row, year_rng)
+# 앞뒤 2일을 합친 5일 창 표본의 상위 % (같은 날짜 순위와 별도 항목으로 표시)
+p_high = ds.ranks.window_pct("최고기온(℃)", sel_row, year_rng)
+p_low  = ds.ranks.window_pct("최저기온(℃)", sel_row, year_rng)
+
+def rank_txt(r):
+    return (f"상위 {r.pct:.1f}% ({r.n}일 중 {r.rank}위)" if r.rank is not None
+            else f"순위 없음 ({r.n}일)")
+
+def window_txt(name, p):
+    pct, n = p
+    return f"{name} 순위 없음" if pct is None else f"{name} 상위 {pct:.1f}% ({n}일)"
 
 # ────────────── 8. 카드(모바일→ col 1) ──────────────
+prof.mark("8. 카드")
 cols = st.columns(2 if st.session_state.get("mobile", False) else 3)
 cols[0].metric("🌡️ 최고기온",   f"{high:.1f}°C",
-               f"Δ {Δhigh:+.1f}°C · 상위 {pct_high:.1f}% ({n_high}일 중 {rank_high}위)")
+               f"Δ {Δhigh:+.1f}°C · {rank_txt(r_high)}")
 cols[1].metric("🌡️ 평균기온",   f"{avg:.1f}°C",
                f"Δ {Δavg:+.1f}°C")
 if len(cols) > 2:
     cols[2].metric("🌙 최저기온", f"{low:.1f}°C",
-                   f"Δ {Δlow:+.1f}°C · 상위 {pct_low:.1f}% ({n_low}일 중 {rank_low}위)")
+                   f"Δ {Δlow:+.1f}°C · {rank_txt(r_low)}")
+st.caption(f"5일 창(앞뒤 2일 포함) 표본 기준: {window_txt('최고', p_high)} · "
+           f"{window_txt('최저', p_low)}")
+if show_expl:
+    st.caption("카드의 상위 %·순위는 같은 날짜끼리, 5일 창은 앞뒤 2일을 합친 표본과 비교한 값입니다.")
+
+
+# ─── 8-A. 체감온도 (습도 슬라이더는 이 조각만 다시 실행) ───
+@st.fragment
+def heat_card():
+    with prof.fragment(FRAGMENTS["rh"]):
+        rh = st.slider("체감온도 계산용 습도(%)", 10, 100, 60, key="rh")
+
+        # Heat Index – 같은 MM-DD 전 연도를 한 번에 계산해 순위까지
+        hi_c = float(heat_index(high, rh))
+        hi_hist = heat_index(same_day_yr["최고기온(℃)"].to_numpy(), rh)
+        hi_valid = hi_hist[~np.isnan(hi_hist)]
+        hi_rank = int((hi_valid > hi_c).sum()) + 1
+
+        st.metric("🥵 체감 최고(Heat Index)", f"{hi_c:.1f}°C",
+                  f"습도 {rh}% 기준 · {len(hi_valid)}일 중 {hi_rank}위")
+
+        with st.expander("🥵 같은 날짜 체감온도 추이 · 조견표"):
+            if show_expl:
+                st.caption("습도를 모든 연도에 똑같이 적용한 가정값입니다.")
+            fig_hi = go.Figure(charts.line(same_day_yr["날짜"], hi_hist, name="Heat Index"))
+            fig_hi.update_layout(xaxis_title="날짜", yaxis_title="Heat Index(°C)")
+            st.plotly_chart(fig_hi, use_container_width=True)
+            st.dataframe(heat_grid(np.arange(26, 41, 2), np.arange(40, 101, 10)).round(1))
 
-st.metric("🥵 체감 최고(Heat Index)", f"{hi_c:.1f}°C", f"습도 {rh}% 기준")
+
+heat_card()
 
 # ────────────── 9. TOP10 표 ──────────────
+prof.mark("9. TOP10 표")
 st.markdown("---")
 st.subheader("🔥 동일 날짜 TOP 10 최고/최저")
 if show_expl:
     st.caption("같은 월·일 기준, 선택 연도 범위에서 상·하위 10위를 보여줍니다.")
 
 c_top, c_low = st.columns(2)
-c_top.dataframe(same_day_yr.sort_values("최고기온(℃)", ascending=False)
-                .head(10)[["날짜", "최고기온(℃)"]]
-                .reset_index(drop=True))
-c_low.dataframe(same_day_yr.sort_values("최저기온(℃)").head(10)
-                [["날짜", "최저기온(℃)"]]
-                .reset_index(drop=True))
+c_top.dataframe(display_frame(df.iloc[ds.ranks.top("최고기온(℃)", sel_key, year_rng, 10)]
+                              [["날짜", "최고기온(℃)"]]
+                              .reset_index(drop=True)))
+c_low.dataframe(display_frame(df.iloc[ds.ranks.top("최저기온(℃)", sel_key, year_rng, 10)]
+                              [["날짜", "최저기온(℃)"]]
+                              .reset_index(drop=True)))
 
 # ────────────── 10. 추이 그래프 ──────────────
+prof.mark("10. 추이 그래프")
 st.markdown("---")
 st.subheader(f"📉 {mmdd} 최고·최저 기온 추이")
 if show_expl:
     st.caption("선형 회귀 기울기는 기후 변화 경향성을 의미합니다.")
 
-fig_line = px.scatter(same_day_yr, x="날짜", y="최고기온(℃)",
-                      trendline="ols", labels={"최고기온(℃)":"기온(°C)"})
-fig_line.add_scatter(x=[sel_dt], y=[high], mode="markers+text",
-                     text=["선택일"], name="선택일", marker=dict(size=12, color="red"))
+# 366일 × 열 추세 표는 연도 범위마다 한 번 계산해 재사용
+trends = ds.trends.table(year_rng)
+hi_col = trends.names.index("최고기온(℃)")
+slope = trends.slope[hi_col, sel_key]
+icpt = trends.intercept[hi_col, sel_key]
+
+
+@prof.timed()
+def trend_figure():
+    fig = go.Figure(charts.points(same_day_yr["날짜"], same_day_yr["최고기온(℃)"],
+                                  name="최고기온"))
+    if not np.isnan(slope):
+        ends = same_day_yr["날짜"].iloc[[0, -1]]
+        fig.add_scatter(x=ends, y=icpt + slope * ends.dt.year.to_numpy(),
+                        mode="lines", name="추세선")
+    fig.add_scatter(x=[sel_dt], y=[high], mode="markers+text",
+                    text=["선택일"], name="선택일", marker=dict(size=12, color="red"))
+    fig.update_layout(xaxis_title="날짜", yaxis_title="기온(°C)")
+    return fig
+
+
+fig_line = charts.cached_figure(("p00.trend", ds.key, sel_date, year_rng), trend_figure)
 st.plotly_chart(fig_line, use_container_width=True)
+if not np.isnan(slope):
+    st.caption(f"추세 {slope * 10:+.2f}℃/10년 · p값 {trends.pvalue[hi_col, sel_key]:.3f} "
+               f"· {trends.n[hi_col, sel_key]}년")
+
+
+# ─── 10-A. 추세 지도 (열 선택은 이 조각만 다시 실행) ───
+@st.fragment
+def trend_atlas():
+    with prof.fragment(FRAGMENTS["trend_col"]), st.expander("🌡️ 1년 중 가장 빨리 더워지는 날"):
+        trend_col = st.radio("기온 열", trends.names, horizontal=True, key="trend_col")
+        atlas = trends.frame(trend_col)
+        fig_atlas = go.Figure(charts.line(atlas.index, atlas["기울기(℃/10년)"], name="기울기"))
+        fig_atlas.add_scatter(x=[sel_key], y=[atlas["기울기(℃/10년)"].iat[sel_key]],
+                              mode="markers", name=mmdd, marker=dict(size=10, color="red"))
+        fig_atlas.update_layout(xaxis=dict(title="MM-DD", tickvals=atlas.index[::30].tolist(),
+                                           ticktext=atlas["MM-DD"].iloc[::30].tolist()),
+                                yaxis_title="기울기(℃/10년)")
+        st.plotly_chart(fig_atlas, use_container_width=True)
+        st.dataframe(atlas.nlargest(10, "기울기(℃/10년)").round(3).reset_index(drop=True))
+
+
+trend_atlas()
 
 # ────────────── 11. 최근 N일 vs 평년 그래프 ──────────────
-st.markdown("---")
-st.subheader(f"⏳ 최근 {day_rng}일 평균 vs 평년")
-if show_expl:
-    st.caption("선택일 기준 과거 N일과 1991-2020 평년 평균을 비교합니다.")
-
-start_dt = sel_dt - pd.Timedelta(days=day_rng)
-recent_df = df[(df["날짜"] >= start_dt) & (df["날짜"] < sel_dt)]
-per_days = [(sel_date - dt.timedelta(days=i)).strftime("%m-%d") for i in range(1, day_rng+1)]
-clim_df  = df[df["날짜"].dt.strftime("%m-%d").isin(per_days) &
-              (df["날짜"].dt.year.between(1991, 2020))]
-clim_mean_line = (clim_df.groupby(clim_df["날짜"].dt.strftime("%m-%d"))
-                           ["평균기온(℃)"].mean())
-
-recent_plot = recent_df.sort_values("날짜")[["날짜","평균기온(℃)"]]
-recent_plot["평년"] = recent_plot["날짜"].dt.strftime("%m-%d").map(clim_mean_line)
-
-fig_cmp = px.line(recent_plot.melt("날짜", var_name="구분", value_name="평균"),
-                  x="날짜", y="평균", color="구분", markers=True,
-                  labels={"평균":"평균기온(°C)"})
-st.plotly_chart(fig_cmp, use_container_width=True)
+# 일 수 슬라이더는 이 조각만 다시 실행
+sel_day = day_number(sel_date)
+avg_col = ds.windows.names.index("평균기온(℃)")
+
+
+@st.fragment
+def recent_vs_normal():
+    with prof.fragment(FRAGMENTS["day_rng"]):
+        st.markdown("---")
+        day_rng = st.slider("최근 N일(평균 비교)", 3, 30, 14, key="day_rng")
+        st.subheader(f"⏳ 최근 {day_rng}일 평균 vs 평년")
+        if show_expl:
+            st.caption(f"선택일 기준 과거 N일과 {clim_label} 평균을 비교합니다.")
+
+        recent_days = np.arange(sel_day - day_rng, sel_day)
+        recent_keys = split_days(recent_days)[1]
+        recent_plot = pd.DataFrame({
+            "날짜": recent_days.astype("datetime64[D]"),
+            "평균기온(℃)": ds.windows.daily(sel_day - day_rng, sel_day)[avg_col],
+            "평년": normals["평균기온(℃)"].to_numpy()[recent_keys],
+        })
+
+        fig_cmp = px.line(recent_plot.melt("날짜", var_name="구분", value_name="평균"),
+                          x="날짜", y="평균", color="구분", markers=True,
+                          labels={"평균":"평균기온(°C)"})
+        st.plotly_chart(fig_cmp, use_container_width=True)
+
+
+recent_vs_normal()
+
+# ────────────── 12. 구간별 실행 시간 (사이드바) ──────────────
+prof.finish()
+with st.sidebar.expander("⏱️ 구간별 실행 시간"):
+    st.caption(prof.summary())
+    st.dataframe(prof.frame(), hide_index=True, use_container_width=True)
@@ -1,79 +1,112 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.graph_objs as go
-from sklearn.linear_model import LinearRegression
-import os
 
-# ----------------------------
-# 📁 기본 파일 경로
-DEFAULT_FILE = "기온데이터(utf-8).csv"
-# ----------------------------
+from climate import charts, find_default_csv, fit, load as load_dataset, profiling
+from climate.yearly import month_means
+from climate.stations import station_label
 
+# 재실행 구간별 시간·메모리 (사이드바 맨 아래에 표시)
+prof = profiling.Profiler("01_추세선")
+prof.mark("페이지 설정")
 st.set_page_config(page_title="기온 추세 분석", layout="wide")
 st.title("🌡️ 연도별 및 월별 기온 추세 분석 대시보드")
 
 # ----------------------------
 # 📂 파일 업로드 또는 기본 사용
+prof.mark("파일 선택")
 uploaded_file = st.file_uploader("기온 데이터 CSV 업로드 (선택)", type="csv")
+default_file = find_default_csv()
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
+    src = uploaded_file
     st.success("✅ 업로드한 파일을 사용 중입니다.")
-elif os.path.exists(DEFAULT_FILE):
-    df = pd.read_csv(DEFAULT_FILE)
-    st.info("ℹ️ 기본 파일 '기온데이터(utf-8).csv'을 사용 중입니다.")
+elif default_file:
+    src = default_file
+    st.info(f"ℹ️ 기본 파일 '{default_file}'을 사용 중입니다.")
 else:
     st.error("❌ 사용할 수 있는 파일이 없습니다.")
     st.stop()
 
 # ----------------------------
-# ⏳ 전처리
+# ⏳ 로드 + 전처리 (파싱은 프로세스 공용 캐시에서 한 번만)
+prof.mark("로드")
+load_bar = st.empty()
 try:
-    df["날짜"] = df["날짜"].astype(str).str.strip()
-    df["날짜"] = pd.to_datetime(df["날짜"], format="%Y-%m-%d", errors="coerce")
-    df = df.dropna(subset=["날짜"])  # 유효한 날짜만
-    df["연도"] = df["날짜"].dt.year
-    df["월"] = df["날짜"].dt.month
-
-    for col in ["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    ds = load_dataset(src, progress=lambda done, total: load_bar.progress(
+        done / total, text=f"⏳ CSV 읽는 중… {done / 2**20:.0f}/{total / 2**20:.0f} MB"))
 except Exception as e:
+    load_bar.empty()
     st.error(f"❌ 전처리 중 오류 발생: {e}")
     st.stop()
+load_bar.empty()
+
+if len(ds.station_ids) > 1:
+    ds = ds.for_station(st.sidebar.selectbox("📍 지점", ds.station_ids,
+                                             format_func=station_label))
+# 행별 연도·월은 날짜 색인에서 (프레임을 복사하지 않음)
+row_years = ds.days.year
 
 # ----------------------------
 # ✅ 365일 이상 실제 데이터 존재 연도 필터
+prof.mark("연도 필터")
 st.sidebar.subheader("🛠️ 데이터 필터 옵션")
 only_full_years = st.sidebar.checkbox("✔️ 365일이 모두 있는 연도만 사용", value=False)
 
+# 연도별 합·개수 집계 (사이드카에 저장, 새 파일은 바뀐 행만 반영)
+yearly_all = ds.yearly()
+# 연·월 자료 비율은 품질 색인에서 조회 (데이터셋당 한 번 계산)
+quality = ds.quality
 if only_full_years:
-    # 평균기온이 존재하는 날짜 수 기준 필터
-    year_day_counts = df.dropna(subset=["평균기온(℃)"]).groupby("연도")["날짜"].nunique()
-    valid_years = year_day_counts[year_day_counts >= 365].index.tolist()
-    df = df[df["연도"].isin(valid_years)]
+    # 평균기온이 있는 날이 365일 이상인 연도 (윤년은 하루 빠져도 포함)
+    valid_years = quality.complete_years("평균기온(℃)", min_days=365)
+    rows = np.isin(row_years, valid_years)
+    yearly_all = yearly_all.loc[yearly_all.index.intersection(valid_years)]
     st.sidebar.info(f"✅ {len(valid_years)}개 연도만 포함되었습니다. (평균기온 기준)")
 else:
+    rows = None
     st.sidebar.info("ℹ️ 모든 연도 데이터를 사용 중입니다.")
+gap_text = quality.gap_text()
+if gap_text:
+    st.sidebar.warning(f"⚠️ 30일 이상 자료 공백: {gap_text}")
 
 # ----------------------------
 # 📊 연도별 기온 추세
+prof.mark("1️⃣ 연도별 기온 추세")
 st.subheader("1️⃣ 연도별 기온 추세")
-yearly = df.groupby("연도")[["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]].mean().reset_index()
+yearly = yearly_all[["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]].reset_index()
+# 자료가 90% 미만인 해는 그래프에 따로 표시
+flagged = yearly[yearly["연도"].isin(quality.incomplete_years())]
+
+
+def yearly_figure():
+    fig = go.Figure()
+    for col, name in [("평균기온(℃)", "평균기온"), ("최저기온(℃)", "최저기온"),
+                      ("최고기온(℃)", "최고기온")]:
+        fig.add_trace(charts.line(yearly["연도"], yearly[col], name=name, mode='lines+markers'))
+    if len(flagged):
+        fig.add_trace(go.Scatter(
+            x=flagged["연도"], y=flagged["평균기온(℃)"], mode="markers",
+            name="자료 90% 미만", marker=dict(symbol="x", size=10, color="gray")
+        ))
+    fig.update_layout(title="연도별 기온 추세",
+                      xaxis_title="연도", yaxis_title="기온 (℃)",
+                      hovermode="x unified")
+    return fig
 
-fig_year = go.Figure()
-fig_year.add_trace(go.Scatter(x=yearly["연도"], y=yearly["평균기온(℃)"], mode='lines+markers', name="평균기온"))
-fig_year.add_trace(go.Scatter(x=yearly["연도"], y=yearly["최저기온(℃)"], mode='lines+markers', name="최저기온"))
-fig_year.add_trace(go.Scatter(x=yearly["연도"], y=yearly["최고기온(℃)"], mode='lines+markers', name="최고기온"))
 
-fig_year.update_layout(title="연도별 기온 추세",
-                       xaxis_title="연도", yaxis_title="기온 (℃)",
-                       hovermode="x unified")
+fig_year = charts.cached_figure(("p01.yearly", ds.key, only_full_years), yearly_figure)
 st.plotly_chart(fig_year, use_container_width=True)
+if len(flagged):
+    st.caption(f"✖ 표시는 자료가 90% 미만인 해입니다: {', '.join(map(str, flagged['연도']))}")
 
 # ----------------------------
 # 📅 월별 평균 기온
+prof.mark("2️⃣ 월별 평균 기온")
 st.subheader("2️⃣ 월별 평균 기온 (전체 연도 기준)")
-monthly = df.groupby("월")[["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]].mean().reset_index()
+# 월별 합·개수는 bincount 한 번씩 (선택한 연도 행만)
+month_cols = ["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]
+monthly = month_means(ds.days.month, ds.values[[ds.names.index(c) for c in month_cols]],
+                      month_cols, rows).reset_index()
 
 fig_month = go.Figure()
 fig_month.add_trace(go.Scatter(x=monthly["월"], y=monthly["평균기온(℃)"], mode='lines+markers', name="평균기온"))
@@ -88,9 +121,14 @@ st.plotly_chart(fig_month, use_container_width=True)
 
 # ----------------------------
 # 🔮 연도별 추세선 예측
+prof.mark("3️⃣ 연도별 추세선 예측")
 st.subheader("3️⃣ 연도별 추세선 예측")
 
-year_min, year_max = int(df["연도"].min()), int(df["연도"].max())
+kept = row_years if rows is None else row_years[rows]
+if not len(kept):
+    st.warning("⚠️ 조건에 맞는 연도가 없습니다.")
+    st.stop()
+year_min, year_max = int(kept.min()), int(kept.max())
 
 col1, col2 = st.columns(2)
 with col1:
@@ -98,34 +136,74 @@ with col1:
 with col2:
     pred_range = st.slider("🔮 예측 연도 범위", year_max + 1, year_max + 50, (year_max + 1, year_max + 3))
 
+col3, col4 = st.columns(2)
+with col3:
+    # 꺾인 직선은 꺾는 연도가 양 끝이 아닌 안쪽이어야 하므로 3년 이상일 때만
+    models = [m for m in fit.MODELS
+              if m != "piecewise" or input_range[1] - input_range[0] >= 2]
+    model = st.selectbox("📐 추세 모형", models, format_func=fit.MODELS.get)
+with col4:
+    opts = {}
+    if model == "piecewise":
+        knot_lo, knot_hi = input_range[0] + 1, input_range[1] - 1
+        if knot_lo == knot_hi:
+            opts["knot"] = knot_lo
+            st.caption(f"📍 기울기가 바뀌는 연도: {knot_lo}")
+        else:
+            opts["knot"] = st.slider("📍 기울기가 바뀌는 연도", knot_lo, knot_hi,
+                                     (input_range[0] + input_range[1]) // 2)
+    elif model == "loess":
+        opts["span"] = st.slider("🪟 LOESS 범위 (사용 자료 비율)", 0.2, 1.0, 0.5, 0.05)
+
 if st.button("📈 추세선 예측하기"):
+    cols = ["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]
     input_df = yearly[(yearly["연도"] >= input_range[0]) & (yearly["연도"] <= input_range[1])]
-    pred_years = np.array(range(pred_range[0], pred_range[1] + 1)).reshape(-1, 1)
+    usable = [c for c in cols if input_df[c].notna().sum() >= 3]
+    for col in cols:
+        if col not in usable:
+            st.warning(f"⚠️ {col}에 사용할 수 있는 연도가 3개 미만입니다.")
 
     fig_pred = go.Figure()
     colors = {"평균기온(℃)": "blue", "최저기온(℃)": "green", "최고기온(℃)": "red"}
-
-    for col in ["평균기온(℃)", "최저기온(℃)", "최고기온(℃)"]:
-        df_valid = input_df[["연도", col]].dropna()
-        if df_valid.empty:
-            st.warning(f"⚠️ {col}에 사용할 수 있는 데이터가 없습니다.")
-            continue
-
-        model = LinearRegression()
-        model.fit(df_valid[["연도"]], df_valid[col])
-        pred_values = model.predict(pred_years)
-
+    if usable:
+        # 세 열을 한 번에 적합, 예측 구간은 재표집 2000회를 행렬곱 한 번으로
+        x_in = input_df["연도"].to_numpy()
+        pred_years = np.arange(pred_range[0], pred_range[1] + 1)
+        Y = input_df[usable].to_numpy().T
+        try:
+            curve = fit.fit(x_in, Y, x_in, model, **opts)
+            fc = fit.forecast(x_in, Y, pred_years, model, **opts)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            st.warning(f"⚠️ 추세선을 적합할 수 없습니다: {e}")
+            usable = []
+
+    for i, col in enumerate(usable):
+        c = colors[col]
         fig_pred.add_trace(go.Scatter(
-            x=df_valid["연도"], y=df_valid[col],
-            mode="lines+markers", name=f"{col} (입력)", line=dict(color=colors[col])
+            x=x_in, y=Y[i], mode="lines+markers", name=f"{col} (입력)", line=dict(color=c)
+        ))
+        fig_pred.add_trace(go.Scatter(
+            x=x_in, y=curve[i], mode="lines", name=f"{col} 추세",
+            line=dict(color=c, width=1), opacity=0.6
         ))
-
         fig_pred.add_trace(go.Scatter(
-            x=pred_years.flatten(), y=pred_values,
-            mode="lines+markers", name=f"{col} 예측", line=dict(dash="dash", color=colors[col])
+            x=np.r_[pred_years, pred_years[::-1]], y=np.r_[fc.upper[i], fc.lower[i][::-1]],
+            fill="toself", fillcolor=c, opacity=0.15, line=dict(width=0),
+            name=f"{col} 95% 예측 구간", hoverinfo="skip"
+        ))
+        fig_pred.add_trace(go.Scatter(
+            x=pred_years, y=fc.fitted[i],
+            mode="lines+markers", name=f"{col} 예측", line=dict(dash="dash", color=c)
         ))
 
-    fig_pred.update_layout(title="📈 기온 추세선 예측 결과",
+    fig_pred.update_layout(title=f"📈 기온 추세선 예측 결과 ({fit.MODELS[model]})",
                            xaxis_title="연도", yaxis_title="기온 (℃)",
                            hovermode="x unified")
     st.plotly_chart(fig_pred, use_container_width=True)
+
+# ----------------------------
+# ⏱️ 구간별 실행 시간 (사이드바)
+prof.finish()
+with st.sidebar.expander("⏱️ 구간별 실행 시간"):
+    st.caption(prof.summary())
+    st.dataframe(prof.frame(), hide_index=True, use_container_width=True)
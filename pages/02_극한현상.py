@@ -0,0 +1,191 @@
+# ────────────────────────────────────────────────────────────────
+#  폭염·열대야·한파 – 연속 극한 현상 탐색
+#  ▸ 사이드바에서 현상(기상청 기준·백분위 기준·직접 설정)과 연도 범위 선택
+#  ▸ 연도별 횟수·일수, 역대 최장·최강 사건, 해별 사건 목록
+#  ▸ ETCCDI 극한 기온 지수(TX90p·TN10p·WSDI …) 연도별 추이
+#  ▸ 자료가 90% 미만인 해는 막대 색을 달리하고 이동 평균에서 뺀다
+# ────────────────────────────────────────────────────────────────
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from climate import find_default_csv, load as load_dataset, profiling
+from climate.events import PRESETS, Rule
+from climate.percentile import SPELLS, WINDOW
+from climate.loader import TEMP_COLS
+from climate.stations import station_label
+
+# 재실행 구간별 시간·메모리 (사이드바 맨 아래에 표시)
+prof = profiling.Profiler("02_극한현상")
+
+# 위젯 → 다시 실행할 구간
+#  ▸ 사이드바(파일·지점·현상·연도 범위): 모든 구간이 의존 → 전체 재실행
+#  ▸ 아래 위젯은 st.fragment 안에 두어 그 구간만 다시 계산·표시
+FRAGMENTS = {
+    "event_metric": "6. 연도별 그래프",
+    "event_year":   "8. 해별 사건 목록",
+    "etccdi_index": "9. ETCCDI 지수",
+}
+CUSTOM = "직접 설정"
+METRICS = ("횟수", "일수", "최장(일)", "강도(℃·일)")
+
+# ────────────── 1. 페이지 ──────────────
+prof.mark("1. 페이지")
+st.set_page_config("폭염·열대야·한파", "🔥", "centered")
+st.title("🔥 폭염·열대야·한파는 얼마나 잦아졌을까?")
+
+# ────────────── 2. 데이터 로드 ──────────────
+prof.mark("2. 데이터 로드")
+up = st.file_uploader("CSV 업로드 (or 기본 ta*.csv)", type="csv")
+if up is None:
+    up = find_default_csv()
+    if up: st.info(f"기본 파일 **{up}** 사용")
+    else: st.stop()
+
+load_bar = st.empty()
+try:
+    ds = load_dataset(up, progress=lambda done, total: load_bar.progress(
+        done / total, text=f"CSV 읽는 중… {done / 2**20:.0f}/{total / 2**20:.0f} MB"))
+except ValueError as e:
+    load_bar.empty()
+    st.error(f"CSV를 확인하세요: {e}"); st.stop()
+load_bar.empty()
+
+# ────────────── 3. 사이드바 입력 ──────────────
+prof.mark("3. 사이드바 입력")
+sb = st.sidebar
+sb.header("⚙️ 설정")
+
+if len(ds.station_ids) > 1:
+    ds = ds.for_station(sb.selectbox("지점", ds.station_ids, format_func=station_label))
+
+choice = sb.selectbox("현상", list(PRESETS) + [CUSTOM])
+if choice == CUSTOM:
+    cols = [c for c in TEMP_COLS if c in ds.names]
+    column = sb.selectbox("기온 열", cols)
+    above = sb.radio("조건", ("이상", "이하"), horizontal=True) == "이상"
+    percentile = sb.checkbox("MM-DD별 백분위 기준", value=False)
+    if percentile:
+        threshold = sb.slider("백분위", 1, 99, 90 if above else 10)
+    else:
+        threshold = sb.number_input("기준 기온(℃)", -30.0, 45.0, 30.0 if above else -10.0, 0.5)
+    min_days = sb.slider("최소 연속 일수", 1, 10, 2)
+    rule = Rule(CUSTOM, column, above, float(threshold), min_days, percentile)
+else:
+    rule = PRESETS[choice]
+
+ymin, ymax = int(ds.days.year.min()), int(ds.days.year.max())
+year_rng = sb.slider("연도 범위", ymin, ymax, (ymin, ymax))
+gap_text = ds.quality.gap_text(years=year_rng)
+if gap_text:
+    sb.warning(f"⚠️ 30일 이상 자료 공백: {gap_text}")
+
+
+def yearly_bar(table: pd.DataFrame, name: str, col: str | None):
+    """연도별 막대 + 10년 이동 평균 (col 자료가 90% 미만인 해는 회색, 평균에서 제외)"""
+    plot = table[[name]].reset_index()
+    short = plot["연도"].isin(ds.quality.incomplete_years(col, years=year_rng))
+    plot["자료"] = np.where(short, "90% 미만", "충분")
+    trend = plot[name].where(~short).rolling(10, min_periods=5).mean()
+    fig = px.bar(plot, x="연도", y=name, color="자료",
+                 color_discrete_map={"충분": "#636efa", "90% 미만": "lightgray"})
+    fig.add_scatter(x=plot["연도"], y=trend, mode="lines",
+                    name="10년 이동 평균", line=dict(color="red"))
+    return fig
+
+# ────────────── 4. 사건 표 ──────────────
+prof.mark("4. 사건 표")
+# 규칙마다 데이터셋 전체에서 한 번 찾고(사이드카 저장), 연도 범위는 이진 탐색 슬라이스
+ev = ds.events(rule)
+idx = ev.in_years(year_rng)
+per_year = ev.per_year(year_rng)
+
+cmp = "≥" if rule.above else "≤"
+limit = (f"MM-DD별 {rule.threshold:g} 백분위(앞뒤 {WINDOW}일 창)" if rule.percentile
+         else f"{rule.threshold:g}℃")
+st.caption(f"{rule.column} {cmp} {limit}, "
+           f"{rule.min_days}일 이상 연속 · 날짜가 빠지거나 결측이면 끊어서 셉니다.")
+
+# ────────────── 5. 요약 카드 ──────────────
+prof.mark("5. 요약 카드")
+c1, c2, c3 = st.columns(3)
+c1.metric("사건 수", f"{len(idx)}회", f"{per_year['일수'].sum()}일")
+if len(idx):
+    longest = ev.top("length", 1, idx)[0]
+    c2.metric("최장", f"{ev.length[longest]}일",
+              f"{pd.Timestamp(ev.frame([longest])['시작'].iat[0]):%Y-%m-%d} 시작")
+    busiest = per_year["일수"].idxmax()
+    c3.metric("가장 많았던 해", f"{busiest}년",
+              f"{per_year.at[busiest, '횟수']}회 · {per_year.at[busiest, '일수']}일")
+else:
+    st.info("선택한 연도 범위에 해당하는 사건이 없습니다.")
+
+
+# ────────────── 6. 연도별 그래프 ──────────────
+@st.fragment
+def yearly_chart():
+    with prof.fragment(FRAGMENTS["event_metric"]):
+        st.markdown("---")
+        st.subheader(f"📊 연도별 {rule.label}")
+        metric = st.radio("지표", METRICS, index=1, horizontal=True, key="event_metric")
+        st.plotly_chart(yearly_bar(per_year, metric, rule.column), use_container_width=True)
+
+
+yearly_chart()
+
+# ────────────── 7. 역대 TOP 10 ──────────────
+prof.mark("7. 역대 TOP 10")
+st.markdown("---")
+st.subheader(f"🏆 역대 {rule.label} TOP 10")
+c_long, c_strong = st.columns(2)
+c_long.caption("가장 길었던 사건")
+c_long.dataframe(ev.frame(ev.top("length", 10, idx)), hide_index=True)
+c_strong.caption("가장 강했던 사건 (기준을 넘어선 정도의 합)")
+c_strong.dataframe(ev.frame(ev.top("intensity", 10, idx)), hide_index=True)
+
+
+# ────────────── 8. 해별 사건 목록 ──────────────
+@st.fragment
+def events_of_year():
+    with prof.fragment(FRAGMENTS["event_year"]):
+        st.markdown("---")
+        st.subheader("📅 해별 사건 목록")
+        years = per_year.index[per_year["횟수"] > 0].tolist()
+        if not years:
+            st.caption("사건이 있는 해가 없습니다.")
+            return
+        year = st.selectbox("연도", years[::-1], key="event_year")
+        st.dataframe(ev.frame(ev.in_years((year, year))), hide_index=True,
+                     use_container_width=True)
+
+
+events_of_year()
+
+
+# ────────────── 9. ETCCDI 지수 ──────────────
+@st.fragment
+def etccdi():
+    with prof.fragment(FRAGMENTS["etccdi_index"]):
+        st.markdown("---")
+        st.subheader("🌐 ETCCDI 극한 기온 지수")
+        # 기준 기간 5일 창 백분위 표본은 데이터셋당 한 번 정렬(사이드카 저장), 지수는 bincount
+        engine = ds.percentiles()
+        table = engine.indices(year_rng)
+        name = st.selectbox("지수", table.columns.tolist(), key="etccdi_index")
+        st.caption(f"기준 기간 {engine.baseline[0]}-{engine.baseline[1]}, "
+                   f"앞뒤 {engine.window}일 창 백분위 · "
+                   + ("6일 이상 이어진 날 수" if name in SPELLS
+                      else "기준을 넘은 날의 비율(%)"))
+        st.plotly_chart(yearly_bar(table, name, None), use_container_width=True)
+        with st.expander("MM-DD별 기준값 (10·90 백분위)"):
+            st.dataframe(engine.table().round(1), hide_index=True, use_container_width=True)
+
+
+etccdi()
+
+# ────────────── 10. 구간별 실행 시간 (사이드바) ──────────────
+prof.finish()
+with st.sidebar.expander("⏱️ 구간별 실행 시간"):
+    st.caption(prof.summary())
+    st.dataframe(prof.frame(), hide_index=True, use_container_width=True)